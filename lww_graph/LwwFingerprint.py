@@ -0,0 +1,148 @@
+import hashlib
+import struct
+import uuid
+from typing import List
+
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+
+
+class LwwFingerprint(object):
+    """
+    Order-independent fingerprints of Last-Writer-Win states: a fingerprint is the sum, modulo 2 ** 64, of the hashes
+    of the marks in the state, so that it is updated in O(1) by adding the hash of a new mark and subtracting the hash
+    of the mark it replaces.
+
+    Hashes do not depend on the built-in hash, so they are the same in every process: ints (and bools and integral
+    floats, equal to them) are mixed by their exact value, other floats by their bits, strings, bytes and UUIDs by
+    their content, and tuples and edges by their items. Any other value is hashed by its repr, which may differ for
+    equal values (see is_canonical). Equal states have equal fingerprints, and different states differ but with
+    a probability of about 2 ** -64.
+    """
+
+    MASK = (1 << 64) - 1
+
+    # Seeds telling apart the hashes of the same key and timestamp in different sections of a state.
+    ADDED = 0x51ED27
+    REMOVED = 0x7A1C3B
+    LIVE = 0x2F49D5
+    ATTRIBUTE = 0x6C8E91
+
+    # Seeds telling apart the hashes of values of different types.
+    __NEGATIVE__ = 0x3C6EF372FE94F82B
+    __FLOAT__ = 0xA54FF53A5F1D36F1
+    __SEQUENCE__ = 0x510E527FADE682D1
+
+    @classmethod
+    def hash_mark(cls, key: any, timestamp: any, seed: int) -> int:
+        """
+        Hash a mark, mixing the hashes of its key and timestamp (see hash_key).
+
+        :param key: The key of the mark.
+        :param timestamp: The timestamp of the mark.
+        :param seed: The seed of the section of the state.
+        :return: A 64 bits hash.
+        """
+        h = cls.hash_element(key, seed)
+        return cls.__mix__((h + cls.hash_key(timestamp) * 0x9E3779B97F4A7C15) & cls.MASK)
+
+    @classmethod
+    def hash_element(cls, key: any, seed: int) -> int:
+        """
+        Hash the key of an element of a state, regardless of its timestamps.
+
+        :param key: The key of the element.
+        :param seed: The seed of the section of the state.
+        :return: A 64 bits hash.
+        """
+        return cls.__mix__(cls.hash_key(key) ^ seed)
+
+    @classmethod
+    def hash_key(cls, key: any) -> int:
+        """
+        Hash a key or a value the same in every process.
+
+        :param key: The key.
+        :return: A 64 bits hash.
+        """
+        if isinstance(key, int):
+            if 0 <= key <= cls.MASK:
+                return cls.__mix__(key)
+            if -cls.MASK <= key < 0:
+                return cls.__mix__(cls.__mix__(-key) ^ cls.__NEGATIVE__)
+            return cls.__digest__(b"i", key.to_bytes((key.bit_length() + 8) // 8, "big", signed=True))
+        if isinstance(key, float):
+            if key.is_integer():
+                return cls.hash_key(int(key))
+            return cls.__mix__(cls.__mix__(struct.unpack("<Q", struct.pack("<d", key))[0]) ^ cls.__FLOAT__)
+        if isinstance(key, str):
+            return cls.__digest__(b"s", key.encode("utf-8", "surrogatepass"))
+        if isinstance(key, bytes):
+            return cls.__digest__(b"b", key)
+        if isinstance(key, uuid.UUID):
+            return cls.hash_key(key.int)
+        if isinstance(key, tuple):
+            return cls.__hash_sequence__(key, len(key))
+        if hasattr(key, "src") and hasattr(key, "target"):
+            # an edge, e.g. a LwwEdge
+            return cls.__hash_sequence__((key.src, key.target), -1)
+        return cls.__digest__(type(key).__name__.encode("utf-8"), repr(key).encode("utf-8", "surrogatepass"))
+
+    @classmethod
+    def is_canonical(cls, key: any) -> bool:
+        """
+        Check if a key is hashed from its value, so that keys equal by == have equal hashes: ints, floats, strings,
+        bytes, UUIDs, and tuples and LwwEdges of them. Other keys are hashed by their repr, e.g. frozensets, whose
+        reprs depend on the order of their items, or objects with the default repr.
+
+        :param key: The key.
+        :return: True if the hash of the key follows ==, otherwise False.
+        """
+        if isinstance(key, (int, float, str, bytes, uuid.UUID)):
+            return True
+        if isinstance(key, tuple):
+            return all(cls.is_canonical(item) for item in key)
+        if type(key) is LwwEdge:
+            return cls.is_canonical(key.src) and cls.is_canonical(key.target)
+        return False
+
+    @classmethod
+    def combine(cls, fingerprints: List[int]) -> int:
+        """
+        Combine the fingerprints of the parts of a state, in order, into one.
+
+        :param fingerprints: A list of fingerprints.
+        :return: A 64 bits fingerprint.
+        """
+        return cls.__hash_sequence__(tuple(fingerprints), len(fingerprints))
+
+    @classmethod
+    def __hash_sequence__(cls, items: tuple, tag: int) -> int:
+        """
+        [internal method] Hash the items of a sequence, in order.
+
+        :param items: A tuple of items.
+        :param tag: A tag of the kind of sequence, e.g. its length.
+        :return: A 64 bits hash.
+        """
+        h = cls.__mix__((tag ^ cls.__SEQUENCE__) & cls.MASK)
+        for item in items:
+            h = cls.__mix__((h * 0x9E3779B97F4A7C15 + cls.hash_key(item)) & cls.MASK)
+        return h
+
+    @classmethod
+    def __mix__(cls, h: int) -> int:
+        """
+        [internal method] Mix 64 bits (the finalizer of MurmurHash3), a bijection of the 64 bits integers.
+        """
+        h ^= h >> 33
+        h = (h * 0xFF51AFD7ED558CCD) & cls.MASK
+        h ^= h >> 33
+        h = (h * 0xC4CEB9FE1A85EC53) & cls.MASK
+        return h ^ (h >> 33)
+
+    @staticmethod
+    def __digest__(kind: bytes, data: bytes) -> int:
+        """
+        [internal method] Hash bytes with BLAKE2b, told apart by the kind of value they encode.
+        """
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8, person=kind[:16]).digest(), "little")
@@ -0,0 +1,169 @@
+from typing import Callable, Dict, Tuple
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, it is needed by the analytics only
+    numpy = None
+
+
+class LwwGraphAnalytics(object):
+    """
+    Analytics of the local view of a LwwDiGraph, vectorized with NumPy over an array snapshot of its valid edges.
+
+    Vertices are numbered by their position in vertex_ids(), and every result is an array aligned with it.
+    The snapshot and the results are cached until the generation of the graph changes (see LwwDiGraph.generation),
+    and returned arrays are read-only, as they are shared by the callers.
+    """
+
+    def __init__(self, graph: 'LwwDiGraph'):
+        """
+        :param graph: The LwwDiGraph to be analysed.
+        """
+        if numpy is None:
+            raise ImportError("LwwGraphAnalytics requires NumPy.")
+        self.__graph__ = graph
+        self.__generation__ = None
+        self.__results__: Dict[Tuple, any] = {}
+
+    def vertex_ids(self) -> 'numpy.ndarray':
+        """
+        Get the ids of the vertices in the view, ascending ordered by last added timestamp.
+
+        :return: An array of vertex ids.
+        """
+        return self.__snapshot__()[0]
+
+    def edges(self) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+        """
+        Get the snapshot of the valid edges.
+
+        :return: A tuple of 2 int64 arrays, the positions of the source and target vertex of each edge in vertex_ids.
+        """
+        _, src, target = self.__snapshot__()
+        return src, target
+
+    def out_degrees(self) -> 'numpy.ndarray':
+        """
+        :return: An int64 array of the number of valid edges going out of each vertex.
+        """
+        return self.__cached__(("out_degrees",), lambda: self.__bincount__(self.edges()[0]))
+
+    def in_degrees(self) -> 'numpy.ndarray':
+        """
+        :return: An int64 array of the number of valid edges going in each vertex.
+        """
+        return self.__cached__(("in_degrees",), lambda: self.__bincount__(self.edges()[1]))
+
+    def degree_distribution(self, direction: str = "out") -> 'numpy.ndarray':
+        """
+        Get the distribution of the degrees of the vertices.
+
+        :param direction: "out" for out-degrees, "in" for in-degrees, or "both" for their sums.
+        :return: An int64 array whose item d is the number of vertices of degree d.
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError("The direction should be out, in or both, but it is " + str(direction))
+
+        def compute():
+            degrees = self.out_degrees() if direction == "out" else self.in_degrees() if direction == "in" \
+                else self.out_degrees() + self.in_degrees()
+            return numpy.bincount(degrees).astype(numpy.int64)
+        return self.__cached__(("degree_distribution", direction), compute)
+
+    def pagerank(self, damping: float = 0.85, tolerance: float = 1e-10, max_iterations: int = 100) -> 'numpy.ndarray':
+        """
+        Compute the PageRank of the vertices by power iteration. The rank of vertices without out-going edges is
+        spread over all vertices.
+
+        :param damping: The probability of following an edge rather than jumping to any vertex.
+        :param tolerance: The iteration stops once the ranks change by less than this, in L1 norm.
+        :param max_iterations: The maximum number of iterations.
+        :return: A float64 array of ranks, summing to 1.
+        """
+        def compute():
+            src, target = self.edges()
+            count = len(self.vertex_ids())
+            if count == 0:
+                return numpy.zeros(0)
+            out_degrees = self.out_degrees()
+            dangling = out_degrees == 0
+            # each edge carries the rank of its source divided by its out-degree
+            edge_share = 1.0 / out_degrees[src]
+            rank = numpy.full(count, 1.0 / count)
+            for _ in range(max_iterations):
+                received = numpy.bincount(target, weights=rank[src] * edge_share, minlength=count)
+                next_rank = (1.0 - damping) / count + damping * (received + rank[dangling].sum() / count)
+                change = numpy.abs(next_rank - rank).sum()
+                rank = next_rank
+                if change < tolerance:
+                    break
+            return rank
+        return self.__cached__(("pagerank", damping, tolerance, max_iterations), compute)
+
+    def weakly_connected_components(self) -> 'numpy.ndarray':
+        """
+        Find the weakly connected components, by propagating the smallest vertex position over the edges
+        until every edge joins vertices of the same label.
+
+        :return: An int64 array of the component of each vertex, components being numbered from 0 by their first
+        vertex in vertex_ids. The number of components is its maximum plus 1.
+        """
+        def compute():
+            src, target = self.edges()
+            labels = numpy.arange(len(self.vertex_ids()), dtype=numpy.int64)
+            while len(src):
+                edge_labels = numpy.minimum(labels[src], labels[target])
+                next_labels = labels.copy()
+                numpy.minimum.at(next_labels, src, edge_labels)
+                numpy.minimum.at(next_labels, target, edge_labels)
+                # a label is the position of a vertex of the same component, so its own label is one too
+                next_labels = next_labels[next_labels]
+                if numpy.array_equal(next_labels, labels):
+                    break
+                labels = next_labels
+            return numpy.unique(labels, return_inverse=True)[1].astype(numpy.int64)
+        return self.__cached__(("weakly_connected_components",), compute)
+
+    def __snapshot__(self) -> Tuple['numpy.ndarray', 'numpy.ndarray', 'numpy.ndarray']:
+        """
+        [internal method] Get the array snapshot of the view, taken once per generation of the graph.
+
+        :return: A tuple of the vertex ids, and the positions of the source and target vertex of each valid edge.
+        """
+        def compute():
+            v_set, e_set = self.__graph__.__v_set__, self.__graph__.__e_set__
+            vertex_keys = v_set.__live_keys__()
+            position = {vertex_key: i for i, vertex_key in enumerate(vertex_keys)}
+            edge_keys = list(e_set.__added__)
+            src, target = [], []
+            for edge_key, exist in zip(edge_keys, e_set.__exist_keys__(edge_keys)):
+                if exist:
+                    src_key, target_key = e_set.__endpoints__(edge_key)
+                    src.append(position[src_key])
+                    target.append(position[target_key])
+            vertex_ids = [v_set.__value__(vertex_key) for vertex_key in vertex_keys]
+            return (numpy.array(vertex_ids) if vertex_ids else numpy.zeros(0, dtype=numpy.int64),
+                    numpy.array(src, dtype=numpy.int64), numpy.array(target, dtype=numpy.int64))
+        return self.__cached__(("snapshot",), compute)
+
+    def __bincount__(self, positions: 'numpy.ndarray') -> 'numpy.ndarray':
+        """
+        [internal method] Count the occurrences of each vertex position.
+        """
+        return numpy.bincount(positions, minlength=len(self.vertex_ids())).astype(numpy.int64)
+
+    def __cached__(self, query: Tuple, compute: Callable[[], any]) -> any:
+        """
+        [internal method] Get the result of a query, computing it if it is not cached for the current generation
+        of the graph. Arrays of the result are made read-only.
+        """
+        generation = self.__graph__.generation()
+        if generation != self.__generation__:
+            self.__results__.clear()
+            self.__generation__ = generation
+        if query not in self.__results__:
+            result = compute()
+            for array in result if isinstance(result, tuple) else (result,):
+                array.flags.writeable = False
+            self.__results__[query] = result
+        return self.__results__[query]
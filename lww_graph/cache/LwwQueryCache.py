@@ -0,0 +1,106 @@
+import sys
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple
+
+
+class LwwQueryCache(object):
+    """
+    Least-recently-used cache of query results, bounded by a number of entries and an estimate of their memory.
+
+    Each entry is stamped with the generation of the graph it was computed at (see LwwDiGraph.generation), and a
+    lookup tells the generation the entry has to be at least, so that stale entries are never returned. They are
+    dropped when they are looked up, or evicted as the least recently used.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 << 20):
+        """
+        :param max_entries: The maximum number of results kept.
+        :param max_bytes: The maximum estimated size of the results kept, in bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # From a query to a tuple of the generation, the result and its estimated size
+        self.__entries__: Dict[Hashable, Tuple[int, List, int]] = OrderedDict()
+        self.__bytes__ = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, query: Hashable, valid_since: int) -> List:
+        """
+        Look up the result of a query.
+
+        :param query: A hashable query, e.g. a tuple of the query name and its arguments.
+        :param valid_since: The generation since which a result is still valid.
+        :return: The result, or None if it is not cached or stale.
+        """
+        entry = self.__entries__.get(query)
+        if entry is not None:
+            if entry[0] >= valid_since:
+                self.__entries__.move_to_end(query)
+                self.hits += 1
+                return entry[1]
+            self.__drop__(query)
+        self.misses += 1
+        return None
+
+    def put(self, query: Hashable, generation: int, result: List):
+        """
+        Cache the result of a query, evicting the least recently used results beyond the bounds.
+        The result is kept as it is, so it should not be modified afterwards.
+
+        :param query: A hashable query.
+        :param generation: The generation the result was computed at.
+        :param result: A list, of values or of lists of values.
+        :return: None
+        """
+        size = self.__size_of__(result)
+        if query in self.__entries__:
+            self.__drop__(query)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        self.__entries__[query] = (generation, result, size)
+        self.__bytes__ += size
+        while len(self.__entries__) > self.max_entries or self.__bytes__ > self.max_bytes:
+            self.__drop__(next(iter(self.__entries__)))
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drop all the cached results.
+
+        :return: None
+        """
+        self.__entries__.clear()
+        self.__bytes__ = 0
+
+    def memory(self) -> int:
+        """
+        Get the estimated size of the cached results.
+
+        :return: The size in bytes.
+        """
+        return self.__bytes__
+
+    def __len__(self) -> int:
+        return len(self.__entries__)
+
+    def __drop__(self, query: Hashable):
+        """
+        [internal method] Remove an entry.
+        """
+        self.__bytes__ -= self.__entries__.pop(query)[2]
+
+    @staticmethod
+    def __size_of__(result: List) -> int:
+        """
+        [internal method] Estimate the size of a result, counting the lists it is made of and its values.
+        Small integers are shared by the interpreter, but they are counted as well.
+        """
+        size = sys.getsizeof(result)
+        for item in result:
+            if isinstance(item, list):
+                size += sys.getsizeof(item) + sum(sys.getsizeof(value) for value in item)
+            else:
+                size += sys.getsizeof(item)
+        return size
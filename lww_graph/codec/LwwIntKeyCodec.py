@@ -0,0 +1,21 @@
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+
+
+class LwwIntKeyCodec(LwwKeyCodec):
+    """
+    Codec for signed integer keys, zigzag mapped to non-negative integers of a fixed width.
+    """
+
+    def __init__(self, width: int = 64):
+        self.width = width
+        self.__bound__ = 1 << (width - 1)
+
+    def encode(self, key: int) -> int:
+        if not isinstance(key, int) or isinstance(key, bool):
+            raise ValueError("The key should be an int, but it has the type of " + str(type(key)))
+        if not -self.__bound__ <= key < self.__bound__:
+            raise ValueError("The key {} does not fit in {} bits".format(key, self.width))
+        return (key << 1) if key >= 0 else ((-key << 1) - 1)
+
+    def decode(self, code: int) -> int:
+        return (code >> 1) if not code & 1 else -((code + 1) >> 1)
@@ -0,0 +1,41 @@
+import sys
+from typing import Dict, List
+
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+
+
+class LwwInternedStrKeyCodec(LwwKeyCodec):
+    """
+    Codec for string keys, numbering every distinct string in the order it is first seen.
+    Each string is stored once, interned, however many sets or marks refer to it.
+
+    The numbering depends on the history of the codec, so the encoded keys are only meaningful for the sets sharing
+    this codec object. Sets with different codecs still merge, by translating the keys through their strings.
+    """
+
+    stable = False
+
+    def __init__(self, width: int = 32):
+        self.width = width
+        self.__codes__: Dict[str, int] = {}
+        self.__strings__: List[str] = []
+
+    def encode(self, key: str) -> int:
+        if not isinstance(key, str):
+            raise ValueError("The key should be a str, but it has the type of " + str(type(key)))
+        code = self.__codes__.get(key)
+        if code is not None:
+            return code
+        code = len(self.__strings__)
+        if code >> self.width:
+            raise ValueError("No more than {} distinct keys can be encoded in {} bits".format(code, self.width))
+        key = sys.intern(key)
+        self.__codes__[key] = code
+        self.__strings__.append(key)
+        return code
+
+    def decode(self, code: int) -> str:
+        return self.__strings__[code]
+
+    def find(self, key: str) -> int:
+        return self.__codes__.get(key) if isinstance(key, str) else None
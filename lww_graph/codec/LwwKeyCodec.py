@@ -0,0 +1,59 @@
+class LwwKeyCodec(object):
+    """
+    Base class for key codecs, mapping the keys of a LwwSet to compact non-negative integers of a fixed width,
+    so that storage, hashing and comparison in the set work on plain ints.
+
+    Subclass it and implement encode, decode and width for user defined keys.
+    """
+
+    # Number of bits needed by an encoded key, i.e. every encoded key is in range [0, 2 ** width).
+    width: int = 64
+
+    # True if the encoding depends on the key only, so that encoded keys mean the same on every replica.
+    stable: bool = True
+
+    def encode(self, key: any) -> int:
+        """
+        Encode a key.
+
+        :param key: The key to be encoded.
+        :return: A non-negative integer smaller than 2 ** width.
+        """
+        raise NotImplementedError()
+
+    def decode(self, code: int) -> any:
+        """
+        Decode a key, it is the inverse of encode.
+
+        :param code: An integer returned by encode.
+        :return: The original key.
+        """
+        raise NotImplementedError()
+
+    def find(self, key: any) -> int:
+        """
+        Encode a key for a look up. Unlike encode, it never registers a new key in a stateful codec.
+
+        :param key: The key to be looked up.
+        :return: The encoded key, or None if the codec has never encoded this key or cannot encode it.
+        """
+        try:
+            return self.encode(key)
+        except ValueError:
+            # a key of a wrong type or out of range can never be in a set using this codec
+            return None
+
+    def compatible(self, other: 'LwwKeyCodec') -> bool:
+        """
+        Check if the keys encoded by another codec can be used as is by this codec.
+
+        :param other: Another LwwKeyCodec.
+        :return: True if both codecs encode every key to the same integer, otherwise False.
+        """
+        return self is other or (self.stable and type(self) is type(other) and self.width == other.width)
+
+    def __eq__(self, other):
+        return isinstance(other, LwwKeyCodec) and self.compatible(other)
+
+    def __hash__(self):
+        return hash((type(self), self.width)) if self.stable else id(self)
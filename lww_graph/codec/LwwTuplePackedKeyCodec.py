@@ -0,0 +1,50 @@
+from typing import Tuple
+
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+
+
+class LwwTuplePackedKeyCodec(LwwKeyCodec):
+    """
+    Codec for tuple keys, packing the components encoded by their own codecs into a single integer.
+    The first component takes the most significant bits.
+    """
+
+    def __init__(self, *codecs: LwwKeyCodec):
+        assert len(codecs) > 0, "A tuple codec needs at least one component codec."
+        self.codecs: Tuple[LwwKeyCodec, ...] = codecs
+        self.width = sum(codec.width for codec in codecs)
+        self.stable = all(codec.stable for codec in codecs)
+
+    def encode(self, key: tuple) -> int:
+        if not isinstance(key, tuple) or len(key) != len(self.codecs):
+            raise ValueError("The key should be a tuple of {} elements, but it is {}".format(len(self.codecs), key))
+        code = 0
+        for codec, component in zip(self.codecs, key):
+            code = (code << codec.width) | codec.encode(component)
+        return code
+
+    def decode(self, code: int) -> tuple:
+        components = []
+        for codec in reversed(self.codecs):
+            components.append(codec.decode(code & ((1 << codec.width) - 1)))
+            code >>= codec.width
+        return tuple(reversed(components))
+
+    def find(self, key: tuple) -> int:
+        if not isinstance(key, tuple) or len(key) != len(self.codecs):
+            return None
+        code = 0
+        for codec, component in zip(self.codecs, key):
+            component_code = codec.find(component)
+            if component_code is None:
+                return None
+            code = (code << codec.width) | component_code
+        return code
+
+    def compatible(self, other: LwwKeyCodec) -> bool:
+        return self is other or (isinstance(other, LwwTuplePackedKeyCodec)
+                                 and len(self.codecs) == len(other.codecs)
+                                 and all(a.compatible(b) for a, b in zip(self.codecs, other.codecs)))
+
+    def __hash__(self):
+        return hash(tuple(self.codecs))
@@ -0,0 +1,23 @@
+import uuid
+
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+
+
+class LwwUuidKeyCodec(LwwKeyCodec):
+    """
+    Codec for UUID keys, given either as uuid.UUID or as strings, encoded to their 128 bits integer value.
+    Keys are decoded to the canonical (lower case, hyphenated) string form.
+    """
+
+    width = 128
+
+    def encode(self, key: any) -> int:
+        if isinstance(key, uuid.UUID):
+            return key.int
+        try:
+            return uuid.UUID(key).int
+        except (TypeError, ValueError, AttributeError):
+            raise ValueError("The key should be a UUID, but it is " + repr(key))
+
+    def decode(self, code: int) -> str:
+        return str(uuid.UUID(int=code))
@@ -0,0 +1,173 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Set, Tuple
+
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+
+
+class LwwBulkLoader(object):
+    """
+    Bulk loader of edge list files (CSV, TSV...) into a LwwDiGraph.
+
+    The file is split into chunks of bytes, aligned on lines, which are parsed in a process pool. Each chunk is
+    reduced to its edge marks, max-combined per edge, and to the marks of the vertices it mentions, and these
+    shards are merged into the graph as they come, with a bounded number of chunks in flight.
+
+    Every edge gets the timestamp of its timestamp column, or the timestamp of the load if there is none.
+    A vertex is added just before its earliest edge (its timestamp minus 1), so that all its edges are valid
+    unless the graph already has a later mark for it. Self-loops are skipped, as LwwDiGraph forbids them.
+    """
+
+    def __init__(self, delimiter: str = ",", src_column: int = 0, target_column: int = 1,
+                 timestamp_column: int = None, vertex_type: Callable[[str], any] = int,
+                 skip_header: bool = False, processes: int = None, chunk_size: int = 64 << 20,
+                 max_pending: int = None, progress: Callable[[int, int], None] = None):
+        """
+        :param delimiter: The column delimiter, e.g. "\\t" for TSV, or None for any whitespace.
+        :param src_column: The index of the source vertex column.
+        :param target_column: The index of the target vertex column.
+        :param timestamp_column: The index of an optional integer timestamp column.
+        :param vertex_type: The function parsing a vertex id, it has to be picklable (e.g. int or str).
+        :param skip_header: True if the first line of the file is a header.
+        :param processes: The number of worker processes, os.cpu_count() if not given. With 1, chunks are parsed
+        in the calling process.
+        :param chunk_size: The number of bytes of a chunk.
+        :param max_pending: The maximum number of chunks parsed and not yet merged, twice the number of processes
+        if not given. It bounds the memory held by parsed shards.
+        :param progress: An optional function called with (bytes loaded, total bytes) after each chunk is merged.
+        """
+        self.delimiter = delimiter
+        self.src_column = src_column
+        self.target_column = target_column
+        self.timestamp_column = timestamp_column
+        self.vertex_type = vertex_type
+        self.skip_header = skip_header
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending if max_pending is not None else 2 * self.processes
+        self.progress = progress
+
+    def load(self, path: str, graph: LwwDiGraph = None, timestamp: int = None) -> LwwDiGraph:
+        """
+        Load an edge list file into a graph.
+
+        :param path: The path of the file.
+        :param graph: The LwwDiGraph to load into, a new one if not given.
+        :param timestamp: The timestamp of the edges if the file has no timestamp column,
+        the current time if not given.
+        :return: The graph.
+        """
+        graph = graph if graph is not None else LwwDiGraph()
+        timestamp = timestamp if timestamp is not None else time.monotonic_ns()
+        total = os.path.getsize(path)
+        chunks = [(start, min(start + self.chunk_size, total)) for start in range(0, total, self.chunk_size)]
+        options = (self.delimiter, self.src_column, self.target_column, self.timestamp_column, self.vertex_type,
+                   self.skip_header, timestamp)
+
+        # vertex marks are min-combined over all shards, and merged into the graph at the end
+        vertex_marks: Dict[any, int] = {}
+        stats = {"lines": 0, "edges": 0, "skipped": 0}
+        loaded = 0
+        if self.processes <= 1:
+            for start, end in chunks:
+                self.__merge_shard__(graph, vertex_marks, stats, LwwBulkLoader.__parse__(path, start, end, options))
+                loaded += end - start
+                self.__report__(loaded, total)
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                pending: Set[Future] = set()
+                sizes: Dict[Future, int] = {}
+                next_chunk = 0
+                while next_chunk < len(chunks) or pending:
+                    while next_chunk < len(chunks) and len(pending) < self.max_pending:
+                        start, end = chunks[next_chunk]
+                        future = executor.submit(LwwBulkLoader.__parse__, path, start, end, options)
+                        pending.add(future)
+                        sizes[future] = end - start
+                        next_chunk += 1
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.__merge_shard__(graph, vertex_marks, stats, future.result())
+                        loaded += sizes.pop(future)
+                        self.__report__(loaded, total)
+
+        v_set = graph.__v_set__
+        for vertex_id, vertex_timestamp in vertex_marks.items():
+            v_set.__mark__(v_set.__added__, v_set.__key__(vertex_id), vertex_timestamp)
+        graph.__touch__()
+        if graph.metrics_sink() is not None:
+            graph.metrics_sink().record_stats("LwwBulkLoader.load", dict(stats, vertices=len(vertex_marks)))
+        return graph
+
+    def __report__(self, loaded: int, total: int):
+        """
+        [internal method] Report the progress, if a progress function is given.
+        """
+        if self.progress is not None:
+            self.progress(loaded, total)
+
+    @staticmethod
+    def __merge_shard__(graph: LwwDiGraph, vertex_marks: Dict[any, int], stats: Dict[str, int],
+                        shard: Tuple[Dict[any, int], Dict[Tuple[any, any], int], Dict[str, int]]):
+        """
+        [internal method] Merge the edge marks of a shard into the graph, and its vertex marks into vertex_marks.
+        """
+        shard_vertices, shard_edges, shard_stats = shard
+        e_set = graph.__e_set__
+        for (src, target), edge_timestamp in shard_edges.items():
+            e_set.__mark__(e_set.__added__, e_set.__key__(LwwEdge(src, target)), edge_timestamp)
+        for vertex_id, vertex_timestamp in shard_vertices.items():
+            current_timestamp = vertex_marks.get(vertex_id)
+            if current_timestamp is None or vertex_timestamp < current_timestamp:
+                vertex_marks[vertex_id] = vertex_timestamp
+        for name, value in shard_stats.items():
+            stats[name] += value
+
+    @staticmethod
+    def __parse__(path: str, start: int, end: int,
+                  options: tuple) -> Tuple[Dict[any, int], Dict[Tuple[any, any], int], Dict[str, int]]:
+        """
+        [internal method] Parse the lines starting in a range of bytes of the file. It runs in a worker process.
+
+        :param path: The path of the file.
+        :param start: The start of the range, inclusive.
+        :param end: The end of the range, exclusive.
+        :param options: The parsing options of the loader, as a tuple.
+        :return: A tuple of the vertex marks, the edge marks, max-combined, and the parsing stats of the chunk.
+        """
+        delimiter, src_column, target_column, timestamp_column, vertex_type, skip_header, timestamp = options
+        vertices: Dict[any, int] = {}
+        edges: Dict[Tuple[any, any], int] = {}
+        stats = {"lines": 0, "edges": 0, "skipped": 0}
+        with open(path, "rb") as file:
+            if start > 0:
+                # the line going across start belongs to the previous chunk
+                file.seek(start - 1)
+                file.readline()
+            elif skip_header:
+                file.readline()
+            while file.tell() < end:
+                line = file.readline()
+                if not line:
+                    break
+                stats["lines"] += 1
+                line = line.strip()
+                if not line or line.startswith(b"#"):
+                    continue
+                columns: List[str] = line.decode("utf-8").split(delimiter)
+                src, target = vertex_type(columns[src_column]), vertex_type(columns[target_column])
+                if src == target:
+                    stats["skipped"] += 1
+                    continue
+                edge_timestamp = int(columns[timestamp_column]) if timestamp_column is not None else timestamp
+                current_timestamp = edges.get((src, target))
+                if current_timestamp is None or current_timestamp < edge_timestamp:
+                    edges[(src, target)] = edge_timestamp
+                for vertex_id in (src, target):
+                    current_timestamp = vertices.get(vertex_id)
+                    if current_timestamp is None or edge_timestamp - 1 < current_timestamp:
+                        vertices[vertex_id] = edge_timestamp - 1
+                stats["edges"] += 1
+        return vertices, edges, stats
@@ -1,24 +1,169 @@
-from typing import List, Set
+import heapq
+import itertools
+from collections import deque
+from typing import Callable, Dict, List, Sequence, Set, Tuple, Union
 
+from lww_graph.LwwFingerprint import LwwFingerprint
+from lww_graph.analytics.LwwGraphAnalytics import LwwGraphAnalytics
+from lww_graph.cache.LwwQueryCache import LwwQueryCache
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
 from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
 from lww_graph.lww_graph.edge.LwwEdgeSet import LwwEdgeSet
 from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
 from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
 from lww_graph.lww_graph.vertex.LwwVertexSet import LwwVertexSet
+from lww_graph.lww_register.LwwAttributeColumns import LwwAttributeColumns
+from lww_graph.metrics.LwwInstrumented import LwwInstrumented
+from lww_graph.metrics.LwwMetricsSink import LwwMetricsSink
+from lww_graph.order.LwwTopologicalOrder import LwwTopologicalOrder
+from lww_graph.partition.LwwInterest import LwwInterest
+from lww_graph.storage.LwwSqliteStorage import LwwSqliteStorage
 
+try:
+    import numpy
+except ImportError:  # NumPy is optional, batch queries return lists without it
+    numpy = None
 
-class LwwDiGraph(object):
+
+class LwwDiGraph(LwwInstrumented):
     """
     A Last-Writer-Win state based directed graph implementation.
     """
 
-    def __init__(self):
-        # Lww-set for keeping vertex
-        self.__v_set__ = LwwVertexSet()
+    __instrumented__ = ("add_vertex", "add_edge", "remove_vertex", "remove_edge",
+                        "merge", "merge_all", "connected_vertices", "list_all_path", "shortest_path",
+                        "vertex_exist_many", "edge_exist_many", "out_degrees", "in_degrees", "neighbors_many",
+                        "topological_sort", "strongly_connected_components")
+
+    # Beyond this number of vertices touched since the oldest cached result, all cached results are invalidated
+    # at once instead of per vertex.
+    MAX_TOUCHED_VERTICES = 1 << 16
+
+    def __init__(self, metrics: LwwMetricsSink = None, vertex_codec: LwwKeyCodec = None,
+                 storage: LwwSqliteStorage = None):
+        """
+        :param metrics: An optional LwwMetricsSink, see set_metrics_sink.
+        :param vertex_codec: An optional LwwKeyCodec encoding the vertex ids.
+        :param storage: An optional LwwSqliteStorage keeping the marks on disk instead of in memory.
+        The vertex codec defaults to LwwIntKeyCodec with a storage, and it has to be stable as marks outlive
+        the graph object.
+        """
+        v_marks, e_marks = (None, None), (None, None)
+        if storage is not None:
+            vertex_codec = vertex_codec if vertex_codec is not None else LwwIntKeyCodec()
+            if not vertex_codec.stable:
+                raise ValueError("A graph kept in a storage requires a stable vertex codec, but it has "
+                                 + type(vertex_codec).__name__)
+            width = vertex_codec.width
+            v_marks = (storage.mark_store("vertex_added", width), storage.mark_store("vertex_removed", width))
+            e_marks = (storage.mark_store("edge_added", 2 * width, split_width=width),
+                       storage.mark_store("edge_removed", 2 * width))
+
+        # Lww-set for keeping vertex, vertex ids are encoded by vertex_codec if given
+        self.__v_set__ = LwwVertexSet(v_marks[0], v_marks[1], codec=vertex_codec)
 
         # Lww-set for keeping edge,
         # Note that you need construct a vertex set before initialising a edge set
-        self.__e_set__ = LwwEdgeSet(self.__v_set__)
+        self.__e_set__ = LwwEdgeSet(self.__v_set__, e_marks[0], e_marks[1])
+
+        if storage is not None:
+            # the fingerprints saved with the marks, so that they are not computed again from the whole store
+            fingerprints = storage.read_meta("fingerprints")
+            if fingerprints is not None:
+                self.__v_set__.__load_fingerprints__(tuple(fingerprints[:3]))
+                self.__e_set__.__load_fingerprints__(tuple(fingerprints[3:]))
+            storage.add_flush_hook(self.__save_fingerprints__(storage))
+
+        # Lww-registers for vertex and edge attributes, keyed by vertex and edge keys
+        self.__v_attrs__ = LwwAttributeColumns()
+        self.__e_attrs__ = LwwAttributeColumns()
+
+        # Generation of the vertices and edges, bumped by every change, and the query cache stamped with it.
+        # A cached result is stale if it is older than __floor__, or than the generation its vertex was last
+        # touched at, kept in __touched__ while there is a query cache.
+        self.__generation__ = 0
+        self.__query_cache__: LwwQueryCache = None
+        self.__floor__ = 0
+        self.__touched__: Dict[any, int] = {}
+
+        # Topological order kept up to date with the changes, if any
+        self.__topological_order__: LwwTopologicalOrder = None
+
+        # Interest set of a partial replica, graphs merged into it are filtered to it
+        self.__interest__: LwwInterest = None
+
+        # Analytics of the view, created on first use
+        self.__analytics__: LwwGraphAnalytics = None
+
+        if metrics is not None:
+            self.set_metrics_sink(metrics)
+
+    def set_metrics_sink(self, sink: LwwMetricsSink = None):
+        """
+        Attach a metrics sink to this graph and its vertex and edge sets, or detach it by passing None.
+
+        :param sink: A LwwMetricsSink receiving the events, or None to disable instrumentation.
+        :return: None
+        """
+        LwwInstrumented.set_metrics_sink(self, sink)
+        self.__v_set__.set_metrics_sink(sink)
+        self.__e_set__.set_metrics_sink(sink)
+
+    def set_query_cache(self, cache: LwwQueryCache = None):
+        """
+        Attach a query cache to this graph, or detach it by passing None.
+
+        Results of connected_vertices and list_all_path are then cached until a change of the graph can affect them:
+        connected_vertices results are invalidated per vertex, by changes of the vertex, its edges or its neighbors,
+        and list_all_path results by any change of the vertices and edges. A cache should not be shared by graphs.
+
+        :param cache: A LwwQueryCache, or None to disable caching.
+        :return: None
+        """
+        if cache is not None:
+            cache.clear()
+        self.__query_cache__ = cache
+        self.__floor__ = self.__generation__
+        self.__touched__.clear()
+
+    def query_cache(self) -> LwwQueryCache:
+        """
+        Get the query cache attached to this graph.
+
+        :return: The LwwQueryCache attached, or None if caching is disabled.
+        """
+        return self.__query_cache__
+
+    def set_topological_order(self, order: LwwTopologicalOrder = None):
+        """
+        Attach a topological order to this graph, kept up to date as vertices and edges are added, removed and
+        merged, or detach it by passing None. The order is built when it is attached.
+
+        :param order: A LwwTopologicalOrder, or None to stop keeping an order.
+        :return: None
+        """
+        self.__topological_order__ = order
+        if order is not None:
+            order.__attach__(self)
+
+    def topological_order(self) -> LwwTopologicalOrder:
+        """
+        Get the topological order attached to this graph.
+
+        :return: The LwwTopologicalOrder attached, or None.
+        """
+        return self.__topological_order__
+
+    def generation(self) -> int:
+        """
+        Get the generation of the vertices and edges of this graph. It is bumped by every add and remove, and by
+        every merge updating any mark, so the view has not changed as long as the generation is the same.
+        Attributes are not part of it.
+
+        :return: An integer, increasing with changes.
+        """
+        return self.__generation__
 
     def add_vertex(self, vertex: LwwTimedVertex) -> 'LwwDiGraph':
         """
@@ -28,6 +173,7 @@ class LwwDiGraph(object):
         :return: The graph it self.
         """
         self.__v_set__.add(vertex)
+        self.__touch__(vertex_keys=[self.__v_set__.__key__(vertex.value)])
         return self
 
     def add_edge(self, edge: LwwTimedEdge) -> 'LwwDiGraph':
@@ -47,6 +193,7 @@ class LwwDiGraph(object):
         :return: The graph it self.
         """
         self.__e_set__.add(edge)
+        self.__touch__(edge_keys=[self.__e_set__.__key__(edge.value)])
         return self
 
     def remove_vertex(self, vertex: LwwTimedVertex) -> 'LwwDiGraph':
@@ -61,12 +208,18 @@ class LwwDiGraph(object):
         :return: The graph itself.
         """
         vertex_id = vertex.value
-        if self.vertex_exist(vertex_id):
-            for edge in self.__e_set__.elements():
-                if edge.contains(vertex_id):
-                    self.remove_edge(LwwTimedEdge(edge, vertex.create_timestamp))
+        vertex_key = self.__v_set__.__key__(vertex_id)
+        cascaded = 0
+        if self.__v_set__.__exist_key__(vertex_key):
+            for edge_key in self.__e_set__.__out_keys__(vertex_key) + self.__e_set__.__in_keys__(vertex_key):
+                if self.__e_set__.__exist_key__(edge_key):
+                    self.__e_set__.__mark__(self.__e_set__.__removed__, edge_key, vertex.create_timestamp)
+                    cascaded += 1
 
         self.__v_set__.remove(vertex)
+        self.__touch__(vertex_keys=[vertex_key])
+        if self.__metrics__ is not None:
+            self.__metrics__.record_stats("LwwDiGraph.remove_vertex", {"edges_cascaded": cascaded})
         return self
 
     def remove_edge(self, edge: LwwTimedEdge) -> 'LwwDiGraph':
@@ -77,8 +230,144 @@ class LwwDiGraph(object):
         :return: The graph itself.
         """
         self.__e_set__.remove(edge)
+        self.__touch__(edge_keys=[self.__e_set__.__key__(edge.value)])
+        return self
+
+    def set_vertex_attribute(self, vertex: LwwTimedVertex, name: str, value: any) -> 'LwwDiGraph':
+        """
+        Write an attribute of a vertex, as a Last-Writer-Win register merged along with the graph.
+
+        The register is independent of the vertex marks: it can be written before the vertex is added,
+        and it is kept (but hidden) while the vertex is removed.
+
+        :param vertex: A LwwTimedVertex object, containing the vertex and timestamp information.
+        :param name: The attribute name.
+        :param value: The attribute value.
+        :return: The graph it self.
+        """
+        self.__v_attrs__.set(self.__v_set__.__key__(vertex.value), name, value, vertex.create_timestamp)
+        return self
+
+    def set_edge_attribute(self, edge: LwwTimedEdge, name: str, value: any) -> 'LwwDiGraph':
+        """
+        Write an attribute of an edge (e.g. its weight), as a Last-Writer-Win register merged along with the graph.
+        See set_vertex_attribute.
+
+        :param edge: A LwwTimedEdge object, containing the edge and timestamp information.
+        :param name: The attribute name.
+        :param value: The attribute value.
+        :return: The graph it self.
+        """
+        self.__e_attrs__.set(self.__e_set__.__key__(edge.value), name, value, edge.create_timestamp)
         return self
 
+    def vertex_attribute(self, vertex_id: int, name: str, default: any = None) -> any:
+        """
+        Read an attribute of a vertex in the local view of this graph.
+
+        :param vertex_id: the vertex id that needs to look up.
+        :param name: The attribute name.
+        :param default: The value returned if the vertex is not in the view or its attribute was never written.
+        :return: The attribute value.
+        """
+        vertex_key = self.__vertex_key__(vertex_id)
+        if vertex_key is None or not self.__v_set__.__exist_key__(vertex_key):
+            return default
+        return self.__v_attrs__.get(vertex_key, name, default)
+
+    def edge_attribute(self, edge: LwwEdge, name: str, default: any = None) -> any:
+        """
+        Read an attribute of an edge in the local view of this graph.
+
+        :param edge: A LwwEdge object, the edge that needs to look up.
+        :param name: The attribute name.
+        :param default: The value returned if the edge is not in the view or its attribute was never written.
+        :return: The attribute value.
+        """
+        codec = self.__e_set__.codec()
+        edge_key = edge if codec is None else codec.find(edge)
+        if edge_key is None or not self.__e_set__.__exist_key__(edge_key):
+            return default
+        return self.__e_attrs__.get(edge_key, name, default)
+
+    def fork(self) -> 'LwwDiGraph':
+        """
+        Get a replica of this graph, sharing its marks and attributes copy-on-write: forking costs no copy
+        of the graph, and later writes to either replica copy only the pages of marks they touch
+        (see LwwCowDict). Only a graph with marks in memory can be forked.
+
+        :return: A new LwwDiGraph, with the same view as this graph.
+        """
+        graph = LwwDiGraph(vertex_codec=self.__v_set__.codec())
+        graph.__v_set__ = self.__v_set__.fork()
+        graph.__e_set__ = self.__e_set__.fork(graph.__v_set__)
+        graph.__v_attrs__ = self.__v_attrs__.fork()
+        graph.__e_attrs__ = self.__e_attrs__.fork()
+        graph.__interest__ = self.__interest__
+        if self.__metrics__ is not None:
+            graph.set_metrics_sink(self.__metrics__)
+        return graph
+
+    def analytics(self) -> LwwGraphAnalytics:
+        """
+        Get the analytics of this graph (degrees, PageRank, weakly connected components), computed with NumPy
+        from an array snapshot of its valid edges, and cached until the graph changes. It requires NumPy.
+
+        :return: The LwwGraphAnalytics of this graph.
+        """
+        if self.__analytics__ is None:
+            self.__analytics__ = LwwGraphAnalytics(self)
+        return self.__analytics__
+
+    def set_interest(self, interest: LwwInterest = None):
+        """
+        Make this graph a partial replica of an interest set, or a full replica by passing None.
+        Graphs merged into a partial replica are filtered to its interest set first (see partition),
+        while local writes are kept as they are.
+
+        :param interest: A LwwInterest, or None.
+        :return: None
+        """
+        self.__interest__ = interest
+
+    def interest(self) -> LwwInterest:
+        """
+        Get the interest set of this graph.
+
+        :return: The LwwInterest of a partial replica, or None for a full replica.
+        """
+        return self.__interest__
+
+    def partition(self, interest: LwwInterest) -> 'LwwDiGraph':
+        """
+        Get a partial replica of this graph for an interest set: the marks and attributes of the vertices in the set,
+        of every edge with an endpoint in the set, and of both endpoints of those edges. An edge crossing the border
+        of the set is then valid in the partial replica exactly when it is in this graph, and so are the vertices
+        in the set. Edges are found through the adjacency index, from the vertices in the set.
+
+        :param interest: A LwwInterest.
+        :return: A new LwwDiGraph, with the interest set, keeping its marks in memory.
+        """
+        return self.__partition__(interest)
+
+    def __partition__(self, interest: LwwInterest, halo: Set[any] = None) -> 'LwwDiGraph':
+        """
+        (Internal method) Get a partial replica of this graph for an interest set, see partition.
+
+        :param interest: A LwwInterest.
+        :param halo: The ids of vertices out of the interest set whose marks are kept as well, or None.
+        :return: A new LwwDiGraph, with the interest set, keeping its marks in memory.
+        """
+        v_set, e_set = self.__v_set__, self.__e_set__
+        vertex_keys, edge_keys = self.__partition_keys__(interest, halo)
+        graph = LwwDiGraph(vertex_codec=v_set.codec())
+        graph.__v_set__ = LwwVertexSet(*self.__select_marks__(v_set, vertex_keys), codec=v_set.codec())
+        graph.__e_set__ = LwwEdgeSet(graph.__v_set__, *self.__select_marks__(e_set, edge_keys))
+        graph.__v_attrs__ = self.__v_attrs__.select(vertex_keys)
+        graph.__e_attrs__ = self.__e_attrs__.select(edge_keys)
+        graph.__interest__ = interest
+        return graph
+
     def vertex_count(self) -> int:
         """
         Number of vertex in the graph.
@@ -95,6 +384,43 @@ class LwwDiGraph(object):
         """
         return self.__e_set__.size()
 
+    def fingerprint(self) -> int:
+        """
+        Get the fingerprint of the state of this graph: the marks of its vertices and edges, and its attributes.
+        It is kept up to date with every mark written, so comparing the fingerprints of replicas is an O(1)
+        convergence probe: replicas with equal fingerprints have converged, but with a probability of about 2 ** -64.
+        Fingerprints are the same in every process, and those of graphs can be compared if their vertex codecs are
+        compatible (e.g. stable), or if they both have none (see LwwFingerprint for how vertex ids are hashed).
+
+        :return: A 64 bits fingerprint.
+        """
+        return LwwFingerprint.combine([self.__v_set__.fingerprint(), self.__e_set__.fingerprint(),
+                                       self.__v_attrs__.fingerprint(), self.__e_attrs__.fingerprint()])
+
+    def view_fingerprint(self) -> int:
+        """
+        Get the fingerprint of the local view of this graph: its vertices and valid edges, regardless of their
+        timestamps. Graphs with compatible vertex codecs (or none) and different view fingerprints are not equal,
+        which == checks first, unless some vertex ids are hashed by their repr (see LwwFingerprint.is_canonical).
+
+        :return: A 64 bits fingerprint.
+        """
+        return LwwFingerprint.combine([self.__v_set__.view_fingerprint(), self.__e_set__.view_fingerprint()])
+
+    def converged_with(self, another: 'LwwDiGraph') -> bool:
+        """
+        Check in O(1) if this graph and another replica have converged, by their fingerprints (see fingerprint).
+        The replicas should have compatible vertex codecs, or none, as fingerprints are of the encoded keys.
+
+        :param another: Another LwwDiGraph.
+        :return: True if the replicas have the same state, but with a probability of about 2 ** -64.
+        """
+        if self.__v_set__.__translator__(another.__v_set__) is not None:
+            raise ValueError("Fingerprints of graphs with incompatible vertex codecs cannot be compared, "
+                             "but they have " + type(self.__v_set__.codec()).__name__ + " and "
+                             + type(another.__v_set__.codec()).__name__)
+        return self.fingerprint() == another.fingerprint()
+
     def vertex_exist(self, vertex_id: int) -> bool:
         """
         Check if a vertex id exist in the local view of this graph.
@@ -113,21 +439,128 @@ class LwwDiGraph(object):
         """
         return self.__e_set__.exist(edge)
 
+    def vertex_exist_many(self, vertex_ids: Sequence[int]) -> Sequence[bool]:
+        """
+        Check if vertex ids exist in the local view of this graph, in bulk.
+
+        :param vertex_ids: A sequence of vertex ids, e.g. a list or a 1-d NumPy array.
+        :return: A list of bool, or a NumPy bool array if vertex_ids is a NumPy array.
+        """
+        find = self.__vertex_finder__()
+        keys = [find(vertex_id) for vertex_id in self.__as_list__(vertex_ids)]
+        return self.__as_array__(vertex_ids, self.__v_set__.__exist_keys__(keys), bool)
+
+    def edge_exist_many(self, edges: Sequence[Tuple[int, int]]) -> Sequence[bool]:
+        """
+        Check if edges exist in the local view of this graph, in bulk, without creating a LwwEdge per edge
+        when the graph has a vertex codec. The marks of each vertex are looked up once for all the edges.
+
+        :param edges: A sequence of (source vertex id, target vertex id) pairs, e.g. a list of tuples
+        or a NumPy array of shape (n, 2).
+        :return: A list of bool, or a NumPy bool array if edges is a NumPy array.
+        """
+        e_set = self.__e_set__
+        codec = e_set.codec()
+        keys = []
+        if codec is None:
+            for src, target in self.__as_list__(edges):
+                keys.append(LwwEdge(src, target) if src != target else None)
+        else:
+            find, pack = codec.vertex_codec.find, codec.pack
+            for src, target in self.__as_list__(edges):
+                src_key, target_key = find(src), find(target)
+                keys.append(pack(src_key, target_key) if src_key is not None and target_key is not None else None)
+        return self.__as_array__(edges, e_set.__exist_keys__(keys), bool)
+
+    def out_degrees(self, vertex_ids: Sequence[int]) -> Sequence[int]:
+        """
+        Count the (valid) edges going out of each of several vertices.
+
+        :param vertex_ids: A sequence of vertex ids, e.g. a list or a 1-d NumPy array.
+        :return: A list of int, or a NumPy int64 array if vertex_ids is a NumPy array.
+        """
+        return self.__degrees__(vertex_ids, self.__e_set__.__out_keys__)
+
+    def in_degrees(self, vertex_ids: Sequence[int]) -> Sequence[int]:
+        """
+        Count the (valid) edges going in each of several vertices.
+
+        :param vertex_ids: A sequence of vertex ids, e.g. a list or a 1-d NumPy array.
+        :return: A list of int, or a NumPy int64 array if vertex_ids is a NumPy array.
+        """
+        return self.__degrees__(vertex_ids, self.__e_set__.__in_keys__)
+
+    def neighbors_many(self, vertex_ids: Sequence[int], direction: str = "both") -> List[Sequence[int]]:
+        """
+        Get the neighbors of each of several vertices. The order of each list of neighbors is NOT guaranteed.
+
+        :param vertex_ids: A sequence of vertex ids, e.g. a list or a 1-d NumPy array.
+        :param direction: "out" for the targets of the edges going out of a vertex, "in" for the sources of the
+        edges going in it, or "both" for the vertices it is connected to, as connected_vertices.
+        :return: A list with a list of vertex ids per vertex, or a NumPy array per vertex if vertex_ids is a NumPy
+        array.
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError("The direction should be out, in or both, but it is " + str(direction))
+        v_set, e_set = self.__v_set__, self.__e_set__
+        find = self.__vertex_finder__()
+        live_vertices = {}
+        ret = []
+        for vertex_key in [find(vertex_id) for vertex_id in self.__as_list__(vertex_ids)]:
+            neighbors = []
+            if vertex_key is not None:
+                edge_keys = e_set.__out_keys__(vertex_key) if direction != "in" else []
+                if direction != "out":
+                    edge_keys = edge_keys + e_set.__in_keys__(vertex_key)
+                appeared = set()
+                for edge_key, exist in zip(edge_keys, e_set.__exist_keys__(edge_keys, live_vertices)):
+                    if exist:
+                        src, target = e_set.__endpoints__(edge_key)
+                        counter_party = target if src == vertex_key else src
+                        if counter_party not in appeared:
+                            neighbors.append(v_set.__value__(counter_party))
+                            appeared.add(counter_party)
+            ret.append(self.__as_array__(vertex_ids, neighbors))
+        return ret
+
     def connected_vertices(self, vertex_id: int) -> List[int]:
         """
         Return all vertices that a vertex connected. This includes in-bounded and out-bounded connections.
         The order of the returned result is NOT guaranteed.
+        With a query cache, the result is cached until a change of the vertex, its edges or its neighbors.
 
         :param vertex_id: an integer, the vertex id that needs to look up.
         :return: A list of integer, where each represents the a connected vertex for vertex_id.
         """
+        vertex_key = self.__vertex_key__(vertex_id)
+        if vertex_key is None:
+            return []
+        cache = self.__query_cache__
+        if cache is None:
+            return self.__connected_vertices__(vertex_key)
+        query = ("connected_vertices", vertex_key)
+        ret = cache.get(query, max(self.__floor__, self.__touched__.get(vertex_key, 0)))
+        if ret is None:
+            ret = self.__connected_vertices__(vertex_key)
+            cache.put(query, self.__generation__, ret)
+        return list(ret)
+
+    def __connected_vertices__(self, vertex_key: any) -> List[int]:
+        """
+        (Internal method) Return all vertices that a vertex connected, see connected_vertices.
+
+        :param vertex_key: the vertex key that needs to look up.
+        :return: A list of vertex ids.
+        """
         appeared = set()
         ret = []
-        for edge in self.__e_set__.elements():
-            if edge.contains(vertex_id) and edge.counterparty_vertex(vertex_id) not in appeared:
-                counter_party = edge.counterparty_vertex(vertex_id)
-                ret.append(counter_party)
-                appeared.add(counter_party)
+        for edge_key in self.__e_set__.__out_keys__(vertex_key) + self.__e_set__.__in_keys__(vertex_key):
+            if self.__e_set__.__exist_key__(edge_key):
+                src, target = self.__e_set__.__endpoints__(edge_key)
+                counter_party = target if src == vertex_key else src
+                if counter_party not in appeared:
+                    ret.append(self.__v_set__.__value__(counter_party))
+                    appeared.add(counter_party)
         return ret
 
     def merge(self, another: 'LwwDiGraph') -> 'LwwDiGraph':
@@ -137,10 +570,32 @@ class LwwDiGraph(object):
         :param another: Another LwwDiGraph.
         :return: The graph itself, with updated view from another graph.
         """
-        self.__v_set__.merge(another.__v_set__)
-        self.__e_set__.merge(another.__e_set__)
+        self.__merge_all__([another], "LwwDiGraph.merge")
+        return self
+
+    def merge_all(self, graphs: List['LwwDiGraph']) -> 'LwwDiGraph':
+        """
+        Merge several LwwDiGraph at once, in a single pass over the marks of each graph.
+        This is equivalent to merging them one after another, without the intermediate views.
+
+        :param graphs: A list of LwwDiGraph.
+        :return: The graph itself, with updated view from the other graphs.
+        """
+        self.__merge_all__(graphs, "LwwDiGraph.merge_all")
         return self
 
+    @staticmethod
+    def merge_graphs(graphs: List['LwwDiGraph']) -> 'LwwDiGraph':
+        """
+        Static helper method for merging any number of LwwDiGraph and create new one, in a single pass over
+        the marks of each graph. It has the vertex codec of the first graph, and keeps its marks in memory.
+
+        :param graphs: A non-empty list of LwwDiGraph.
+        :return: A newly created LwwDiGraph, with the merged view of all the graphs.
+        """
+        assert len(graphs) > 0, "At least one graph is needed to be merged."
+        return LwwDiGraph(vertex_codec=graphs[0].__v_set__.codec()).merge_all(graphs)
+
     def list_all_path(self, src: int, target: int) -> List[List[int]]:
         """
         List all path from lww_graph to target.
@@ -150,20 +605,163 @@ class LwwDiGraph(object):
         :param src: an integer, the source vertex id that needs to look up.
         :param target: an integer, the target vertex id that needs to look up.
         :return: A list of list of integer. Where each list in the list is a path from lww_graph to target.
+        With a query cache, the result is cached until the next change of the graph.
+        """
+        cache = self.__query_cache__
+        if cache is None:
+            return self.__list_all_path__(src, target)
+        query = ("list_all_path", src, target)
+        result = cache.get(query, self.__generation__)
+        if result is None:
+            result = self.__list_all_path__(src, target)
+            cache.put(query, self.__generation__, result)
+        return [list(path) for path in result]
+
+    def __list_all_path__(self, src: int, target: int) -> List[List[int]]:
+        """
+        (Internal method) List all path from src to target, see list_all_path.
         """
         result = []
         if not (self.vertex_exist(src) and self.vertex_exist(target)):
             return result
-        self.__list_path__dfs__(src, target, set(), [src], result)
-        return result
+        src_key, target_key = self.__v_set__.__key__(src), self.__v_set__.__key__(target)
+        self.__list_path__dfs__(src_key, target_key, set(), [src_key], result)
+        return [[self.__v_set__.__value__(key) for key in path] for path in result]
+
+    def shortest_path(self, src: int, target: int, weight: str = "weight",
+                      default_weight: Union[int, float] = 1) -> Tuple[Union[int, float], List[int]]:
+        """
+        Find a shortest path from src to target (Dijkstra), weighted by an edge attribute.
+
+        :param src: the source vertex id that needs to look up.
+        :param target: the target vertex id that needs to look up.
+        :param weight: The name of the edge attribute holding the weight, weights have to be non-negative.
+        :param default_weight: The weight of edges without the weight attribute.
+        :return: A tuple of the length of the path and the path, as a list of vertex ids from src to target.
+        If target cannot be reached, a float type inf and an empty list.
+        """
+        if not (self.vertex_exist(src) and self.vertex_exist(target)):
+            return float('inf'), []
+        e_set = self.__e_set__
+        weights = self.__e_attrs__.column(weight)
+        src_key, target_key = self.__v_set__.__key__(src), self.__v_set__.__key__(target)
+
+        distances = {src_key: 0}
+        previous = {}
+        visited = set()
+        # the counter breaks ties, so that vertex keys are never compared
+        queue = [(0, 0, src_key)]
+        pushed = 1
+        while queue:
+            distance, _, vertex_key = heapq.heappop(queue)
+            if vertex_key in visited:
+                continue
+            visited.add(vertex_key)
+            if vertex_key == target_key:
+                break
+            for edge_key in e_set.__out_keys__(vertex_key):
+                if not e_set.__exist_key__(edge_key):
+                    continue
+                edge_weight = weights.get(edge_key, default_weight)
+                if edge_weight < 0:
+                    raise ValueError("Edge weights should be non-negative, but {} has the weight of {}"
+                                     .format(e_set.__value__(edge_key), edge_weight))
+                neighbor = e_set.__endpoints__(edge_key)[1]
+                if neighbor not in distances or distance + edge_weight < distances[neighbor]:
+                    distances[neighbor] = distance + edge_weight
+                    previous[neighbor] = vertex_key
+                    heapq.heappush(queue, (distance + edge_weight, pushed, neighbor))
+                    pushed += 1
+
+        if target_key not in visited:
+            return float('inf'), []
+        path = [target_key]
+        while path[-1] != src_key:
+            path.append(previous[path[-1]])
+        return distances[target_key], [self.__v_set__.__value__(key) for key in reversed(path)]
+
+    def topological_sort(self) -> List[int]:
+        """
+        Sort the vertices of the local view of this graph in topological order (Kahn's algorithm).
+        To keep an order up to date with the changes of the graph, see set_topological_order.
+
+        :return: A list of vertex ids, each vertex coming before the targets of its edges.
+        :raise ValueError: If the graph has a cycle.
+        """
+        keys = self.__v_set__.__live_keys__()
+        successors = {vertex_key: self.__connected_vertices_outgoing__(vertex_key) for vertex_key in keys}
+        in_degree = dict.fromkeys(keys, 0)
+        for targets in successors.values():
+            for target in targets:
+                in_degree[target] += 1
+        ready = deque(vertex_key for vertex_key in keys if in_degree[vertex_key] == 0)
+        order = []
+        while ready:
+            vertex_key = ready.popleft()
+            order.append(vertex_key)
+            for target in successors[vertex_key]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+        if len(order) < len(keys):
+            raise ValueError("The graph has a cycle, see strongly_connected_components.")
+        return [self.__v_set__.__value__(vertex_key) for vertex_key in order]
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Find the strongly connected components of the local view of this graph (Tarjan's algorithm).
+        A vertex out of any cycle is a component of its own.
+
+        :return: A list of components, each a list of vertex ids. Components are in topological order: no edge
+        goes from a component to an earlier one.
+        """
+        keys = self.__v_set__.__live_keys__()
+        successors = {vertex_key: self.__connected_vertices_outgoing__(vertex_key) for vertex_key in keys}
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        components = []
+        for root in keys:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(successors[root]))]
+            while work:
+                vertex_key, targets = work[-1]
+                for target in targets:
+                    if target not in index:
+                        index[target] = low[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(successors[target])))
+                        break
+                    if target in on_stack:
+                        low[vertex_key] = min(low[vertex_key], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[vertex_key])
+                    if low[vertex_key] == index[vertex_key]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(self.__v_set__.__value__(member))
+                            if member == vertex_key:
+                                break
+                        components.append(component)
+        components.reverse()
+        return components
 
     def __list_path__dfs__(self, src: int, target: int,
                            visited: Set[int], current: List[int], result: List[List[int]]):
         """
-        (Internal method) Deep First Search helper for path finding.
+        (Internal method) Deep First Search helper for path finding. It works on vertex keys.
 
-        :param src: an integer, the source vertex id that needs to look up.
-        :param target: an integer, the target vertex id that needs to look up.
+        :param src: the source vertex key that needs to look up.
+        :param target: the target vertex key that needs to look up.
         :param visited: A mark set to break circled visit.
         :param current: Current path.
         :param result: Final result.
@@ -178,17 +776,269 @@ class LwwDiGraph(object):
                     self.__list_path__dfs__(out_neighbor, target, visited, current + [out_neighbor], result)
                     visited.remove(out_neighbor)
 
-    def __connected_vertices_outgoing__(self, vertex_id: int) -> List[int]:
+    def __connected_vertices_outgoing__(self, vertex_key: int) -> List[int]:
         """
         Return all vertices that the vertex is the source. Out-bounded connections only.
 
-        :param vertex_id: an integer, the vertex id that needs to look up.
-        :return: a list of int, where each represents the a out-bounded connected vertex for vertex_id.
+        :param vertex_key: the vertex key that needs to look up.
+        :return: a list of vertex keys, where each represents the a out-bounded connected vertex for vertex_key.
+        """
+        e_set = self.__e_set__
+        return [e_set.__endpoints__(edge_key)[1]
+                for edge_key in e_set.__out_keys__(vertex_key) if e_set.__exist_key__(edge_key)]
+
+    def __degrees__(self, vertex_ids: Sequence[int], edge_keys: Callable[[any], List[any]]) -> Sequence[int]:
+        """
+        (Internal method) Count the valid edges of each of several vertices.
+
+        :param vertex_ids: A sequence of vertex ids.
+        :param edge_keys: The function listing the edge keys of a vertex key, __out_keys__ or __in_keys__.
+        :return: A list of int, or a NumPy int64 array if vertex_ids is a NumPy array.
+        """
+        e_set = self.__e_set__
+        find = self.__vertex_finder__()
+        live_vertices = {}
+        ret = []
+        for vertex_key in [find(vertex_id) for vertex_id in self.__as_list__(vertex_ids)]:
+            if vertex_key is None:
+                ret.append(0)
+            else:
+                ret.append(sum(e_set.__exist_keys__(edge_keys(vertex_key), live_vertices)))
+        return self.__as_array__(vertex_ids, ret, "int64")
+
+    @staticmethod
+    def __as_list__(values: Sequence) -> list:
+        """
+        (Internal method) Get the values of a sequence as a python list, NumPy arrays are converted to python values.
+        """
+        return values.tolist() if numpy is not None and isinstance(values, numpy.ndarray) else list(values)
+
+    @staticmethod
+    def __as_array__(like: Sequence, values: list, dtype: any = None) -> Sequence:
+        """
+        (Internal method) Get the result of a batch query as a NumPy array if the query was a NumPy array,
+        as a python list otherwise.
+
+        :param like: The sequence the query was made with.
+        :param values: The result, as a python list.
+        :param dtype: The NumPy dtype of the array, the dtype of like if not given.
+        """
+        if numpy is not None and isinstance(like, numpy.ndarray):
+            return numpy.array(values, dtype=dtype if dtype is not None else like.dtype)
+        return values
+
+    def __vertex_finder__(self) -> Callable[[any], any]:
+        """
+        (Internal method) Get the function looking up the key of a vertex id, without registering it in the codec.
+        """
+        codec = self.__v_set__.codec()
+        return codec.find if codec is not None else lambda vertex_id: vertex_id
+
+    def __vertex_key__(self, vertex_id: int) -> any:
+        """
+        (Internal method) Get the key of a vertex id in the vertex set, without registering it in the codec.
+
+        :param vertex_id: the vertex id.
+        :return: The vertex key, or None if the codec has never seen the vertex id.
+        """
+        codec = self.__v_set__.codec()
+        return vertex_id if codec is None else codec.find(vertex_id)
+
+    def __merge_all__(self, graphs: List['LwwDiGraph'], operation: str):
+        """
+        (Internal method) Merge the marks and attributes of several graphs into this graph.
+
+        :param graphs: A list of LwwDiGraph.
+        :param operation: The operation name the stats are reported with.
+        :return: None
+        """
+        if self.__interest__ is not None:
+            # the vertices of the halo of this replica may be unknown to the halo of the merged graphs
+            halo = self.__halo__()
+            graphs = [another.__partition__(self.__interest__, halo) for another in graphs]
+        changed_vertices = self.__v_set__.__merge_all__([another.__v_set__ for another in graphs])
+        changed_edges = self.__e_set__.__merge_all__([another.__e_set__ for another in graphs])
+        if changed_vertices or changed_edges:
+            self.__touch__(vertex_keys=changed_vertices, edge_keys=changed_edges)
+        changed_attributes = 0
+        for another in graphs:
+            changed_attributes += len(self.__v_attrs__.merge(
+                another.__v_attrs__, self.__v_set__.__translator__(another.__v_set__)))
+            changed_attributes += len(self.__e_attrs__.merge(
+                another.__e_attrs__, self.__e_set__.__translator__(another.__e_set__)))
+        if self.__metrics__ is not None:
+            self.__metrics__.record_stats(operation, {
+                "vertex_keys_examined": sum(len(another.__v_set__.__added__) + len(another.__v_set__.__removed__)
+                                            for another in graphs),
+                "vertex_marks_updated": len(changed_vertices),
+                "edge_keys_examined": sum(len(another.__e_set__.__added__) + len(another.__e_set__.__removed__)
+                                          for another in graphs),
+                "edge_marks_updated": len(changed_edges),
+                "edges_revalidated": self.__e_set__.__count_revalidated__(changed_vertices, changed_edges),
+                "attributes_updated": changed_attributes
+            })
+
+    def __touch__(self, vertex_keys: List[any] = None, edge_keys: List[any] = None):
+        """
+        (Internal method) Bump the generation after a change of vertices and edges, update the topological order,
+        and invalidate the cached results it can affect: those of the changed vertices and their neighbors,
+        and of the endpoints of the changed edges. Without any key, or beyond MAX_TOUCHED_VERTICES,
+        all the cached results are invalidated.
+
+        :param vertex_keys: The keys of the vertices whose marks may have changed.
+        :param edge_keys: The keys of the edges whose marks may have changed.
+        :return: None
+        """
+        self.__generation__ += 1
+        if self.__topological_order__ is not None:
+            self.__topological_order__.__update__(vertex_keys, edge_keys)
+        if self.__query_cache__ is None:
+            return
+        generation = self.__generation__
+        touched = self.__touched__
+        vertex_keys = vertex_keys if vertex_keys is not None else []
+        edge_keys = edge_keys if edge_keys is not None else []
+        if (not vertex_keys and not edge_keys) \
+                or len(touched) + len(vertex_keys) + 2 * len(edge_keys) > self.MAX_TOUCHED_VERTICES:
+            touched.clear()
+            self.__floor__ = generation
+            return
+        e_set = self.__e_set__
+        for vertex_key in vertex_keys:
+            touched[vertex_key] = generation
+            for edge_key in e_set.__out_keys__(vertex_key) + e_set.__in_keys__(vertex_key):
+                for endpoint in e_set.__endpoints__(edge_key):
+                    touched[endpoint] = generation
+        for edge_key in edge_keys:
+            for endpoint in e_set.__endpoints__(edge_key):
+                touched[endpoint] = generation
+
+    def __save_fingerprints__(self, storage: LwwSqliteStorage) -> Callable[[], None]:
+        """
+        (Internal method) Get the flush hook saving the fingerprints of the vertex and edge sets in a storage.
+
+        :param storage: The LwwSqliteStorage keeping the marks of this graph.
+        :return: A function without arguments.
+        """
+        def save():
+            v_fingerprints = self.__v_set__.__dump_fingerprints__()
+            e_fingerprints = self.__e_set__.__dump_fingerprints__()
+            if v_fingerprints is None or e_fingerprints is None:
+                storage.write_meta("fingerprints", None)
+            else:
+                storage.write_meta("fingerprints", list(v_fingerprints + e_fingerprints))
+        return save
+
+    def __partition_keys__(self, interest: LwwInterest, halo: Set[any] = None) -> Tuple[Set[any], Set[any]]:
+        """
+        (Internal method) Get the keys of the vertices and edges of the partial replica for an interest set.
+
+        If the graph has an integer vertex codec and the interest set enumerates its vertex ids (see
+        LwwInterest.vertex_ids), as a small range does, each of them is looked up in the marks and the adjacency
+        index. Otherwise every vertex marked or indexed is decoded and checked, which is O(V). Edges are found through
+        the adjacency index, but the edges removed before they were ever added, which are scanned, as are all the
+        edges of a graph without index.
+
+        :param interest: A LwwInterest.
+        :param halo: The ids of vertices out of the interest set whose marks are selected as well, or None.
+        They are looked up one by one.
+        :return: A tuple of the set of vertex keys and the set of edge keys.
+        """
+        v_set, e_set = self.__v_set__, self.__e_set__
+        added, removed = v_set.__added__, v_set.__removed__
+        find = self.__vertex_finder__()
+        vertex_ids = None
+        if isinstance(v_set.codec(), LwwIntKeyCodec):
+            # a range interest set enumerates integer ids only, so it is complete when every id is an int
+            vertex_ids = interest.vertex_ids(len(added) + len(removed))
+        if vertex_ids is not None:
+            interest_keys = {key for key in map(find, vertex_ids) if key is not None}
+            contains = interest_keys.__contains__
+            vertex_keys = {key for key in interest_keys if key in added or key in removed}
+        else:
+            inside = {}
+
+            def contains(vertex_key: any) -> bool:
+                held = inside.get(vertex_key)
+                if held is None:
+                    held = inside[vertex_key] = interest.contains(v_set.__value__(vertex_key))
+                return held
+
+            vertex_keys = {key for key in itertools.chain(added, removed) if contains(key)}
+        edge_keys = set()
+        if e_set.__out_index__ is not None:
+            if vertex_ids is not None:
+                vertex_keys.update(key for key in interest_keys
+                                   if key in e_set.__out_index__ or key in e_set.__in_index__)
+            else:
+                vertex_keys.update(key for key in itertools.chain(e_set.__out_index__, e_set.__in_index__)
+                                   if contains(key))
+            for vertex_key in vertex_keys:
+                edge_keys.update(e_set.__out_keys__(vertex_key))
+                edge_keys.update(e_set.__in_keys__(vertex_key))
+            # edges removed before they were ever added are not in the index
+            candidates = e_set.__removed__
+        else:
+            candidates = itertools.chain(e_set.__added__, e_set.__removed__)
+        for edge_key in candidates:
+            if edge_key not in edge_keys:
+                src, target = e_set.__endpoints__(edge_key)
+                if contains(src) or contains(target):
+                    edge_keys.add(edge_key)
+        for edge_key in edge_keys:
+            vertex_keys.update(e_set.__endpoints__(edge_key))
+        if halo:
+            halo_keys = (find(vertex_id) for vertex_id in halo)
+            vertex_keys.update(key for key in halo_keys if key is not None and (key in added or key in removed))
+        return vertex_keys, edge_keys
+
+    def __halo__(self) -> Set[any]:
+        """
+        (Internal method) Get the ids of the endpoints of the edges held by this graph. A partial replica merges
+        their marks even when the merged graph holds none of their edges, e.g. the removal of a vertex of its halo.
+
+        :return: A set of vertex ids.
+        """
+        v_set, e_set = self.__v_set__, self.__e_set__
+        if e_set.__out_index__ is not None:
+            vertex_keys = itertools.chain(e_set.__out_index__, e_set.__in_index__)
+        else:
+            vertex_keys = itertools.chain.from_iterable(
+                e_set.__endpoints__(edge_key) for edge_key in itertools.chain(e_set.__added__, e_set.__removed__))
+        return {v_set.__value__(vertex_key) for vertex_key in vertex_keys}
+
+    @staticmethod
+    def __select_marks__(lww_set: 'LwwVertexSet', keys: Set[any]) -> Tuple[Dict[any, int], Dict[any, int]]:
+        """
+        (Internal method) Copy the added and removed marks of some keys of a set.
+
+        :param lww_set: A LwwVertexSet or LwwEdgeSet.
+        :param keys: A set of keys.
+        :return: A tuple of the added and removed marks, as dicts.
+        """
+        added, removed = lww_set.__added__, lww_set.__removed__
+        return {key: added[key] for key in keys if key in added}, {key: removed[key] for key in keys if key in removed}
+
+    def __attributes_view__(self) -> Tuple[Dict[str, Dict[any, any]], Dict[str, Dict[any, any]]]:
+        """
+        (Internal method) Get the attributes of the vertices and edges in the local view of this graph.
+
+        :return: A tuple of 2 dicts, for vertices and edges, from attribute name to a dict from vertex id or edge
+        to the attribute value.
         """
-        return [edge.counterparty_vertex(vertex_id)
-                for edge in self.__e_set__.elements() if edge.src == vertex_id]
+        views = []
+        for lww_set, attributes in ((self.__v_set__, self.__v_attrs__), (self.__e_set__, self.__e_attrs__)):
+            view = {}
+            for name in attributes.names():
+                column = {lww_set.__value__(key): value for key, value in attributes.column(name).items()
+                          if lww_set.__exist_key__(key)}
+                if column:
+                    view[name] = column
+            views.append(view)
+        return views[0], views[1]
 
     def __eq__(self, other):
         return isinstance(other, LwwDiGraph) \
                and self.__e_set__ == other.__e_set__\
-               and self.__v_set__ == other.__v_set__
+               and self.__v_set__ == other.__v_set__ \
+               and self.__attributes_view__() == other.__attributes_view__()
@@ -21,7 +21,7 @@ class LwwEdge(object):
         return "Edge[{} -> {}]".format(self.src, self.target)
 
     def __hash__(self):
-        return (self.src << 32) + self.target
+        return hash((self.src, self.target))
 
     def __repr__(self):
         return self.__str__()
@@ -29,4 +29,4 @@ class LwwEdge(object):
     def __lt__(self, other):
         if not isinstance(other, LwwEdge):
             raise ValueError("Cannot compare")
-        return self.src - other.src if self.src != other.src else self.target - other.target
+        return (self.src, self.target) < (other.src, other.target)
@@ -0,0 +1,60 @@
+from typing import Tuple
+
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+
+
+class LwwEdgeKeyCodec(LwwKeyCodec):
+    """
+    Codec for LwwEdge keys, packing the source and target vertex ids, encoded by the vertex codec,
+    into a single integer. The source vertex takes the most significant bits, so all edges going out of
+    a vertex are a contiguous range of keys.
+    """
+
+    def __init__(self, vertex_codec: LwwKeyCodec):
+        self.vertex_codec = vertex_codec
+        self.width = 2 * vertex_codec.width
+        self.stable = vertex_codec.stable
+        self.__mask__ = (1 << vertex_codec.width) - 1
+
+    def encode(self, key: LwwEdge) -> int:
+        if not isinstance(key, LwwEdge):
+            raise ValueError("The key should be a LwwEdge, but it has the type of " + str(type(key)))
+        return self.pack(self.vertex_codec.encode(key.src), self.vertex_codec.encode(key.target))
+
+    def decode(self, code: int) -> LwwEdge:
+        src, target = self.split(code)
+        return LwwEdge(self.vertex_codec.decode(src), self.vertex_codec.decode(target))
+
+    def find(self, key: LwwEdge) -> int:
+        if not isinstance(key, LwwEdge):
+            return None
+        src = self.vertex_codec.find(key.src)
+        target = self.vertex_codec.find(key.target)
+        return None if src is None or target is None else self.pack(src, target)
+
+    def pack(self, src: int, target: int) -> int:
+        """
+        Pack 2 encoded vertex ids into an edge key.
+
+        :param src: The encoded source vertex id.
+        :param target: The encoded target vertex id.
+        :return: The edge key.
+        """
+        return (src << self.vertex_codec.width) | target
+
+    def split(self, code: int) -> Tuple[int, int]:
+        """
+        Split an edge key into its encoded vertex ids, it is the inverse of pack.
+
+        :param code: The edge key.
+        :return: A tuple of the encoded source and target vertex ids.
+        """
+        return code >> self.vertex_codec.width, code & self.__mask__
+
+    def compatible(self, other: LwwKeyCodec) -> bool:
+        return self is other or (isinstance(other, LwwEdgeKeyCodec)
+                                 and self.vertex_codec.compatible(other.vertex_codec))
+
+    def __hash__(self):
+        return hash((LwwEdgeKeyCodec, self.vertex_codec))
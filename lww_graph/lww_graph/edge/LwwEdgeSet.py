@@ -1,9 +1,12 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+from lww_graph.LwwFingerprint import LwwFingerprint
 from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwEdgeKeyCodec import LwwEdgeKeyCodec
 from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
 from lww_graph.lww_graph.vertex.LwwVertexSet import LwwVertexSet
 from lww_graph.lww_set.LwwSet import LwwSet
+from lww_graph.storage.LwwCowDict import LwwCowDict
 
 
 class LwwEdgeSet(LwwSet):
@@ -13,13 +16,46 @@ class LwwEdgeSet(LwwSet):
 
     Its a LwwSet limiting the type of input to LwwEdge - for better typing control.
     It also rewrite the exist, elements and elements_with_time methods to implement Tombstone mechanism.
+
+    If the vertex set has a key codec, edges are keyed by their packed vertex keys (see LwwEdgeKeyCodec).
+
+    Edges going out of and in a vertex are found through an in-memory adjacency index of the marked edges,
+    or, if the marks are kept in a store supporting range scans (e.g. LwwSqliteMarkStore), by scanning the store.
+
+    The validity of the edges of a vertex changes with the marks of the vertex, so the number of valid edges and
+    the view fingerprint are updated lazily: the marks of the edges and vertices written are kept as they were,
+    and the edges whose validity may have changed are checked once, on the next read (see __refresh__).
     """
 
+    # Beyond this number of edges or vertices written since the last refresh, the set is refreshed on write.
+    MAX_STALE_KEYS = 1 << 16
+
     def __init__(self, node_set: 'LwwVertexSet' = None,
                  added_mark: Dict[LwwEdge, int] = None,
                  remove_mark: Dict[LwwEdge, int] = None):
-        LwwSet.__init__(self, added_mark, remove_mark)
+        vertex_codec = node_set.codec() if node_set is not None else None
+        # the vertex set is needed to tell valid edges apart, from the first mark on
         self.node_set = node_set
+        # Marks of the edges and of the vertices written since the last refresh, as they were then
+        self.__stale_edges__: Dict[any, Tuple[int, int]] = {}
+        self.__stale_vertices__: Dict[any, Tuple[int, int]] = {}
+        LwwSet.__init__(self, added_mark, remove_mark,
+                        LwwEdgeKeyCodec(vertex_codec) if vertex_codec is not None else None)
+        if node_set is not None:
+            node_set.__dependents__.append(self)
+
+        # Adjacency index, from a vertex key to the keys of edges going out of / in it
+        # Once forked, the lists of edge keys are shared too, so a list is copied before its first append,
+        # the vertex keys of the lists owned by this set are kept in __owned__.
+        self.__owned__ = None
+        if self.__codec__ is not None and hasattr(self.__added__, "range_keys"):
+            self.__out_index__ = None
+            self.__in_index__ = None
+        else:
+            self.__out_index__: Dict[any, List[any]] = {}
+            self.__in_index__: Dict[any, List[any]] = {}
+            for key in self.__added__:
+                self.__index_edge__(key)
 
     def exist(self, edge: LwwEdge) -> bool:
         """
@@ -44,11 +80,7 @@ class LwwEdgeSet(LwwSet):
         :param edge: The edge to exam.
         :return: True if the edge is valid and is presented in the set, otherwise False.
         """
-        return super().exist(edge) \
-               and self.node_set.exist(edge.src) \
-               and self.node_set.exist(edge.target) \
-               and self.node_set.last_added_timestamp(edge.src) < self.last_added_timestamp(edge) \
-               and self.node_set.last_added_timestamp(edge.target) < self.last_added_timestamp(edge)
+        return super().exist(edge)
 
     def elements(self) -> List[LwwEdge]:
         """
@@ -67,6 +99,239 @@ class LwwEdgeSet(LwwSet):
 
         :return A python list, which contains LwwTimedEdge object(s), ascending ordered by last added timestamp.
         """
-        res = [LwwTimedEdge(key, self.__added__[key]) for key in self.__added__.keys() if self.exist(key)]
-        return sorted(res, key=lambda ele: (self.__added__[ele], ele))  # order: (timestamp, object)
+        return [LwwTimedEdge(self.__value__(key), self.__added__[key]) for key in self.__live_keys__()]
+
+    def __exist_key__(self, key: any) -> bool:
+        """
+        [internal method] Check if a (valid) edge existing in the set, by its key. See exist for the conditions.
+
+        :param key: The key of the edge to exam.
+        :return: True if the edge is valid and is presented in the set, otherwise False.
+        """
+        if self.node_set is None or not super().__exist_key__(key):
+            return False
+        src, target = self.__endpoints__(key)
+        vertex_added = self.node_set.__added__
+        edge_added = self.__added__[key]
+        return self.node_set.__exist_key__(src) \
+            and self.node_set.__exist_key__(target) \
+            and vertex_added[src] < edge_added \
+            and vertex_added[target] < edge_added
+
+    def __exist_keys__(self, keys: List[any], live_vertices: Dict[any, int] = None) -> List[bool]:
+        """
+        [internal method] Check if (valid) edges are in the set by their keys, in bulk. See exist for the conditions.
+        The marks of each vertex are looked up once for all the keys.
+
+        :param keys: A list of edge keys, a key can be None for an edge never encoded.
+        :param live_vertices: An optional dict from vertex keys to their last added timestamp, or None if they are
+        not in the vertex set, filled as vertices are looked up, so that it can be shared by several calls.
+        :return: A list of bool, True for each key whose edge is valid and presented in the set.
+        """
+        live_vertices = live_vertices if live_vertices is not None else {}
+        node_set = self.node_set
+        vertex_added = node_set.__added__
+        endpoints = self.__endpoints__
+        ret = []
+        for key, exist in zip(keys, LwwSet.__exist_keys__(self, keys)):
+            if exist:
+                edge_added = self.__added__[key]
+                for vertex_key in endpoints(key):
+                    if vertex_key not in live_vertices:
+                        live_vertices[vertex_key] = vertex_added[vertex_key] \
+                            if node_set.__exist_key__(vertex_key) else None
+                    vertex_timestamp = live_vertices[vertex_key]
+                    if vertex_timestamp is None or vertex_timestamp >= edge_added:
+                        exist = False
+                        break
+            ret.append(exist)
+        return ret
+
+    def __endpoints__(self, key: any) -> Tuple[any, any]:
+        """
+        [internal method] Get the keys of the source and target vertices of an edge in the vertex set.
+
+        :param key: The key of the edge.
+        :return: A tuple of the source and target vertex keys.
+        """
+        if self.__codec__ is None:
+            return key.src, key.target
+        return self.__codec__.split(key)
+
+    def fork(self, node_set: LwwVertexSet = None) -> 'LwwEdgeSet':
+        """
+        Get a copy of the set, sharing the marks and the adjacency index with this set copy-on-write.
+        See LwwSet.fork.
+
+        :param node_set: The vertex set of the copy, the vertex set of this set if not given.
+        :return: A new LwwEdgeSet.
+        """
+        forked = LwwEdgeSet(node_set if node_set is not None else self.node_set)
+        forked.__added__, forked.__removed__ = self.__fork_marks__()
+        forked.__load_fingerprints__(self.__dump_fingerprints__())
+        forked.__canonical__ = self.__canonical__
+        if self.__out_index__ is not None:
+            if not isinstance(self.__out_index__, LwwCowDict):
+                self.__out_index__ = LwwCowDict(self.__out_index__)
+                self.__in_index__ = LwwCowDict(self.__in_index__)
+            forked.__out_index__ = self.__out_index__.fork()
+            forked.__in_index__ = self.__in_index__.fork()
+            self.__owned__ = (set(), set())
+            forked.__owned__ = (set(), set())
+        if self.__metrics__ is not None:
+            forked.set_metrics_sink(self.__metrics__)
+        return forked
+
+    def __out_keys__(self, vertex_key: any) -> List[any]:
+        """
+        [internal method] Get the keys of the edges going out of a vertex, including the invalid ones.
+
+        :param vertex_key: The key of the vertex.
+        :return: A list of edge keys.
+        """
+        if self.__out_index__ is not None:
+            return self.__out_index__.get(vertex_key, [])
+        return self.__added__.range_keys(self.__codec__.pack(vertex_key, 0), self.__codec__.pack(vertex_key + 1, 0))
+
+    def __in_keys__(self, vertex_key: any) -> List[any]:
+        """
+        [internal method] Get the keys of the edges going in a vertex, including the invalid ones.
+
+        :param vertex_key: The key of the vertex.
+        :return: A list of edge keys.
+        """
+        if self.__in_index__ is not None:
+            return self.__in_index__.get(vertex_key, [])
+        return self.__added__.reverse_range_keys(self.__codec__.pack(vertex_key, 0),
+                                                 self.__codec__.pack(vertex_key + 1, 0))
 
+    def __index_edge__(self, key: any):
+        """
+        [internal method] Add an edge key to the adjacency index.
+
+        :param key: The key of the edge.
+        :return: None
+        """
+        src, target = self.__endpoints__(key)
+        for direction, index, vertex_key in ((0, self.__out_index__, src), (1, self.__in_index__, target)):
+            keys = index.get(vertex_key)
+            if keys is not None and (self.__owned__ is None or vertex_key in self.__owned__[direction]):
+                keys.append(key)
+                continue
+            index[vertex_key] = [key] if keys is None else keys + [key]
+            if self.__owned__ is not None:
+                self.__owned__[direction].add(vertex_key)
+
+    def __mark__(self, dict_to_add: dict, obj: any, timestamp: int) -> bool:
+        """
+        [internal method] The mark process of LwwSet, which also keeps the adjacency index up to date.
+        """
+        if self.__out_index__ is not None and dict_to_add is self.__added__ and obj not in dict_to_add:
+            self.__index_edge__(obj)
+        return LwwSet.__mark__(self, dict_to_add, obj, timestamp)
+
+    def __write_mark__(self, marks: dict, key: any, timestamp: int):
+        """
+        [internal method] Write a mark, updating the fingerprint of the marks. The validity of the edge is checked
+        on the next refresh.
+        """
+        if self.__marks_fingerprint__ is None:
+            marks[key] = timestamp
+            return
+        if self.__canonical__ and self.__codec__ is None:
+            self.__canonical__ = LwwFingerprint.is_canonical(key)
+        if key not in self.__stale_edges__:
+            if len(self.__stale_edges__) >= self.MAX_STALE_KEYS:
+                self.__refresh__()
+            self.__stale_edges__[key] = (self.__added__.get(key), self.__removed__.get(key))
+        self.__hash_mark__(marks, key, timestamp)
+
+    def __on_dependency_mark__(self, key: any):
+        """
+        [internal method] Keep the marks of a vertex as they were before it is written, so that the validity of
+        its edges is checked on the next refresh.
+        """
+        if self.__marks_fingerprint__ is None or key in self.__stale_vertices__:
+            return
+        if len(self.__stale_vertices__) >= self.MAX_STALE_KEYS:
+            self.__refresh__()
+        self.__stale_vertices__[key] = (self.node_set.__added__.get(key), self.node_set.__removed__.get(key))
+
+    def __refresh__(self):
+        """
+        [internal method] Update the number of valid edges and the view fingerprint for the edges and vertices
+        written since the last refresh: an edge written or adjacent to a vertex written is counted again if it was
+        valid with the marks as they were, and is not any more, or the other way around.
+        """
+        LwwSet.__refresh__(self)
+        stale_edges, stale_vertices = self.__stale_edges__, self.__stale_vertices__
+        if not stale_edges and not stale_vertices:
+            return
+        edge_keys = set(stale_edges)
+        for vertex_key in stale_vertices:
+            edge_keys.update(self.__out_keys__(vertex_key))
+            edge_keys.update(self.__in_keys__(vertex_key))
+        for key in edge_keys:
+            edge_marks = stale_edges.get(key)
+            if edge_marks is None:
+                edge_marks = (self.__added__.get(key), self.__removed__.get(key))
+            vertex_marks = []
+            for vertex_key in self.__endpoints__(key):
+                marks = stale_vertices.get(vertex_key)
+                if marks is None:
+                    marks = (self.node_set.__added__.get(vertex_key), self.node_set.__removed__.get(vertex_key))
+                vertex_marks.append(marks)
+            live = self.__exist_key__(key)
+            if self.__valid__(edge_marks, vertex_marks) != live:
+                self.__update_live__(key, live)
+        stale_edges.clear()
+        stale_vertices.clear()
+
+    def __rehash__(self):
+        """
+        [internal method] Compute the number of valid edges and the fingerprints from the marks, see LwwSet.
+        """
+        self.__stale_edges__.clear()
+        self.__stale_vertices__.clear()
+        LwwSet.__rehash__(self)
+
+    @staticmethod
+    def __valid__(edge_marks: Tuple[int, int], vertex_marks: List[Tuple[int, int]]) -> bool:
+        """
+        [internal method] Check if an edge is valid from its marks and those of its vertices, as __exist_key__.
+
+        :param edge_marks: The added and removed timestamps of the edge, None for a missing mark.
+        :param vertex_marks: The added and removed timestamps of the source and target vertices.
+        :return: True if the edge is valid.
+        """
+        edge_added, edge_removed = edge_marks
+        if edge_added is None or (edge_removed is not None and edge_added <= edge_removed):
+            return False
+        for vertex_added, vertex_removed in vertex_marks:
+            if vertex_added is None or (vertex_removed is not None and vertex_added <= vertex_removed) \
+                    or vertex_added >= edge_added:
+                return False
+        return True
+
+    def __on_added__(self, keys: List[any]):
+        """
+        [internal method] Add the edge keys added by a merge to the adjacency index.
+        """
+        if self.__out_index__ is not None:
+            for key in keys:
+                self.__index_edge__(key)
+
+    def __count_revalidated__(self, changed_vertices: List[int], changed_edges: List[LwwEdge]) -> int:
+        """
+        [internal method] Count the edges whose validity has to be re-evaluated after marks changed in a merge.
+        An edge is affected if its own marks changed, or if the marks of one of its vertices changed.
+
+        :param changed_vertices: The keys of vertices whose marks changed.
+        :param changed_edges: The keys of edges whose marks changed.
+        :return: The number of distinct edges affected.
+        """
+        affected = set(changed_edges)
+        for vertex_key in set(changed_vertices):
+            affected.update(self.__out_keys__(vertex_key))
+            affected.update(self.__in_keys__(vertex_key))
+        return len(affected)
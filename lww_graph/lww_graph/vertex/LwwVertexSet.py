@@ -1,5 +1,6 @@
 from typing import Dict
 
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
 from lww_graph.lww_set.LwwSet import LwwSet
 
 
@@ -7,7 +8,9 @@ class LwwVertexSet(LwwSet):
     """
     Vertex set class for save vertices in LwwDiGraph.
     Its a LwwSet limiting the type of input to integer - for better typing control.
+    Vertex ids of other types (e.g. UUID strings) are supported by giving a key codec encoding them to integers.
     """
     def __init__(self, added_mark: Dict[int, int] = None,
-                 remove_mark: Dict[int, int] = None):
-        LwwSet.__init__(self, added_mark, remove_mark)
+                 remove_mark: Dict[int, int] = None,
+                 codec: LwwKeyCodec = None):
+        LwwSet.__init__(self, added_mark, remove_mark, codec)
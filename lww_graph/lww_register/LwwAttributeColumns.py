@@ -0,0 +1,156 @@
+from typing import Callable, Dict, List, Set, Tuple, Union
+
+from lww_graph.LwwFingerprint import LwwFingerprint
+from lww_graph.storage.LwwCowDict import LwwCowDict
+
+
+class LwwAttributeColumns(object):
+    """
+    A Last-Writer-Win state based register per (key, attribute name), stored by columns:
+    every attribute name has one dict of values and one dict of timestamps, both keyed by the element keys.
+    Scanning an attribute over all elements is then a scan of a single dict.
+
+    A write wins over the current one if it has a later timestamp. For writes of the same timestamp,
+    the one with the greater repr of its value wins, so that every replica picks the same.
+
+    A fingerprint of the registers (see LwwFingerprint) is kept up to date with the writes.
+    """
+
+    def __init__(self):
+        self.__values__: Dict[str, Dict[any, any]] = {}
+        self.__timestamps__: Dict[str, Dict[any, Union[int, float]]] = {}
+        self.__fingerprint__ = 0
+
+    def set(self, key: any, name: str, value: any, timestamp: int) -> bool:
+        """
+        Write the register of an element attribute.
+
+        :param key: The key of the element.
+        :param name: The attribute name.
+        :param value: The value to be written.
+        :param timestamp: An integer that representing the timestamp of the write.
+        :return: True if the write won and the register was updated, otherwise False.
+        """
+        timestamps = self.__timestamps__.get(name)
+        if timestamps is None:
+            timestamps = self.__timestamps__[name] = {}
+            self.__values__[name] = {}
+        current_timestamp = timestamps.get(key)
+        if current_timestamp is not None:
+            if current_timestamp > timestamp:
+                return False
+            if current_timestamp == timestamp and repr(self.__values__[name][key]) >= repr(value):
+                return False
+            self.__fingerprint__ -= self.__hash_register__(key, name, self.__values__[name][key], current_timestamp)
+        self.__fingerprint__ = (self.__fingerprint__ + self.__hash_register__(key, name, value, timestamp)) \
+            & LwwFingerprint.MASK
+        timestamps[key] = timestamp
+        self.__values__[name][key] = value
+        return True
+
+    def get(self, key: any, name: str, default: any = None) -> any:
+        """
+        Read the register of an element attribute.
+
+        :param key: The key of the element.
+        :param name: The attribute name.
+        :param default: The value returned if the register was never written.
+        :return: The value of the register.
+        """
+        column = self.__values__.get(name)
+        return default if column is None else column.get(key, default)
+
+    def timestamp(self, key: any, name: str) -> Union[int, float]:
+        """
+        Get the timestamp of the last write of an element attribute.
+
+        :param key: The key of the element.
+        :param name: The attribute name.
+        :return: The timestamp, or a float type -inf if the register was never written.
+        """
+        timestamps = self.__timestamps__.get(name)
+        return float('-inf') if timestamps is None else timestamps.get(key, float('-inf'))
+
+    def column(self, name: str) -> Dict[any, any]:
+        """
+        Get all values of an attribute. The dict returned is the column itself and must not be modified.
+
+        :param name: The attribute name.
+        :return: A dict from element key to value.
+        """
+        return self.__values__.get(name, {})
+
+    def fingerprint(self) -> int:
+        """
+        Get the fingerprint of the registers, equal for equal registers (see LwwFingerprint).
+
+        :return: A 64 bits fingerprint.
+        """
+        return self.__fingerprint__
+
+    def names(self) -> List[str]:
+        """
+        Get the attribute names.
+
+        :return: A list of the attribute names that have been written.
+        """
+        return list(self.__values__.keys())
+
+    def fork(self) -> 'LwwAttributeColumns':
+        """
+        Get a copy of the registers, sharing the columns with this one copy-on-write (see LwwCowDict).
+
+        :return: A new LwwAttributeColumns.
+        """
+        forked = LwwAttributeColumns()
+        for columns, forked_columns in ((self.__values__, forked.__values__),
+                                        (self.__timestamps__, forked.__timestamps__)):
+            for name, column in columns.items():
+                if not isinstance(column, LwwCowDict):
+                    column = columns[name] = LwwCowDict(column)
+                forked_columns[name] = column.fork()
+        forked.__fingerprint__ = self.__fingerprint__
+        return forked
+
+    def select(self, keys: Set[any]) -> 'LwwAttributeColumns':
+        """
+        Get a copy of the registers of some elements.
+
+        :param keys: A set of element keys.
+        :return: A new LwwAttributeColumns.
+        """
+        selected = LwwAttributeColumns()
+        for name, timestamps in self.__timestamps__.items():
+            values = self.__values__[name]
+            column = {key: timestamps[key] for key in keys if key in timestamps}
+            if column:
+                selected.__timestamps__[name] = column
+                selected.__values__[name] = {key: values[key] for key in column}
+                for key, timestamp in column.items():
+                    selected.__fingerprint__ += self.__hash_register__(key, name, values[key], timestamp)
+        selected.__fingerprint__ &= LwwFingerprint.MASK
+        return selected
+
+    def merge(self, another: 'LwwAttributeColumns', translate: Callable[[any], any] = None) -> List[Tuple[str, any]]:
+        """
+        Merge the registers of another LwwAttributeColumns.
+
+        :param another: The LwwAttributeColumns to be merged.
+        :param translate: An optional function converting the element keys of another to the keys of this one.
+        :return: A list of (attribute name, element key) of the registers that were updated.
+        """
+        changed = []
+        for name, timestamps in another.__timestamps__.items():
+            values = another.__values__[name]
+            for key, timestamp in timestamps.items():
+                own_key = key if translate is None else translate(key)
+                if self.set(own_key, name, values[key], timestamp):
+                    changed.append((name, own_key))
+        return changed
+
+    @staticmethod
+    def __hash_register__(key: any, name: str, value: any, timestamp: Union[int, float]) -> int:
+        """
+        [internal method] Hash a register write, for the fingerprint.
+        """
+        return LwwFingerprint.hash_mark((key, name, value), timestamp, LwwFingerprint.ATTRIBUTE)
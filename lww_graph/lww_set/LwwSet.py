@@ -1,15 +1,41 @@
-from typing import Dict, List, Union
+from typing import Callable, Dict, List, Tuple, Union
+from lww_graph.LwwFingerprint import LwwFingerprint
 from lww_graph.LwwTimedObj import LwwTimedObj
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+from lww_graph.metrics.LwwInstrumented import LwwInstrumented
+from lww_graph.storage.LwwCowDict import LwwCowDict
 
 
-class LwwSet(object):
+class LwwSet(LwwInstrumented):
     """
     A Last-Writer-Win state based set implementation.
+
+    With a key codec, objects are encoded once when they enter the set, and marks are stored, hashed and compared
+    by their encoded keys. Without a codec, the objects themselves are the keys.
+
+    Every mark written goes through __write_mark__, which keeps the number of elements and 2 fingerprints (see
+    LwwFingerprint) up to date: one of the marks, and one of the elements. A set created with marks computes them
+    on first use instead (see __rehash__).
     """
 
-    def __init__(self, added_mark: Dict[any, int] = None, remove_mark: Dict[any, int] = None):
+    __instrumented__ = ("add", "remove", "exist", "elements", "merge", "merge_all")
+
+    def __init__(self, added_mark: Dict[any, int] = None, remove_mark: Dict[any, int] = None,
+                 codec: LwwKeyCodec = None):
         self.__added__ = added_mark if added_mark is not None else {}
         self.__removed__ = remove_mark if remove_mark is not None else {}
+        self.__codec__ = codec
+        # Sets whose elements depend on the elements of this set, e.g. the edge sets of a vertex set
+        self.__dependents__: List['LwwSet'] = []
+        # Fingerprints and number of elements, None until they are computed
+        self.__marks_fingerprint__: int = None
+        self.__live_fingerprint__: int = None
+        self.__live_count__: int = None
+        # False once a key is hashed by its repr (see LwwFingerprint.is_canonical), as equal keys may then have
+        # different hashes
+        self.__canonical__ = True
+        if not self.__added__ and not self.__removed__:
+            self.__load_fingerprints__((0, 0, 0))
 
     def add(self, obj: LwwTimedObj):
         """
@@ -36,18 +62,15 @@ class LwwSet(object):
         :param obj: The object to exam.
         :return: True if the object is presented in the set, otherwise False.
         """
-        has_added = obj in self.__added__
-
-        return has_added and ((obj not in self.__removed__) or (self.__added__[obj] > self.__removed__[obj]))
+        key = obj if self.__codec__ is None else self.__codec__.find(obj)
+        return key is not None and self.__exist_key__(key)
 
     def elements(self) -> List[any]:
         """
         Get the elements that added to the list.
         :return: A python list, which contains all added object in the set, ascending ordered by last added timestamp.
         """
-        res = [key for key in self.__added__.keys() if self.exist(key)]
-        res = sorted(res, key=lambda ele: (self.__added__[ele], ele))  # order: (timestamp, object)
-        return res
+        return [self.__value__(key) for key in self.__live_keys__()]
 
     def elements_with_time(self) -> List[LwwTimedObj]:
         """
@@ -56,15 +79,44 @@ class LwwSet(object):
         :return A python list, which contains LwwTimedObj object(s),
         each has the object itself and it timestamp information for when it was added to the list.
         """
-        res = [LwwTimedObj(key, self.__added__[key]) for key in self.__added__.keys() if self.exist(key)]
-        return sorted(res, key=lambda ele: (self.__added__[ele], ele))  # order: (timestamp, object)
+        return [LwwTimedObj(self.__value__(key), self.__added__[key]) for key in self.__live_keys__()]
 
     def size(self) -> int:
         """
         Get the number of objects added to the set.
         :return: A int value, representing the number of elements in the set.
         """
-        return len(self.elements())
+        self.__refresh__()
+        return self.__live_count__
+
+    def fingerprint(self) -> int:
+        """
+        Get the fingerprint of the marks of the set. Sets with the same marks have the same fingerprint, so replicas
+        whose fingerprints are equal have converged, but with a probability of about 2 ** -64.
+        Fingerprints of sets can be compared if their codecs are compatible, or if they both have none and their
+        keys are hashed the same in every process (see LwwFingerprint).
+        :return: A 64 bits fingerprint.
+        """
+        if self.__marks_fingerprint__ is None:
+            self.__rehash__()
+        return self.__marks_fingerprint__
+
+    def view_fingerprint(self) -> int:
+        """
+        Get the fingerprint of the elements of the set, regardless of their timestamps. Sets equal by == have
+        the same view fingerprint.
+        :return: A 64 bits fingerprint.
+        """
+        self.__refresh__()
+        return self.__live_fingerprint__
+
+    def codec(self) -> LwwKeyCodec:
+        """
+        Get the key codec of the set.
+
+        :return: The LwwKeyCodec encoding the keys of this set, or None if objects are stored as they are.
+        """
+        return self.__codec__
 
     def merge(self, another: 'LwwSet') -> 'LwwSet':
         """
@@ -72,13 +124,42 @@ class LwwSet(object):
         :param another: A lww_set.LwwSet.LwwSet to be merged.
         :return: The set it self.
         """
-        for obj in another.__added__:
-            self.add(LwwTimedObj(obj, another.__added__[obj]))
-        for obj in another.__removed__:
-            self.remove(LwwTimedObj(obj, another.__removed__[obj]))
+        changed = self.__merge__(another)
+        if self.__metrics__ is not None:
+            self.__metrics__.record_stats(type(self).__name__ + ".merge", {
+                "keys_examined": len(another.__added__) + len(another.__removed__),
+                "marks_updated": len(changed)
+            })
+        return self
 
+    def merge_all(self, sets: List['LwwSet']) -> 'LwwSet':
+        """
+        Merge several sets to current set at once, in a single pass over the marks of each set.
+        :param sets: A list of lww_set.LwwSet.LwwSet to be merged.
+        :return: The set it self.
+        """
+        changed = self.__merge_all__(sets)
+        if self.__metrics__ is not None:
+            self.__metrics__.record_stats(type(self).__name__ + ".merge_all", {
+                "keys_examined": sum(len(another.__added__) + len(another.__removed__) for another in sets),
+                "marks_updated": len(changed)
+            })
         return self
 
+    def fork(self) -> 'LwwSet':
+        """
+        Get a copy of the set, sharing the marks with this set copy-on-write (see LwwCowDict), so that forking
+        costs no copy of the marks, and writes to either set cost only the marks they touch.
+        :return: A new set of the same type, with the same marks and codec.
+        """
+        forked = type(self)(codec=self.__codec__)
+        forked.__added__, forked.__removed__ = self.__fork_marks__()
+        forked.__load_fingerprints__(self.__dump_fingerprints__())
+        forked.__canonical__ = self.__canonical__
+        if self.__metrics__ is not None:
+            forked.set_metrics_sink(self.__metrics__)
+        return forked
+
     def last_removed_timestamp(self, obj: any) -> Union[float, int]:
         """
         Get last timestamp for an obj that marks removed. If this obj is not found in the set then return -inf
@@ -88,7 +169,8 @@ class LwwSet(object):
         """
         if isinstance(obj, LwwTimedObj):
             obj = obj.value
-        return self.__removed__[obj] if obj in self.__removed__ else float('-inf')
+        key = obj if self.__codec__ is None else self.__codec__.find(obj)
+        return self.__removed__[key] if key in self.__removed__ else float('-inf')
 
     def last_added_timestamp(self, obj: any) -> Union[float, int]:
         """
@@ -99,7 +181,8 @@ class LwwSet(object):
         """
         if isinstance(obj, LwwTimedObj):
             obj = obj.value
-        return self.__added__[obj] if obj in self.__added__ else float('-inf')
+        key = obj if self.__codec__ is None else self.__codec__.find(obj)
+        return self.__added__[key] if key in self.__added__ else float('-inf')
 
     @staticmethod
     def merge_set(set_a: 'LwwSet',
@@ -110,19 +193,31 @@ class LwwSet(object):
         :param set_b: Another lww_set.LwwSet.LwwSet to be merged.
         :return: A newly created lww_set.LwwSet.LwwSet that contains elements in set_a and set_b
         """
-        new_set = LwwSet()
-        new_set.merge(set_a)
-        new_set.merge(set_b)
+        return LwwSet.merge_sets([set_a, set_b])
+
+    @staticmethod
+    def merge_sets(sets: List['LwwSet']) -> 'LwwSet':
+        """
+        Static helper method for merging any number of LwwSet and create new one, in a single pass over
+        the marks of each set. It has the codec of the first set.
+        :param sets: A non-empty list of lww_set.LwwSet.LwwSet to be merged.
+        :return: A newly created lww_set.LwwSet.LwwSet that contains elements in all the sets.
+        """
+        assert len(sets) > 0, "At least one set is needed to be merged."
+        new_set = LwwSet(codec=sets[0].__codec__)
+        new_set.__merge_all__(sets)
         return new_set
 
     def __eq__(self, other):
         if not isinstance(other, LwwSet):
             return False
+        if self.__translator__(other) is None:
+            view_fingerprint, other_view_fingerprint = self.view_fingerprint(), other.view_fingerprint()
+            if self.__canonical__ and other.__canonical__ and view_fingerprint != other_view_fingerprint:
+                return False
         if self.size() != other.size():
             return False
-        self_elements = self.elements()
-        other_elements = other.elements()
-        return all([self_elements[idx] == other_elements[idx] for idx in range(len(self_elements))])
+        return self.__ordered_groups__() == other.__ordered_groups__()
 
     def __add__(self, obj: LwwTimedObj):
         """
@@ -131,7 +226,7 @@ class LwwSet(object):
         :param obj: The LwwTimedObj object to be added into the set.
         :return: None
         """
-        self.__mark__(self.__added__, obj.value, obj.create_timestamp)
+        self.__mark__(self.__added__, self.__key__(obj.value), obj.create_timestamp)
 
     def __remove__(self, obj: LwwTimedObj):
         """
@@ -140,22 +235,291 @@ class LwwSet(object):
         :param obj: The LwwTimedObj object to be removed into the set.
         :return: None
         """
-        self.__mark__(self.__removed__, obj.value, obj.create_timestamp)
+        self.__mark__(self.__removed__, self.__key__(obj.value), obj.create_timestamp)
 
-    @staticmethod
-    def __mark__(dict_to_add: dict, obj: any, timestamp: int):
+    def __fork_marks__(self) -> Tuple[LwwCowDict, LwwCowDict]:
+        """
+        [internal method] Fork the marks of this set. The first fork moves the marks into LwwCowDict.
+
+        :return: A tuple of the added and removed marks of the copy.
+        """
+        for marks in (self.__added__, self.__removed__):
+            if not isinstance(marks, (dict, LwwCowDict)):
+                raise ValueError("Only a set with marks in memory can be forked, but it has "
+                                 + type(marks).__name__)
+        if not isinstance(self.__added__, LwwCowDict):
+            self.__added__ = LwwCowDict(self.__added__)
+        if not isinstance(self.__removed__, LwwCowDict):
+            self.__removed__ = LwwCowDict(self.__removed__)
+        return self.__added__.fork(), self.__removed__.fork()
+
+    def __key__(self, obj: any) -> any:
+        """
+        [internal method] Get the key an object is stored with.
+
+        :param obj: The object.
+        :return: The object encoded by the codec of the set, or the object itself if the set has no codec.
+        """
+        return obj if self.__codec__ is None else self.__codec__.encode(obj)
+
+    def __value__(self, key: any) -> any:
+        """
+        [internal method] Get the object a key stands for, it is the inverse of __key__.
+
+        :param key: The key of an object in the set.
+        :return: The object.
+        """
+        return key if self.__codec__ is None else self.__codec__.decode(key)
+
+    def __exist_key__(self, key: any) -> bool:
+        """
+        [internal method] Check if an element is in the set, by its key.
+
+        :param key: The key to exam.
+        :return: True if the element is presented in the set, otherwise False.
+        """
+        added = self.__added__.get(key)
+        if added is None:
+            return False
+        removed = self.__removed__.get(key)
+        return removed is None or added > removed
+
+    def __exist_keys__(self, keys: List[any]) -> List[bool]:
+        """
+        [internal method] Check if elements are in the set by their keys, in bulk.
+
+        :param keys: A list of keys, a key can be None for an object never encoded.
+        :return: A list of bool, True for each key whose element is presented in the set.
+        """
+        added, removed = self.__added__, self.__removed__
+        ret = []
+        for key in keys:
+            added_timestamp = added.get(key) if key is not None else None
+            if added_timestamp is None:
+                ret.append(False)
+                continue
+            removed_timestamp = removed.get(key)
+            ret.append(removed_timestamp is None or added_timestamp > removed_timestamp)
+        return ret
+
+    def __live_keys__(self) -> List[any]:
+        """
+        [internal method] Get the keys of the elements in the set.
+
+        :return: A python list of keys, ascending ordered by last added timestamp, then by key.
+        """
+        res = [key for key in self.__added__.keys() if self.__exist_key__(key)]
+        return sorted(res, key=lambda key: (self.__added__[key], key))  # order: (timestamp, key)
+
+    def __ordered_groups__(self) -> List[set]:
+        """
+        [internal method] Get the elements grouped by last added timestamp, ascending ordered. The order of
+        elements added at the same time depends on their keys, so they are compared as a set.
+
+        :return: A list of python sets of elements.
+        """
+        groups = []
+        last_timestamp = None
+        for key in self.__live_keys__():
+            timestamp = self.__added__[key]
+            if not groups or timestamp != last_timestamp:
+                groups.append(set())
+                last_timestamp = timestamp
+            groups[-1].add(self.__value__(key))
+        return groups
+
+    def __translator__(self, another: 'LwwSet') -> Callable[[any], any]:
+        """
+        [internal method] Get the function converting the keys of another set to the keys of this set.
+
+        :param another: A lww_set.LwwSet.LwwSet.
+        :return: A function mapping a key of another to a key of this set, or None if the keys are the same.
+        """
+        if self.__codec__ is None and another.__codec__ is None:
+            return None
+        if self.__codec__ is not None and another.__codec__ is not None \
+                and self.__codec__.compatible(another.__codec__):
+            return None
+        return lambda key: self.__key__(another.__value__(key))
+
+    def __merge__(self, another: 'LwwSet') -> List[any]:
+        """
+        [internal method] Merge the marks of another set into this set.
+
+        :param another: A lww_set.LwwSet.LwwSet to be merged.
+        :return: A list of keys whose marks were updated, a key appears twice if both of its marks were.
+        """
+        return self.__merge_all__([another])
+
+    def __merge_all__(self, sets: List['LwwSet']) -> List[any]:
+        """
+        [internal method] Merge the marks of several sets into this set. Each mark is max-combined straight into
+        the marks of this set, without wrapping it in a LwwTimedObj or building intermediate sets.
+
+        :param sets: A list of lww_set.LwwSet.LwwSet to be merged.
+        :return: A list of keys whose marks were updated, a key appears twice if both of its marks were.
+        """
+        changed = []
+        new_added = []
+        for another in sets:
+            translate = self.__translator__(another)
+            for marks, another_marks, new_keys in ((self.__added__, another.__added__, new_added),
+                                                   (self.__removed__, another.__removed__, None)):
+                for key, timestamp in another_marks.items():
+                    if translate is not None:
+                        key = translate(key)
+                    current_timestamp = marks.get(key)
+                    if current_timestamp is None:
+                        self.__write_mark__(marks, key, timestamp)
+                        changed.append(key)
+                        if new_keys is not None:
+                            new_keys.append(key)
+                    elif current_timestamp < timestamp:
+                        self.__write_mark__(marks, key, timestamp)
+                        changed.append(key)
+        if new_added:
+            self.__on_added__(new_added)
+        return changed
+
+    def __on_added__(self, keys: List[any]):
+        """
+        [internal method] Called when keys were added to the added marks by a merge, for subclasses keeping
+        an index of the keys.
+
+        :param keys: The new keys.
+        :return: None
+        """
+        pass
+
+    def __mark__(self, dict_to_add: dict, obj: any, timestamp: int) -> bool:
         """
         [internal method] The mark process an object in the set. This is required by add() and remove
         operations.
 
         :param dict_to_add: either self.__added__ dict or self.__removed__ dict
-        :param obj: The object to be added.
+        :param obj: The key of the object to be added.
         :param timestamp: An integer that representing the timestamp that the method is invoked.
+        :return: True if the mark was updated, otherwise False.
+        """
+        current_timestamp = dict_to_add.get(obj)
+        if current_timestamp is not None and current_timestamp >= timestamp:
+            return False
+        self.__write_mark__(dict_to_add, obj, timestamp)
+        return True
+
+    def __write_mark__(self, marks: dict, key: any, timestamp: int):
+        """
+        [internal method] Write a mark, updating the number of elements and the fingerprints of this set, and
+        telling its dependents.
+
+        :param marks: either self.__added__ dict or self.__removed__ dict
+        :param key: The key of the element.
+        :param timestamp: The timestamp of the mark, replacing the current one if any.
+        :return: None
+        """
+        for dependent in self.__dependents__:
+            dependent.__on_dependency_mark__(key)
+        if self.__marks_fingerprint__ is None:
+            marks[key] = timestamp
+            return
+        if self.__canonical__ and self.__codec__ is None:
+            self.__canonical__ = LwwFingerprint.is_canonical(key)
+        live = self.__exist_key__(key)
+        self.__hash_mark__(marks, key, timestamp)
+        if self.__exist_key__(key) != live:
+            self.__update_live__(key, not live)
+
+    def __hash_mark__(self, marks: dict, key: any, timestamp: int):
+        """
+        [internal method] Write a mark, updating the fingerprint of the marks only.
+
+        :param marks: either self.__added__ dict or self.__removed__ dict
+        :param key: The key of the element.
+        :param timestamp: The timestamp of the mark, replacing the current one if any.
+        :return: None
+        """
+        seed = LwwFingerprint.ADDED if marks is self.__added__ else LwwFingerprint.REMOVED
+        current_timestamp = marks.get(key)
+        fingerprint = self.__marks_fingerprint__ + LwwFingerprint.hash_mark(key, timestamp, seed)
+        if current_timestamp is not None:
+            fingerprint -= LwwFingerprint.hash_mark(key, current_timestamp, seed)
+        self.__marks_fingerprint__ = fingerprint & LwwFingerprint.MASK
+        marks[key] = timestamp
+
+    def __on_dependency_mark__(self, key: any):
+        """
+        [internal method] Called on a dependent set before a mark of the set it depends on is written.
+
+        :param key: The key of the element of the set depended on.
+        :return: None
+        """
+        pass
+
+    def __update_live__(self, key: any, live: bool):
+        """
+        [internal method] Update the number of elements and the view fingerprint, after an element entered or
+        left the set.
+
+        :param key: The key of the element.
+        :param live: True if the element entered the set, False if it left it.
         :return: None
         """
-        if obj in dict_to_add:
-            current_timestamp = dict_to_add[obj]
-            if current_timestamp < timestamp:
-                dict_to_add[obj] = timestamp
+        live_hash = LwwFingerprint.hash_element(key, LwwFingerprint.LIVE)
+        if live:
+            self.__live_fingerprint__ = (self.__live_fingerprint__ + live_hash) & LwwFingerprint.MASK
+            self.__live_count__ += 1
         else:
-            dict_to_add[obj] = timestamp
+            self.__live_fingerprint__ = (self.__live_fingerprint__ - live_hash) & LwwFingerprint.MASK
+            self.__live_count__ -= 1
+
+    def __refresh__(self):
+        """
+        [internal method] Bring the number of elements and the view fingerprint up to date, computing them if
+        they are not yet.
+
+        :return: None
+        """
+        if self.__marks_fingerprint__ is None:
+            self.__rehash__()
+
+    def __rehash__(self):
+        """
+        [internal method] Compute the number of elements and the fingerprints from the marks, e.g. on first use
+        of a set created with marks kept in a storage.
+
+        :return: None
+        """
+        fingerprint = 0
+        self.__canonical__ = True
+        for marks, seed in ((self.__added__, LwwFingerprint.ADDED), (self.__removed__, LwwFingerprint.REMOVED)):
+            for key, timestamp in marks.items():
+                fingerprint += LwwFingerprint.hash_mark(key, timestamp, seed)
+                if self.__canonical__ and self.__codec__ is None:
+                    self.__canonical__ = LwwFingerprint.is_canonical(key)
+        self.__load_fingerprints__((fingerprint & LwwFingerprint.MASK, 0, 0))
+        for key in self.__added__:
+            if self.__exist_key__(key):
+                self.__update_live__(key, True)
+
+    def __dump_fingerprints__(self) -> Tuple[int, int, int]:
+        """
+        [internal method] Get the fingerprints and the number of elements, e.g. to be saved.
+
+        :return: A tuple of the fingerprint of the marks, the view fingerprint and the number of elements, or None
+        if they are not computed yet.
+        """
+        if self.__marks_fingerprint__ is None:
+            return None
+        self.__refresh__()
+        return self.__marks_fingerprint__, self.__live_fingerprint__, self.__live_count__
+
+    def __load_fingerprints__(self, fingerprints: Tuple[int, int, int]):
+        """
+        [internal method] Set the fingerprints and the number of elements of the current marks, see
+        __dump_fingerprints__.
+
+        :param fingerprints: A tuple as returned by __dump_fingerprints__, or None.
+        :return: None
+        """
+        self.__marks_fingerprint__, self.__live_fingerprint__, self.__live_count__ = \
+            fingerprints if fingerprints is not None else (None, None, None)
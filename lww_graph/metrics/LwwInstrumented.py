@@ -0,0 +1,64 @@
+import functools
+import time
+from typing import Callable, Tuple
+
+from lww_graph.metrics.LwwMetricsSink import LwwMetricsSink
+
+
+class LwwInstrumented(object):
+    """
+    Mixin for classes whose public operations can be counted and timed by a LwwMetricsSink.
+
+    Instrumentation is installed per instance, by shadowing the methods listed in __instrumented__ with timed
+    wrappers. An instance without a sink runs the plain class methods, so disabled instrumentation costs nothing
+    on the hot path.
+    """
+
+    # Names of the methods to be timed, overridden by subclasses.
+    __instrumented__: Tuple[str, ...] = ()
+
+    # The sink currently attached, None when instrumentation is disabled.
+    __metrics__: LwwMetricsSink = None
+
+    def set_metrics_sink(self, sink: LwwMetricsSink = None):
+        """
+        Attach a metrics sink to this object, or detach the current one by passing None.
+
+        :param sink: A LwwMetricsSink receiving the events, or None to disable instrumentation.
+        :return: None
+        """
+        for method_name in self.__instrumented__:
+            if sink is None:
+                self.__dict__.pop(method_name, None)
+            else:
+                method = getattr(type(self), method_name).__get__(self)
+                operation = type(self).__name__ + "." + method_name
+                setattr(self, method_name, self.__timed__(method, operation, sink))
+        self.__metrics__ = sink
+
+    def metrics_sink(self) -> LwwMetricsSink:
+        """
+        Get the metrics sink attached to this object.
+
+        :return: The LwwMetricsSink attached, or None if instrumentation is disabled.
+        """
+        return self.__metrics__
+
+    @staticmethod
+    def __timed__(method: Callable, operation: str, sink: LwwMetricsSink) -> Callable:
+        """
+        [internal method] Wrap a bound method so that each call is reported to the sink.
+
+        :param method: The bound method to be wrapped.
+        :param operation: The operation name reported to the sink.
+        :param sink: The LwwMetricsSink receiving the events.
+        :return: The wrapped method.
+        """
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                sink.record(operation, time.perf_counter_ns() - start)
+        return timed
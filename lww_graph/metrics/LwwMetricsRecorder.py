@@ -0,0 +1,43 @@
+from typing import Dict
+
+from lww_graph.metrics.LwwMetricsSink import LwwMetricsSink
+
+
+class LwwMetricsRecorder(LwwMetricsSink):
+    """
+    In-memory metrics sink, aggregating call counts, elapsed time and stats counters per operation.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.elapsed_ns: Dict[str, int] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, operation: str, elapsed_ns: int):
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self.elapsed_ns[operation] = self.elapsed_ns.get(operation, 0) + elapsed_ns
+
+    def record_stats(self, operation: str, stats: Dict[str, int]):
+        totals = self.stats.setdefault(operation, {})
+        for name, value in stats.items():
+            totals[name] = totals.get(name, 0) + value
+
+    def mean_ns(self, operation: str) -> float:
+        """
+        Mean time spent in an operation.
+
+        :param operation: Name of the operation.
+        :return: The mean elapsed time in nanoseconds, or 0.0 if the operation was never recorded.
+        """
+        calls = self.calls.get(operation, 0)
+        return self.elapsed_ns[operation] / calls if calls else 0.0
+
+    def reset(self):
+        """
+        Drop everything recorded so far.
+
+        :return: None
+        """
+        self.calls.clear()
+        self.elapsed_ns.clear()
+        self.stats.clear()
@@ -0,0 +1,30 @@
+from typing import Dict
+
+
+class LwwMetricsSink(object):
+    """
+    Interface for receiving instrumentation events from LwwSet and LwwDiGraph.
+
+    Subclass it and override the methods to forward events to a monitoring system.
+    The default implementation drops every event.
+    """
+
+    def record(self, operation: str, elapsed_ns: int):
+        """
+        Called once per instrumented operation.
+
+        :param operation: Name of the operation, in the form of "<class name>.<method name>", e.g. "LwwDiGraph.merge".
+        :param elapsed_ns: Wall clock time spent in the operation, in nanoseconds.
+        :return: None
+        """
+        pass
+
+    def record_stats(self, operation: str, stats: Dict[str, int]):
+        """
+        Called with the work counters of an operation, e.g. keys examined and marks updated by a merge.
+
+        :param operation: Name of the operation, in the form of "<class name>.<method name>".
+        :param stats: A dict from counter name to its value for this single operation.
+        :return: None
+        """
+        pass
@@ -0,0 +1,237 @@
+from typing import Callable, Dict, List, Set
+
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+
+
+class LwwTopologicalOrder(object):
+    """
+    A topological order of the vertices of a LwwDiGraph, kept up to date as its vertices and edges change
+    (Pearce-Kelly dynamic topological sort): an edge agreeing with the order costs a comparison, and an edge
+    that does not reorders only the vertices between its endpoints in the order.
+
+    Any edge of a Last-Writer-Win graph can be added by a replica, so an edge closing a cycle cannot be rejected.
+    It is flagged instead: it is left out of the order, reported to on_cycle, and tried again once edges are removed.
+    The order is attached to a graph by LwwDiGraph.set_topological_order.
+    """
+
+    # Beyond this number of changed vertices and edges at once, the order is rebuilt instead of updated.
+    MAX_INCREMENTAL_CHANGES = 1 << 14
+
+    def __init__(self, on_cycle: Callable[[LwwEdge], None] = None):
+        """
+        :param on_cycle: An optional function called with each LwwEdge found to close a cycle.
+        """
+        self.on_cycle = on_cycle
+        self.__graph__ = None
+        # Position of each vertex key in the order, positions are not contiguous
+        self.__position__: Dict[any, int] = {}
+        self.__next_position__ = 0
+        # Keys of the edges closing a cycle, left out of the order
+        self.__cyclic__: Set[any] = set()
+        # Keys of the edges of an update not inserted yet, left out of the searches as they may not agree with the order
+        self.__pending__: Set[any] = set()
+
+    def order(self) -> List[int]:
+        """
+        Get the vertices of the graph in topological order, leaving out the edges closing a cycle.
+
+        :return: A list of vertex ids, each vertex coming before the targets of its edges.
+        """
+        v_set = self.__graph__.__v_set__
+        position = self.__position__
+        keys = [key for key in position if v_set.__exist_key__(key)]
+        keys.sort(key=position.__getitem__)
+        return [v_set.__value__(key) for key in keys]
+
+    def cyclic_edges(self) -> List[LwwEdge]:
+        """
+        Get the edges left out of the order because they close a cycle.
+
+        :return: A sorted list of LwwEdge, empty if the graph is acyclic.
+        """
+        e_set = self.__graph__.__e_set__
+        return sorted(e_set.__value__(key) for key in self.__cyclic__)
+
+    def is_acyclic(self) -> bool:
+        """
+        Check if the graph is a directed acyclic graph.
+
+        :return: True if no edge closes a cycle, otherwise False.
+        """
+        return not self.__cyclic__
+
+    def __attach__(self, graph: 'LwwDiGraph'):
+        """
+        [internal method] Attach the order to a graph, and build it.
+
+        :param graph: The LwwDiGraph to be ordered.
+        :return: None
+        """
+        self.__graph__ = graph
+        self.__rebuild__()
+
+    def __update__(self, vertex_keys: List[any], edge_keys: List[any]):
+        """
+        [internal method] Update the order after a change of the graph. An edge becoming valid is inserted in the
+        order, and if edges became invalid, the edges flagged as closing a cycle are tried again.
+
+        :param vertex_keys: The keys of the vertices whose marks may have changed, or None with edge_keys
+        if anything may have changed.
+        :param edge_keys: The keys of the edges whose marks may have changed.
+        :return: None
+        """
+        vertex_keys = vertex_keys if vertex_keys is not None else []
+        edge_keys = edge_keys if edge_keys is not None else []
+        if (not vertex_keys and not edge_keys) \
+                or len(vertex_keys) + len(edge_keys) > self.MAX_INCREMENTAL_CHANGES:
+            self.__rebuild__()
+            return
+        e_set = self.__graph__.__e_set__
+        candidates = list(edge_keys)
+        for vertex_key in vertex_keys:
+            self.__place__(vertex_key)
+            candidates += e_set.__out_keys__(vertex_key) + e_set.__in_keys__(vertex_key)
+        removed = False
+        pending = self.__pending__
+        pending.update(edge_key for edge_key in candidates
+                       if edge_key not in self.__cyclic__ and e_set.__exist_key__(edge_key))
+        for edge_key in candidates:
+            if not e_set.__exist_key__(edge_key):
+                removed = True
+                self.__cyclic__.discard(edge_key)
+            elif edge_key in pending:
+                pending.discard(edge_key)
+                if not self.__insert__(edge_key):
+                    self.__cyclic__.add(edge_key)
+                    self.__report__(edge_key)
+        if removed:
+            for edge_key in list(self.__cyclic__):
+                self.__cyclic__.discard(edge_key)
+                if e_set.__exist_key__(edge_key) and not self.__insert__(edge_key):
+                    self.__cyclic__.add(edge_key)
+
+    def __rebuild__(self):
+        """
+        [internal method] Build the order from scratch, by a depth first search over the valid edges: the edges
+        back to a vertex being searched are flagged, and the others are ordered by reverse post-order.
+
+        :return: None
+        """
+        v_set, e_set = self.__graph__.__v_set__, self.__graph__.__e_set__
+        self.__cyclic__ = set()
+        flagged = []
+        state = {}  # 1 while a vertex is being searched, 2 once it is done
+        post_order = []
+        for root in v_set.__live_keys__():
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(self.__out_edges__(root)))]
+            while stack:
+                vertex_key, edges = stack[-1]
+                for edge_key in edges:
+                    target = e_set.__endpoints__(edge_key)[1]
+                    target_state = state.get(target)
+                    if target_state is None:
+                        state[target] = 1
+                        stack.append((target, iter(self.__out_edges__(target))))
+                        break
+                    if target_state == 1:
+                        self.__cyclic__.add(edge_key)
+                        flagged.append(edge_key)
+                else:
+                    stack.pop()
+                    state[vertex_key] = 2
+                    post_order.append(vertex_key)
+        post_order.reverse()
+        self.__position__ = {vertex_key: position for position, vertex_key in enumerate(post_order)}
+        self.__next_position__ = len(post_order)
+        for edge_key in flagged:
+            self.__report__(edge_key)
+
+    def __insert__(self, edge_key: any) -> bool:
+        """
+        [internal method] Reorder the vertices for a valid edge, if it does not agree with the order.
+
+        :param edge_key: The key of the edge.
+        :return: True if the edge is in the order, False if it closes a cycle.
+        """
+        src, target = self.__graph__.__e_set__.__endpoints__(edge_key)
+        position = self.__position__
+        self.__place__(src)
+        self.__place__(target)
+        lower, upper = position[target], position[src]
+        if upper < lower:
+            return True
+        forward = self.__search__(target, lambda vertex_position: vertex_position < upper, True, src)
+        if forward is None:
+            return False
+        backward = self.__search__(src, lambda vertex_position: vertex_position > lower, False, None)
+        forward.sort(key=position.__getitem__)
+        backward.sort(key=position.__getitem__)
+        slots = sorted(position[vertex_key] for vertex_key in forward + backward)
+        for vertex_key, slot in zip(backward + forward, slots):
+            position[vertex_key] = slot
+        return True
+
+    def __search__(self, start: any, in_bound: Callable[[int], bool], forward: bool, stop: any) -> List[any]:
+        """
+        [internal method] Find the vertices reachable from a vertex, following the valid edges forward or backward,
+        through the vertices whose position is in bound.
+
+        :param start: The key of the vertex to search from.
+        :param in_bound: A function checking if a position is in bound.
+        :param forward: True to follow edges from their source to their target, False the other way.
+        :param stop: The key of a vertex whose reach means a cycle, or None.
+        :return: A list of the vertex keys found, including start, or None if stop was reached.
+        """
+        e_set = self.__graph__.__e_set__
+        position = self.__position__
+        found = {start}
+        stack = [start]
+        while stack:
+            vertex_key = stack.pop()
+            for edge_key in self.__out_edges__(vertex_key) if forward else self.__in_edges__(vertex_key):
+                neighbor = e_set.__endpoints__(edge_key)[1 if forward else 0]
+                if neighbor == stop:
+                    return None
+                self.__place__(neighbor)
+                if neighbor not in found and in_bound(position[neighbor]):
+                    found.add(neighbor)
+                    stack.append(neighbor)
+        return list(found)
+
+    def __out_edges__(self, vertex_key: any) -> List[any]:
+        """
+        [internal method] Get the keys of the valid edges going out of a vertex, but those closing a cycle or
+        not inserted yet.
+        """
+        e_set = self.__graph__.__e_set__
+        return [edge_key for edge_key in e_set.__out_keys__(vertex_key)
+                if edge_key not in self.__cyclic__ and edge_key not in self.__pending__
+                and e_set.__exist_key__(edge_key)]
+
+    def __in_edges__(self, vertex_key: any) -> List[any]:
+        """
+        [internal method] Get the keys of the valid edges going in a vertex, but those closing a cycle or
+        not inserted yet.
+        """
+        e_set = self.__graph__.__e_set__
+        return [edge_key for edge_key in e_set.__in_keys__(vertex_key)
+                if edge_key not in self.__cyclic__ and edge_key not in self.__pending__
+                and e_set.__exist_key__(edge_key)]
+
+    def __place__(self, vertex_key: any):
+        """
+        [internal method] Give a position at the end of the order to a vertex not in the order yet.
+        """
+        if vertex_key not in self.__position__:
+            self.__position__[vertex_key] = self.__next_position__
+            self.__next_position__ += 1
+
+    def __report__(self, edge_key: any):
+        """
+        [internal method] Report an edge closing a cycle to on_cycle.
+        """
+        if self.on_cycle is not None:
+            self.on_cycle(self.__graph__.__e_set__.__value__(edge_key))
@@ -0,0 +1,25 @@
+import zlib
+
+from lww_graph.partition.LwwInterest import LwwInterest
+
+
+class LwwHashInterest(LwwInterest):
+    """
+    Interest set of the vertex ids in a hash partition: integer ids are partitioned by their value modulo the number
+    of partitions, and others by the CRC-32 of their repr, as the built-in hash of strings differs between processes.
+    """
+
+    def __init__(self, partition: int, partitions: int):
+        """
+        :param partition: The index of the partition, in range [0, partitions).
+        :param partitions: The number of partitions.
+        """
+        if not 0 <= partition < partitions:
+            raise ValueError("The partition should be in range [0, {}), but it is {}".format(partitions, partition))
+        self.partition = partition
+        self.partitions = partitions
+
+    def contains(self, vertex_id: any) -> bool:
+        if isinstance(vertex_id, int):
+            return vertex_id % self.partitions == self.partition
+        return zlib.crc32(repr(vertex_id).encode("utf-8")) % self.partitions == self.partition
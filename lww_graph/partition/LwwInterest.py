@@ -0,0 +1,32 @@
+from typing import Iterable
+
+
+class LwwInterest(object):
+    """
+    Base class for interest sets, the vertex ids a partial replica of a LwwDiGraph holds (see LwwDiGraph.partition).
+    A partial replica holds the vertices of its interest set and the halo of their edges: every edge with an endpoint
+    in the set, and the marks of both endpoints of those edges, so that their validity is the same as in the graph.
+
+    Subclass it and implement contains for user defined partitions, and vertex_ids if the ids in the set can be
+    enumerated.
+    """
+
+    def contains(self, vertex_id: any) -> bool:
+        """
+        Check if a vertex id is in the interest set.
+
+        :param vertex_id: The vertex id.
+        :return: True if the vertex is held by the partial replica, otherwise False.
+        """
+        raise NotImplementedError()
+
+    def vertex_ids(self, limit: int) -> Iterable[any]:
+        """
+        Enumerate the vertex ids in the interest set, if there are few of them, so that a graph is partitioned
+        by looking up each of them instead of scanning all of its vertices.
+
+        :param limit: The maximum number of vertex ids worth enumerating.
+        :return: An iterable of the vertex ids in the set, or None if they are more than limit or cannot be
+        enumerated.
+        """
+        return None
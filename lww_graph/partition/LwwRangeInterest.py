@@ -0,0 +1,25 @@
+from typing import Iterable
+
+from lww_graph.partition.LwwInterest import LwwInterest
+
+
+class LwwRangeInterest(LwwInterest):
+    """
+    Interest set of the vertex ids in a range [low, high). A range of integer ids can be enumerated.
+    """
+
+    def __init__(self, low: any, high: any):
+        """
+        :param low: The smallest vertex id in the set.
+        :param high: The vertex id after the largest one in the set.
+        """
+        self.low = low
+        self.high = high
+
+    def contains(self, vertex_id: any) -> bool:
+        return self.low <= vertex_id < self.high
+
+    def vertex_ids(self, limit: int) -> Iterable[any]:
+        if isinstance(self.low, int) and isinstance(self.high, int) and self.high - self.low <= limit:
+            return range(self.low, self.high)
+        return None
@@ -0,0 +1,194 @@
+import argparse
+import random
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.simulation.LwwSimulationReport import LwwSimulationReport
+from lww_graph.wire.LwwWireDecoder import LwwWireDecoder
+from lww_graph.wire.LwwWireEncoder import LwwWireEncoder
+
+
+class LwwReplicaSimulator(object):
+    """
+    Simulation of in-process replicas of a LwwDiGraph applying random concurrent operations, and gossiping their
+    states through a network that delays and reorders messages, and drops them while it is partitioned.
+    Once the network heals and every replica has merged the state of every other one, all replicas should have
+    converged to the same view.
+
+    Runs are deterministic for a seed, so a failing run can be replayed.
+    """
+
+    TRANSPORTS = ("fork", "wire")
+
+    def __init__(self, replicas: int = 4, rounds: int = 50, operations_per_round: int = 20, vertices: int = 100,
+                 fanout: int = 1, max_delay: int = 3, clock_skew: int = 5, partition_probability: float = 0.1,
+                 transport: str = "fork", vertex_codec: LwwKeyCodec = None, seed: int = None):
+        """
+        :param replicas: The number of replicas, at least 2.
+        :param rounds: The number of rounds of local operations and gossip.
+        :param operations_per_round: The number of local operations of each replica per round.
+        :param vertices: The number of vertex ids operations pick from.
+        :param fanout: The number of replicas each replica sends its state to per round.
+        :param max_delay: The maximum number of rounds a message is delayed.
+        :param clock_skew: The maximum number of ticks a replica clock is ahead, so that operations of replicas
+        are concurrent and their timestamps out of order.
+        :param partition_probability: The probability per round that the network splits in 2 groups of replicas,
+        it heals with the probability of 1/2 per round.
+        :param transport: "fork" to send states as forks of the graphs, or "wire" to send them encoded by
+        LwwWireEncoder, which requires a stable vertex codec.
+        :param vertex_codec: An optional LwwKeyCodec of the replicas, shared by all of them.
+        :param seed: The seed of the random operations and network.
+        """
+        if replicas < 2:
+            raise ValueError("At least 2 replicas are needed, but there are " + str(replicas))
+        if transport not in self.TRANSPORTS:
+            raise ValueError("The transport should be one of {}, but it is {}".format(self.TRANSPORTS, transport))
+        self.replicas = replicas
+        self.rounds = rounds
+        self.operations_per_round = operations_per_round
+        self.vertices = vertices
+        self.fanout = fanout
+        self.max_delay = max_delay
+        self.clock_skew = clock_skew
+        self.partition_probability = partition_probability
+        self.transport = transport
+        self.vertex_codec = vertex_codec
+        self.seed = seed
+        self.graphs: List[LwwDiGraph] = []
+
+    def run(self) -> LwwSimulationReport:
+        """
+        Run the simulation. The replicas are kept in graphs afterwards.
+
+        :return: A LwwSimulationReport.
+        """
+        rng = random.Random(self.seed)
+        self.graphs = graphs = [LwwDiGraph(vertex_codec=self.vertex_codec) for _ in range(self.replicas)]
+        in_flight: List[Tuple[int, float, int, any]] = []
+        merge_ns = []
+        operations = operations_ns = sent = dropped = 0
+        clock = 0
+        groups = None
+
+        for current_round in range(self.rounds):
+            if groups is None and rng.random() < self.partition_probability:
+                groups = [rng.randrange(2) for _ in graphs]
+            elif groups is not None and rng.random() < 0.5:
+                groups = None
+
+            start = time.perf_counter_ns()
+            for graph in graphs:
+                for _ in range(self.operations_per_round):
+                    clock += 1
+                    self.__apply_random_operation__(rng, graph, clock + rng.randint(0, self.clock_skew))
+            operations_ns += time.perf_counter_ns() - start
+            operations += len(graphs) * self.operations_per_round
+
+            for src, graph in enumerate(graphs):
+                for _ in range(self.fanout):
+                    target = rng.randrange(len(graphs) - 1)
+                    target += target >= src
+                    sent += 1
+                    if groups is not None and groups[src] != groups[target]:
+                        dropped += 1
+                        continue
+                    in_flight.append((current_round + rng.randint(0, self.max_delay), rng.random(), target,
+                                      self.__send__(graph)))
+
+            due = sorted((message for message in in_flight if message[0] <= current_round),
+                         key=lambda message: message[:2])
+            in_flight = [message for message in in_flight if message[0] > current_round]
+            for _, _, target, message in due:
+                merge_ns.append(self.__receive__(graphs[target], message))
+
+        # the network heals: the messages still in flight arrive in any order, then every replica merges the state
+        # of every other one
+        rng.shuffle(in_flight)
+        for _, _, target, message in in_flight:
+            merge_ns.append(self.__receive__(graphs[target], message))
+        states = [self.__send__(graph) for graph in graphs]
+        sent += len(graphs) * (len(graphs) - 1)
+        for target, graph in enumerate(graphs):
+            for src, state in enumerate(states):
+                if src != target:
+                    merge_ns.append(self.__receive__(graph, state))
+
+        converged = all(graph == graphs[0] for graph in graphs[1:])
+        return LwwSimulationReport(converged, operations, operations_ns, merge_ns, sent, dropped,
+                                   [self.__memory_of__(graph) for graph in graphs])
+
+    def __apply_random_operation__(self, rng: random.Random, graph: LwwDiGraph, timestamp: int):
+        """
+        [internal method] Apply a random local operation to a replica.
+        """
+        src, target = rng.sample(range(self.vertices), 2)
+        action = rng.random()
+        if action < 0.3:
+            graph.add_vertex(LwwTimedVertex(src, timestamp=timestamp))
+        elif action < 0.4:
+            graph.remove_vertex(LwwTimedVertex(src, timestamp=timestamp))
+        elif action < 0.8:
+            graph.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+        elif action < 0.9:
+            graph.remove_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+        else:
+            graph.set_edge_attribute(LwwTimedEdge((src, target), timestamp=timestamp), "weight", rng.randrange(100))
+
+    def __send__(self, graph: LwwDiGraph) -> any:
+        """
+        [internal method] Get the message carrying the current state of a replica.
+        """
+        if self.transport == "wire":
+            return LwwWireEncoder(graph, vertex_codec=self.vertex_codec).encode()
+        return graph.fork()
+
+    def __receive__(self, graph: LwwDiGraph, message: any) -> int:
+        """
+        [internal method] Merge a message into a replica.
+
+        :return: The time spent merging, in nanoseconds.
+        """
+        start = time.perf_counter_ns()
+        if self.transport == "wire":
+            LwwWireDecoder(message, vertex_codec=self.vertex_codec).merge_into(graph)
+        else:
+            graph.merge(message)
+        return time.perf_counter_ns() - start
+
+    @staticmethod
+    def __memory_of__(graph: LwwDiGraph) -> int:
+        """
+        [internal method] Measure the memory a replica needs, as the memory allocated by a copy of it
+        (forks share their pages, so the replicas themselves cannot be told apart).
+        """
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        copy = LwwDiGraph.merge_graphs([graph])
+        size = tracemalloc.get_traced_memory()[0] - before
+        if not tracing:
+            tracemalloc.stop()
+        del copy
+        return size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate replicas of a LwwDiGraph and check they converge.")
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--operations-per-round", type=int, default=20)
+    parser.add_argument("--vertices", type=int, default=100)
+    parser.add_argument("--transport", choices=LwwReplicaSimulator.TRANSPORTS, default="fork")
+    parser.add_argument("--seed", type=int, default=None)
+    arguments = parser.parse_args()
+    report = LwwReplicaSimulator(replicas=arguments.replicas, rounds=arguments.rounds,
+                                 operations_per_round=arguments.operations_per_round, vertices=arguments.vertices,
+                                 transport=arguments.transport, seed=arguments.seed).run()
+    print(report)
+    raise SystemExit(0 if report.converged else 1)
@@ -0,0 +1,54 @@
+from typing import Dict, List
+
+
+class LwwSimulationReport(object):
+    """
+    Outcome of a LwwReplicaSimulator run: whether the replicas converged, and how fast they got there.
+    """
+
+    def __init__(self, converged: bool, operations: int, operations_ns: int, merge_ns: List[int],
+                 messages_sent: int, messages_dropped: int, memory_bytes: List[int]):
+        """
+        :param converged: True if all replicas ended with equal views.
+        :param operations: The number of local operations applied by all replicas.
+        :param operations_ns: The time spent applying them, in nanoseconds.
+        :param merge_ns: The time spent in each merge, in nanoseconds.
+        :param messages_sent: The number of states sent between replicas.
+        :param messages_dropped: The number of states lost to partitions.
+        :param memory_bytes: The memory allocated by each replica once converged, in bytes.
+        """
+        self.converged = converged
+        self.operations = operations
+        self.operations_ns = operations_ns
+        self.merge_ns = sorted(merge_ns)
+        self.messages_sent = messages_sent
+        self.messages_dropped = messages_dropped
+        self.memory_bytes = memory_bytes
+
+    def ops_per_second(self) -> float:
+        """
+        Throughput of the local operations.
+
+        :return: The number of operations per second, or 0.0 if no time was spent.
+        """
+        return self.operations * 1e9 / self.operations_ns if self.operations_ns else 0.0
+
+    def merge_percentiles(self, percentiles: List[int] = (50, 90, 99, 100)) -> Dict[int, int]:
+        """
+        Percentiles of the merge latency (nearest rank).
+
+        :param percentiles: The percentiles to compute, in range [0, 100].
+        :return: A dict from percentile to latency in nanoseconds, empty if no merge happened.
+        """
+        if not self.merge_ns:
+            return {}
+        return {p: self.merge_ns[min(len(self.merge_ns) - 1, max(0, -(-p * len(self.merge_ns) // 100) - 1))]
+                for p in percentiles}
+
+    def __str__(self):
+        latency = ", ".join("p{}={:.1f}us".format(p, ns / 1e3) for p, ns in self.merge_percentiles().items())
+        return "converged={} operations={} ops/sec={:.0f} merges={} ({}) messages={} dropped={} " \
+               "memory/replica={:.0f}KiB".format(self.converged, self.operations, self.ops_per_second(),
+                                                 len(self.merge_ns), latency, self.messages_sent,
+                                                 self.messages_dropped,
+                                                 sum(self.memory_bytes) / max(1, len(self.memory_bytes)) / 1024)
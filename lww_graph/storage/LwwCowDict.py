@@ -0,0 +1,123 @@
+import itertools
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Mapping, Tuple
+
+
+class LwwCowDict(MutableMapping):
+    """
+    A dict split into pages by key hash, which can be forked with copy-on-write sharing of the pages.
+
+    Forking copies the page table only. Both copies then share every page, and a page is copied by a copy the first
+    time it writes to it, so the cost of a fork is the number of pages plus the size of the pages actually written.
+    Values are shared as they are, so they should not be modified in place.
+    """
+
+    # Target number of entries per page.
+    PAGE_SIZE = 1024
+
+    def __init__(self, items: Mapping = None):
+        """
+        :param items: An optional mapping whose items are copied in the dict.
+        """
+        count = self.__page_count__(len(items) if items is not None else 0)
+        self.__mask__ = count - 1
+        self.__pages__: List[Dict] = [{} for _ in range(count)]
+        # A page can be written in place only if its owner is the token of this dict
+        self.__token__ = object()
+        self.__owners__: List[object] = [self.__token__] * count
+        self.__size__ = 0
+        if items is not None:
+            for key, value in items.items():
+                self.__pages__[hash(key) & self.__mask__][key] = value
+            self.__size__ = len(items)
+
+    def fork(self) -> 'LwwCowDict':
+        """
+        Get a copy of the dict, sharing all pages with it until either of them writes.
+
+        :return: A new LwwCowDict.
+        """
+        if self.__size__ > 4 * self.PAGE_SIZE * len(self.__pages__):
+            self.__repage__()
+        copy = LwwCowDict.__new__(LwwCowDict)
+        copy.__mask__ = self.__mask__
+        copy.__pages__ = list(self.__pages__)
+        copy.__owners__ = list(self.__owners__)
+        copy.__token__ = object()
+        copy.__size__ = self.__size__
+        # pages written from now on by this dict are copied first, as they are shared with the copy
+        self.__token__ = object()
+        return copy
+
+    def __getitem__(self, key: any) -> any:
+        return self.__pages__[hash(key) & self.__mask__][key]
+
+    def get(self, key: any, default: any = None) -> any:
+        return self.__pages__[hash(key) & self.__mask__].get(key, default)
+
+    def __contains__(self, key: any) -> bool:
+        return key in self.__pages__[hash(key) & self.__mask__]
+
+    def __setitem__(self, key: any, value: any):
+        page = self.__own_page__(hash(key) & self.__mask__)
+        if key not in page:
+            self.__size__ += 1
+        page[key] = value
+
+    def __delitem__(self, key: any):
+        index = hash(key) & self.__mask__
+        if key not in self.__pages__[index]:
+            raise KeyError(key)
+        del self.__own_page__(index)[key]
+        self.__size__ -= 1
+
+    def __len__(self) -> int:
+        return self.__size__
+
+    def __iter__(self) -> Iterator[any]:
+        return itertools.chain.from_iterable(self.__pages__)
+
+    def items(self) -> Iterator[Tuple[any, any]]:
+        """
+        Iterate over the (key, value) pairs, page by page.
+
+        :return: An iterator of (key, value) tuples.
+        """
+        return itertools.chain.from_iterable(page.items() for page in self.__pages__)
+
+    def __own_page__(self, index: int) -> Dict:
+        """
+        [internal method] Get a page to be written, copying it first if it is shared.
+
+        :param index: The index of the page.
+        :return: The page, owned by this dict.
+        """
+        if self.__owners__[index] is not self.__token__:
+            self.__pages__[index] = dict(self.__pages__[index])
+            self.__owners__[index] = self.__token__
+        return self.__pages__[index]
+
+    def __repage__(self):
+        """
+        [internal method] Split the entries into more pages, once the pages have grown too large.
+        All pages are copied, so that this dict owns them all.
+
+        :return: None
+        """
+        count = self.__page_count__(self.__size__)
+        pages = [{} for _ in range(count)]
+        for key, value in self.items():
+            pages[hash(key) & (count - 1)][key] = value
+        self.__mask__ = count - 1
+        self.__pages__ = pages
+        self.__owners__ = [self.__token__] * count
+
+    @classmethod
+    def __page_count__(cls, size: int) -> int:
+        """
+        [internal method] Get the number of pages for a number of entries, a power of 2.
+        """
+        count = 16
+        while count * cls.PAGE_SIZE < size:
+            count <<= 1
+        return count
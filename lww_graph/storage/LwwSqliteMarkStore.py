@@ -0,0 +1,210 @@
+import sqlite3
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Tuple, Union
+
+
+class LwwSqliteMarkStore(MutableMapping):
+    """
+    A dict-like mapping from encoded keys (non-negative integers of a fixed width) to mark timestamps,
+    kept in a sqlite table, so that a LwwSet can hold more marks than fit in memory.
+
+    Reads go through a bounded LRU cache, and writes are buffered and written back in batches.
+    Keys are stored as fixed width big-endian blobs, so their order in the table is the integer order,
+    which allows range scans (e.g. all edges going out of a vertex, see LwwEdgeKeyCodec).
+
+    With split_width, a key is seen as 2 halves of split_width bits, and the store keeps a second index on
+    the key with swapped halves, which allows range scans on the low half (e.g. all edges going in a vertex).
+    """
+
+    # Number of rows fetched per query when iterating the table.
+    PAGE_SIZE = 4096
+
+    def __init__(self, connection: sqlite3.Connection, table: str, key_width: int, split_width: int = None,
+                 cache_size: int = 100000, batch_size: int = 10000):
+        self.__connection__ = connection
+        self.__table__ = '"' + table.replace('"', '""') + '"'
+        self.__key_bytes__ = (key_width + 7) // 8
+        self.__split_width__ = split_width
+        self.__cache_size__ = cache_size
+        self.__batch_size__ = batch_size
+        self.__cache__: OrderedDict = OrderedDict()
+        self.__dirty__: Dict[int, Union[int, float]] = {}
+
+        columns = "key BLOB PRIMARY KEY, timestamp NUMERIC NOT NULL"
+        if split_width is not None:
+            columns += ", rkey BLOB NOT NULL"
+        connection.execute("CREATE TABLE IF NOT EXISTS {} ({}) WITHOUT ROWID".format(self.__table__, columns))
+        if split_width is not None:
+            connection.execute('CREATE INDEX IF NOT EXISTS "{}_rkey" ON {} (rkey)'
+                               .format(table.replace('"', '""'), self.__table__))
+        self.__count__ = connection.execute("SELECT COUNT(*) FROM " + self.__table__).fetchone()[0]
+
+    def __getitem__(self, key: int) -> Union[int, float]:
+        timestamp = self.__lookup__(key)
+        if timestamp is None:
+            raise KeyError(key)
+        return timestamp
+
+    def __contains__(self, key: int) -> bool:
+        return self.__lookup__(key) is not None
+
+    def get(self, key: int, default: any = None) -> any:
+        timestamp = self.__lookup__(key)
+        return default if timestamp is None else timestamp
+
+    def __setitem__(self, key: int, timestamp: Union[int, float]):
+        if self.__lookup__(key) is None:
+            self.__count__ += 1
+        self.__cache__.pop(key, None)
+        self.__dirty__[key] = timestamp
+        if len(self.__dirty__) >= self.__batch_size__:
+            self.flush()
+
+    def __delitem__(self, key: int):
+        if self.__lookup__(key) is None:
+            raise KeyError(key)
+        self.flush()
+        self.__connection__.execute("DELETE FROM {} WHERE key = ?".format(self.__table__), (self.__to_bytes__(key),))
+        self.__cache__.pop(key, None)
+        self.__count__ -= 1
+
+    def __len__(self) -> int:
+        return self.__count__
+
+    def __iter__(self) -> Iterator[int]:
+        for key, _ in self.items():
+            yield key
+
+    def items(self) -> Iterator[Tuple[int, Union[int, float]]]:
+        """
+        Iterate over the (key, timestamp) pairs, ascending ordered by key.
+        Rows are fetched page by page, so memory use does not grow with the size of the table.
+
+        :return: An iterator of (key, timestamp) tuples.
+        """
+        last = None
+        while True:
+            self.flush()
+            if last is None:
+                rows = self.__connection__.execute(
+                    "SELECT key, timestamp FROM {} ORDER BY key LIMIT ?".format(self.__table__),
+                    (self.PAGE_SIZE,)).fetchall()
+            else:
+                rows = self.__connection__.execute(
+                    "SELECT key, timestamp FROM {} WHERE key > ? ORDER BY key LIMIT ?".format(self.__table__),
+                    (last, self.PAGE_SIZE)).fetchall()
+            for key, timestamp in rows:
+                yield int.from_bytes(key, "big"), timestamp
+            if len(rows) < self.PAGE_SIZE:
+                return
+            last = rows[-1][0]
+
+    def range_keys(self, low: int, high: int) -> List[int]:
+        """
+        Get the keys in a range.
+
+        :param low: The lower bound of the range, inclusive.
+        :param high: The upper bound of the range, exclusive.
+        :return: A list of keys, ascending ordered.
+        """
+        return self.__range__("key", low, high)
+
+    def reverse_range_keys(self, low: int, high: int) -> List[int]:
+        """
+        Get the keys whose halves swapped are in a range. Only available if the store has a split_width.
+
+        :param low: The lower bound of the range on swapped keys, inclusive.
+        :param high: The upper bound of the range on swapped keys, exclusive.
+        :return: A list of (not swapped) keys, ascending ordered by swapped key.
+        """
+        assert self.__split_width__ is not None, "Reverse range scan requires a store created with split_width."
+        return self.__range__("rkey", low, high)
+
+    def flush(self):
+        """
+        Write the buffered marks to the table. Note that it does not commit the transaction,
+        see LwwSqliteStorage.flush.
+
+        :return: None
+        """
+        if not self.__dirty__:
+            return
+        if self.__split_width__ is None:
+            rows = [(self.__to_bytes__(key), ts) for key, ts in self.__dirty__.items()]
+            self.__connection__.executemany(
+                "INSERT OR REPLACE INTO {} (key, timestamp) VALUES (?, ?)".format(self.__table__), rows)
+        else:
+            rows = [(self.__to_bytes__(key), ts, self.__to_bytes__(self.__swap__(key)))
+                    for key, ts in self.__dirty__.items()]
+            self.__connection__.executemany(
+                "INSERT OR REPLACE INTO {} (key, timestamp, rkey) VALUES (?, ?, ?)".format(self.__table__), rows)
+        for key, timestamp in self.__dirty__.items():
+            self.__cache_put__(key, timestamp)
+        self.__dirty__.clear()
+
+    def __lookup__(self, key: int) -> Union[int, float]:
+        """
+        [internal method] Look up the timestamp of a key, in the write buffer, the cache and then the table.
+
+        :param key: The key to look up.
+        :return: The timestamp, or None if the key is not in the store.
+        """
+        timestamp = self.__dirty__.get(key)
+        if timestamp is not None:
+            return timestamp
+        if key in self.__cache__:
+            self.__cache__.move_to_end(key)
+            return self.__cache__[key]
+        row = self.__connection__.execute("SELECT timestamp FROM {} WHERE key = ?".format(self.__table__),
+                                          (self.__to_bytes__(key),)).fetchone()
+        timestamp = row[0] if row is not None else None
+        self.__cache_put__(key, timestamp)
+        return timestamp
+
+    def __cache_put__(self, key: int, timestamp: Union[int, float]):
+        """
+        [internal method] Put a clean entry in the LRU cache, evicting the least recently used ones if it is full.
+
+        :param key: The key.
+        :param timestamp: The timestamp of the key, or None to remember that the key is not in the store.
+        :return: None
+        """
+        self.__cache__[key] = timestamp
+        self.__cache__.move_to_end(key)
+        while len(self.__cache__) > self.__cache_size__:
+            self.__cache__.popitem(last=False)
+
+    def __range__(self, column: str, low: int, high: int) -> List[int]:
+        """
+        [internal method] Range scan on an indexed column, either key or rkey.
+
+        :param column: The column to scan.
+        :param low: The lower bound of the range, inclusive.
+        :param high: The upper bound of the range, exclusive.
+        :return: A list of keys, ascending ordered by the column.
+        """
+        self.flush()
+        low = max(low, 0)
+        if high >= 1 << (8 * self.__key_bytes__):
+            rows = self.__connection__.execute(
+                "SELECT key FROM {} WHERE {} >= ? ORDER BY {}".format(self.__table__, column, column),
+                (self.__to_bytes__(low),)).fetchall()
+        else:
+            rows = self.__connection__.execute(
+                "SELECT key FROM {} WHERE {} >= ? AND {} < ? ORDER BY {}".format(self.__table__, column, column,
+                                                                                column),
+                (self.__to_bytes__(low), self.__to_bytes__(high))).fetchall()
+        return [int.from_bytes(row[0], "big") for row in rows]
+
+    def __swap__(self, key: int) -> int:
+        """
+        [internal method] Swap the 2 halves of a key.
+        """
+        return ((key & ((1 << self.__split_width__) - 1)) << self.__split_width__) | (key >> self.__split_width__)
+
+    def __to_bytes__(self, key: int) -> bytes:
+        """
+        [internal method] Fixed width big-endian representation of a key, ordered as the integers are.
+        """
+        return key.to_bytes(self.__key_bytes__, "big")
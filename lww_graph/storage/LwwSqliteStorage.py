@@ -0,0 +1,106 @@
+import json
+import sqlite3
+from typing import Callable, Dict, List
+
+from lww_graph.storage.LwwSqliteMarkStore import LwwSqliteMarkStore
+
+
+class LwwSqliteStorage(object):
+    """
+    A sqlite database holding the marks of one or more LwwSets, one table per mark store.
+
+    Marks written to the stores are buffered, flush writes them to the database and commits.
+    It can be used as a context manager, which flushes and closes the database on exit.
+
+    The database also keeps named metadata (e.g. the fingerprints of the sets), written by flush hooks so that
+    they are committed along with the marks.
+    """
+
+    def __init__(self, path: str = ":memory:", cache_size: int = 100000, batch_size: int = 10000):
+        """
+        :param path: The path of the database file, or ":memory:" for a temporary in-memory database.
+        :param cache_size: The maximum number of marks cached in memory, per store.
+        :param batch_size: The number of buffered marks that triggers a write-back, per store.
+        """
+        self.__connection__ = sqlite3.connect(path)
+        self.__connection__.execute("PRAGMA journal_mode = WAL")
+        self.__connection__.execute("PRAGMA synchronous = NORMAL")
+        self.__cache_size__ = cache_size
+        self.__batch_size__ = batch_size
+        self.__stores__: Dict[str, LwwSqliteMarkStore] = {}
+        self.__flush_hooks__: List[Callable[[], None]] = []
+        self.__connection__.execute("CREATE TABLE IF NOT EXISTS lww_meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def mark_store(self, name: str, key_width: int, split_width: int = None) -> LwwSqliteMarkStore:
+        """
+        Get the mark store of a name, creating its table if it does not exist yet.
+
+        :param name: The name of the store, which is the name of its table.
+        :param key_width: The number of bits of the keys in the store.
+        :param split_width: The number of bits of the low half of a key, if reverse range scans are needed.
+        :return: A LwwSqliteMarkStore.
+        """
+        if name not in self.__stores__:
+            self.__stores__[name] = LwwSqliteMarkStore(self.__connection__, name, key_width, split_width,
+                                                       self.__cache_size__, self.__batch_size__)
+        return self.__stores__[name]
+
+    def read_meta(self, name: str) -> any:
+        """
+        Read a metadata value.
+
+        :param name: The name of the value.
+        :return: The value, or None if it was never written.
+        """
+        row = self.__connection__.execute("SELECT value FROM lww_meta WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def write_meta(self, name: str, value: any):
+        """
+        Write a metadata value, committed by the next flush.
+
+        :param name: The name of the value.
+        :param value: A value that can be encoded to JSON, or None to delete it.
+        :return: None
+        """
+        if value is None:
+            self.__connection__.execute("DELETE FROM lww_meta WHERE name = ?", (name,))
+        else:
+            self.__connection__.execute("INSERT OR REPLACE INTO lww_meta (name, value) VALUES (?, ?)",
+                                        (name, json.dumps(value)))
+
+    def add_flush_hook(self, hook: Callable[[], None]):
+        """
+        Add a function called by each flush before the marks are written, e.g. to write metadata.
+
+        :param hook: A function without arguments.
+        :return: None
+        """
+        self.__flush_hooks__.append(hook)
+
+    def flush(self):
+        """
+        Call the flush hooks, write all buffered marks to the database and commit.
+
+        :return: None
+        """
+        for hook in self.__flush_hooks__:
+            hook()
+        for store in self.__stores__.values():
+            store.flush()
+        self.__connection__.commit()
+
+    def close(self):
+        """
+        Flush and close the database.
+
+        :return: None
+        """
+        self.flush()
+        self.__connection__.close()
+
+    def __enter__(self) -> 'LwwSqliteStorage':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
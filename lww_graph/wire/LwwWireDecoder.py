@@ -0,0 +1,165 @@
+import json
+import zlib
+from typing import Callable, List, Tuple, Union
+
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.wire.LwwWireEncoder import LwwWireEncoder
+
+
+class LwwWireDecoder(object):
+    """
+    Decoder of the encoding of LwwWireEncoder. It reads the buffer in place through a memoryview, and marks are
+    merged straight into the marks of a graph, without building intermediate objects.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview], vertex_codec: LwwKeyCodec = None):
+        """
+        :param buffer: The encoded bytes.
+        :param vertex_codec: The codec of the vertex ids on the wire, the one the encoder used.
+        LwwIntKeyCodec by default.
+        """
+        self.__view__ = memoryview(buffer)
+        self.__codec__ = vertex_codec if vertex_codec is not None else LwwIntKeyCodec()
+
+    def decode(self) -> LwwDiGraph:
+        """
+        Decode into a new LwwDiGraph, whose vertex codec is the codec on the wire.
+
+        :return: The decoded graph.
+        """
+        return self.merge_into(LwwDiGraph(vertex_codec=self.__codec__))
+
+    def merge_into(self, graph: LwwDiGraph) -> LwwDiGraph:
+        """
+        Merge the encoded marks and attributes into a graph, as LwwDiGraph.merge would with the encoded graph.
+        The marks are merged in place, but for a partial replica, which merges the decoded graph filtered to its
+        interest set.
+
+        :param graph: The LwwDiGraph to merge into.
+        :return: The graph.
+        """
+        if graph.interest() is not None:
+            return graph.merge(self.decode())
+        view = self.__view__
+        magic = LwwWireEncoder.MAGIC
+        if bytes(view[:len(magic)]) != magic:
+            raise ValueError("The buffer is not an encoded LwwDiGraph.")
+        changed_vertices, changed_edges = [], []
+        try:
+            flags, pos = self.__varint__(view, len(magic))
+            pos = self.__merge_marks__(graph, view, pos, changed_vertices, changed_edges)
+            if flags & 1:
+                length, pos = self.__varint__(view, pos)
+                if pos + length > len(view):
+                    raise IndexError()
+                self.__merge_payload__(graph, zlib.decompress(view[pos:pos + length]))
+        except IndexError:
+            raise ValueError("The buffer is truncated.")
+        finally:
+            # marks are merged in place, the changes are applied to the graph even if the buffer is truncated
+            if changed_vertices or changed_edges:
+                graph.__touch__(vertex_keys=changed_vertices, edge_keys=changed_edges)
+        return graph
+
+    def __merge_marks__(self, graph: LwwDiGraph, view: memoryview, pos: int,
+                        changed_vertices: List[any], changed_edges: List[any]) -> int:
+        """
+        [internal method] Merge the 4 sections of marks into a graph.
+
+        :param changed_vertices: The list the keys of the vertices whose marks were updated are appended to.
+        :param changed_edges: The list the keys of the edges whose marks were updated are appended to.
+        :return: The position after the marks.
+        """
+        read = self.__varint__
+        v_set, e_set = graph.__v_set__, graph.__e_set__
+        to_vertex_key = self.__to_vertex_key__(graph)
+        to_edge_key = self.__to_edge_key__(graph)
+
+        for marks in (v_set.__added__, v_set.__removed__):
+            count, pos = read(view, pos)
+            key = timestamp = 0
+            for _ in range(count):
+                delta, pos = read(view, pos)
+                timestamp_delta, pos = read(view, pos)
+                key += delta
+                timestamp += self.__unzigzag__(timestamp_delta)
+                vertex_key = to_vertex_key(key)
+                if v_set.__mark__(marks, vertex_key, timestamp):
+                    changed_vertices.append(vertex_key)
+
+        for marks in (e_set.__added__, e_set.__removed__):
+            count, pos = read(view, pos)
+            src = target = timestamp = 0
+            for _ in range(count):
+                src_delta, pos = read(view, pos)
+                target_value, pos = read(view, pos)
+                timestamp_delta, pos = read(view, pos)
+                src += src_delta
+                target = target + target_value if src_delta == 0 else target_value
+                timestamp += self.__unzigzag__(timestamp_delta)
+                edge_key = to_edge_key(src, target)
+                if e_set.__mark__(marks, edge_key, timestamp):
+                    changed_edges.append(edge_key)
+        return pos
+
+    def __merge_payload__(self, graph: LwwDiGraph, payload: bytes):
+        """
+        [internal method] Merge the attributes of the payload into a graph.
+        """
+        attributes = json.loads(payload.decode("utf-8"))
+        to_vertex_key = self.__to_vertex_key__(graph)
+        to_edge_key = self.__to_edge_key__(graph)
+        for name, rows in attributes.get("v", {}).items():
+            for vertex, timestamp, value in rows:
+                graph.__v_attrs__.set(to_vertex_key(vertex), name, value, timestamp)
+        for name, rows in attributes.get("e", {}).items():
+            for src, target, timestamp, value in rows:
+                graph.__e_attrs__.set(to_edge_key(src, target), name, value, timestamp)
+
+    def __to_vertex_key__(self, graph: LwwDiGraph) -> Callable[[int], any]:
+        """
+        [internal method] Get the function converting a vertex id on the wire to a vertex key of the graph.
+        """
+        v_set = graph.__v_set__
+        graph_codec = v_set.codec()
+        if graph_codec is not None and graph_codec.compatible(self.__codec__):
+            return lambda key: key
+        return lambda key: v_set.__key__(self.__codec__.decode(key))
+
+    def __to_edge_key__(self, graph: LwwDiGraph) -> Callable[[int, int], any]:
+        """
+        [internal method] Get the function converting the vertex ids of an edge on the wire to an edge key of
+        the graph.
+        """
+        e_set = graph.__e_set__
+        graph_codec = graph.__v_set__.codec()
+        if graph_codec is not None and graph_codec.compatible(self.__codec__):
+            return e_set.codec().pack
+        decode = self.__codec__.decode
+        return lambda src, target: e_set.__key__(LwwEdge(decode(src), decode(target)))
+
+    @staticmethod
+    def __varint__(view: memoryview, pos: int) -> Tuple[int, int]:
+        """
+        [internal method] Read an unsigned LEB128 varint.
+
+        :return: A tuple of the value and the position after it.
+        """
+        result = shift = 0
+        while True:
+            byte = view[pos]
+            pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+
+    @staticmethod
+    def __unzigzag__(value: int) -> int:
+        """
+        [internal method] The inverse of LwwWireEncoder zigzag mapping.
+        """
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
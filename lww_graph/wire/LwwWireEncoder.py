@@ -0,0 +1,175 @@
+import json
+import zlib
+from typing import Callable, Iterator, List, Tuple
+
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.codec.LwwKeyCodec import LwwKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.partition.LwwInterest import LwwInterest
+
+
+class LwwWireEncoder(object):
+    """
+    Compact binary encoding of the state of a LwwDiGraph, or of the marks written after a timestamp (a delta).
+
+    The format is, all integers being unsigned LEB128 varints:
+
+    - MAGIC, then flags (bit 0: a payload follows the marks)
+    - 4 sections of marks, vertex added, vertex removed, edge added, edge removed. Each one is its number of marks,
+      then the marks sorted by key:
+        - a vertex mark is the delta of its vertex id from the previous one, then the zigzag delta of its timestamp
+          from the previous one
+        - an edge mark is the delta of its source vertex id from the previous one, then its target vertex id, as a
+          delta from the previous one if the source is the same, otherwise as is, then the zigzag delta of its
+          timestamp from the previous one
+    - the payload if any: its length, then the attributes as zlib compressed JSON
+
+    Vertex ids are written encoded by a stable LwwKeyCodec, the one of the graph by default, or LwwIntKeyCodec if the
+    graph has none. The decoder has to use the same codec. Timestamps have to be integers, and attribute values
+    have to be JSON serializable.
+    """
+
+    MAGIC = b"LWG\x01"
+
+    # Size of the chunks yielded by chunks().
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, graph: LwwDiGraph, since: int = None, vertex_codec: LwwKeyCodec = None,
+                 compress_level: int = 6, interest: LwwInterest = None):
+        """
+        :param graph: The LwwDiGraph to be encoded.
+        :param since: If given, only the marks and attributes written after this timestamp are encoded.
+        :param vertex_codec: The codec of the vertex ids on the wire.
+        :param compress_level: The zlib compression level of the payload.
+        :param interest: If given, only the marks and attributes of the partial replica of the graph for this
+        interest set are encoded (see LwwDiGraph.partition).
+        """
+        if interest is not None:
+            graph = graph.partition(interest)
+        self.__graph__ = graph
+        self.__since__ = since
+        graph_codec = graph.__v_set__.codec()
+        self.__codec__ = vertex_codec if vertex_codec is not None else \
+            graph_codec if graph_codec is not None else LwwIntKeyCodec()
+        if not self.__codec__.stable:
+            raise ValueError("Vertex ids can only be sent with a stable codec, but it is "
+                             + type(self.__codec__).__name__)
+        self.__compress_level__ = compress_level
+
+    def encode(self) -> bytes:
+        """
+        Encode the graph.
+
+        :return: The encoded bytes.
+        """
+        return b"".join(self.chunks())
+
+    def chunks(self) -> Iterator[bytes]:
+        """
+        Encode the graph in chunks of about CHUNK_SIZE bytes, e.g. to be written to a socket as they come.
+
+        :return: An iterator of bytes, whose concatenation is the encoded graph.
+        """
+        graph = self.__graph__
+        payload = self.__payload__()
+        out = bytearray(self.MAGIC)
+        self.__varint__(out, 1 if payload is not None else 0)
+
+        to_wire = self.__to_wire__()
+        for marks in (graph.__v_set__.__added__, graph.__v_set__.__removed__):
+            rows = sorted((to_wire(key), timestamp) for key, timestamp in self.__marks__(marks))
+            self.__varint__(out, len(rows))
+            last_key = last_timestamp = 0
+            for key, timestamp in rows:
+                self.__varint__(out, key - last_key)
+                self.__varint__(out, self.__zigzag__(timestamp - last_timestamp))
+                last_key, last_timestamp = key, timestamp
+                if len(out) >= self.CHUNK_SIZE:
+                    yield bytes(out)
+                    out.clear()
+
+        endpoints = graph.__e_set__.__endpoints__
+        for marks in (graph.__e_set__.__added__, graph.__e_set__.__removed__):
+            rows = []
+            for key, timestamp in self.__marks__(marks):
+                src, target = endpoints(key)
+                rows.append((to_wire(src), to_wire(target), timestamp))
+            rows.sort()
+            self.__varint__(out, len(rows))
+            last_src = last_target = last_timestamp = 0
+            for src, target, timestamp in rows:
+                self.__varint__(out, src - last_src)
+                self.__varint__(out, target - last_target if src == last_src else target)
+                self.__varint__(out, self.__zigzag__(timestamp - last_timestamp))
+                last_src, last_target, last_timestamp = src, target, timestamp
+                if len(out) >= self.CHUNK_SIZE:
+                    yield bytes(out)
+                    out.clear()
+
+        if payload is not None:
+            self.__varint__(out, len(payload))
+            out += payload
+        if out:
+            yield bytes(out)
+
+    def __marks__(self, marks) -> Iterator[Tuple[any, int]]:
+        """
+        [internal method] Iterate over the marks to be encoded, checking their timestamps.
+        """
+        for key, timestamp in marks.items():
+            if self.__since__ is not None and timestamp <= self.__since__:
+                continue
+            if not isinstance(timestamp, int):
+                raise ValueError("Only integer timestamps can be encoded, but it has " + repr(timestamp))
+            yield key, timestamp
+
+    def __to_wire__(self) -> Callable[[any], int]:
+        """
+        [internal method] Get the function converting a vertex key of the graph to a vertex id on the wire.
+        """
+        v_set = self.__graph__.__v_set__
+        graph_codec = v_set.codec()
+        if graph_codec is not None and graph_codec.compatible(self.__codec__):
+            return lambda key: key
+        return lambda key: self.__codec__.encode(v_set.__value__(key))
+
+    def __payload__(self) -> bytes:
+        """
+        [internal method] Get the compressed attributes, or None if there is no attribute to be sent.
+        The JSON is {"v": {name: [[vertex, timestamp, value], ...]}, "e": {name: [[src, target, timestamp, value]]}}.
+        """
+        graph = self.__graph__
+        to_wire = self.__to_wire__()
+        endpoints = graph.__e_set__.__endpoints__
+        attributes = {"v": {}, "e": {}}
+        for section, columns, to_row in (
+                ("v", graph.__v_attrs__, lambda key: [to_wire(key)]),
+                ("e", graph.__e_attrs__, lambda key: [to_wire(vertex) for vertex in endpoints(key)])):
+            for name in columns.names():
+                rows: List[list] = []
+                for key, value in columns.column(name).items():
+                    timestamp = columns.timestamp(key, name)
+                    if self.__since__ is None or timestamp > self.__since__:
+                        rows.append(to_row(key) + [timestamp, value])
+                if rows:
+                    attributes[section][name] = rows
+        if not attributes["v"] and not attributes["e"]:
+            return None
+        return zlib.compress(json.dumps(attributes, separators=(",", ":")).encode("utf-8"), self.__compress_level__)
+
+    @staticmethod
+    def __varint__(out: bytearray, value: int):
+        """
+        [internal method] Append an unsigned LEB128 varint.
+        """
+        while value > 0x7f:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    @staticmethod
+    def __zigzag__(value: int) -> int:
+        """
+        [internal method] Map a signed integer to an unsigned one, small magnitudes to small values.
+        """
+        return (value << 1) if value >= 0 else ((-value << 1) - 1)
@@ -0,0 +1,115 @@
+import unittest
+
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+
+
+class LwwAttributeTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.graph_1 = None
+        self.graph_2 = None
+        self.graph_A = None
+        self.graph_B = None
+
+    def test_last_write_wins(self):
+        self.given_a_weighted_di_graph()
+        self.when_set_weight_of_edge_1_to_2_at_time(weight=10, timestamp=5)
+        self.when_set_weight_of_edge_1_to_2_at_time(weight=20, timestamp=4)
+        self.then_weight_of_edge_1_to_2_is(10)
+
+    def test_attribute_is_hidden_with_its_vertex(self):
+        self.given_a_weighted_di_graph()
+        self.when_set_name_of_vertex_1("one")
+        self.when_remove_vertex_1_at_time(timestamp=5)
+        self.then_name_of_vertex_1_is(None)
+        self.then_weight_of_edge_1_to_2_is(None)
+
+    def test_merge_converges_for_concurrent_writes(self):
+        self.given_2_same_weighted_graph()
+        self.when_both_graph_set_weight_of_edge_1_to_2_at_same_time()
+        self.when_merge_2_graph_in_different_order()
+        self.then_merged_graph_are_same_with_weight_of_edge_1_to_2(7)
+
+    def test_shortest_path_by_weight(self):
+        self.given_a_weighted_di_graph()
+        self.then_shortest_path_from_1_to_4_is(4, [1, 3, 2, 4])
+
+    def test_shortest_path_skips_removed_edges(self):
+        self.given_a_weighted_di_graph()
+        self.when_remove_edge_3_to_2_at_time(timestamp=5)
+        self.then_shortest_path_from_1_to_4_is(6, [1, 2, 4])
+
+    def test_shortest_path_when_target_not_reachable(self):
+        self.given_a_weighted_di_graph()
+        self.then_shortest_path_from_4_to_1_is_not_found()
+
+    def given_a_weighted_di_graph(self):
+        """
+        1 -(5)-* 2 -(1)-* 4
+        |        *
+        (1)     (2)
+        |        |
+        * ------ 3
+        """
+        self.graph = self.__weighted_graph__()
+
+    def given_2_same_weighted_graph(self):
+        self.graph_1 = self.__weighted_graph__()
+        self.graph_2 = self.__weighted_graph__()
+
+    def when_set_weight_of_edge_1_to_2_at_time(self, weight, timestamp):
+        self.graph.set_edge_attribute(LwwTimedEdge((1, 2), timestamp), "weight", weight)
+
+    def when_set_name_of_vertex_1(self, name):
+        self.graph.set_vertex_attribute(LwwTimedVertex(1, timestamp=4), "name", name)
+
+    def when_remove_vertex_1_at_time(self, timestamp):
+        self.graph.remove_vertex(LwwTimedVertex(1, timestamp=timestamp))
+
+    def when_remove_edge_3_to_2_at_time(self, timestamp):
+        self.graph.remove_edge(LwwTimedEdge((3, 2), timestamp=timestamp))
+
+    def when_both_graph_set_weight_of_edge_1_to_2_at_same_time(self):
+        self.graph_1.set_edge_attribute(LwwTimedEdge((1, 2), timestamp=5), "weight", 7)
+        self.graph_2.set_edge_attribute(LwwTimedEdge((1, 2), timestamp=5), "weight", 6)
+
+    def when_merge_2_graph_in_different_order(self):
+        self.graph_A = self.__weighted_graph__().merge(self.graph_1).merge(self.graph_2)
+        self.graph_B = self.__weighted_graph__().merge(self.graph_2).merge(self.graph_1)
+
+    def then_weight_of_edge_1_to_2_is(self, weight):
+        self.assertEqual(self.graph.edge_attribute(LwwEdge(1, 2), "weight"), weight)
+
+    def then_name_of_vertex_1_is(self, name):
+        self.assertEqual(self.graph.vertex_attribute(1, "name"), name)
+
+    def then_merged_graph_are_same_with_weight_of_edge_1_to_2(self, weight):
+        self.assertEqual(self.graph_A, self.graph_B)
+        self.assertEqual(self.graph_A.edge_attribute(LwwEdge(1, 2), "weight"), weight)
+
+    def then_shortest_path_from_1_to_4_is(self, distance, path):
+        self.assertEqual(self.graph.shortest_path(1, 4), (distance, path))
+
+    def then_shortest_path_from_4_to_1_is_not_found(self):
+        self.assertEqual(self.graph.shortest_path(4, 1), (float('inf'), []))
+
+    @staticmethod
+    def __weighted_graph__():
+        graph = LwwDiGraph()
+        for vertex_id in range(1, 5):
+            graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target, weight in [(1, 2, 5), (1, 3, 1), (3, 2, 2), (2, 4, 1)]:
+            graph.add_edge(LwwTimedEdge((src, target), timestamp=2))
+            graph.set_edge_attribute(LwwTimedEdge((src, target), timestamp=2), "weight", weight)
+        return graph
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class LwwBatchQueryTest(unittest.TestCase):
+
+    CANDIDATES = [(1, 2), (2, 1), (4, 5), (5, 6), (3, 7), (7, 3), (4, 4), (6, 5)]
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.result = None
+
+    def test_batch_queries_agree_with_single_queries(self):
+        for codec in (None, LwwIntKeyCodec()):
+            self.given_a_di_graph_with_removed_vertex_5(codec)
+            self.then_edge_exist_many_agrees_with_edge_exist()
+            self.then_vertex_exist_many_agrees_with_vertex_exist()
+            self.then_neighbors_many_agrees_with_connected_vertices()
+
+    def test_degrees_count_valid_edges_only(self):
+        self.given_a_di_graph_with_removed_vertex_5(LwwIntKeyCodec())
+        self.when_query_out_degrees()
+        self.then_result_is([2, 1, 1, 2, 0, 0, 0])
+        self.when_query_in_degrees()
+        self.then_result_is([0, 3, 1, 1, 0, 1, 0])
+
+    def test_neighbors_many_by_direction(self):
+        self.given_a_di_graph_with_removed_vertex_5(LwwIntKeyCodec())
+        self.when_query_neighbors_of_2_and_4(direction="out")
+        self.then_result_is([[4], [2, 6]])
+        self.when_query_neighbors_of_2_and_4(direction="in")
+        self.then_result_is([[1, 3, 4], [2]])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_numpy_arrays_in_and_out(self):
+        self.given_a_di_graph_with_removed_vertex_5(LwwIntKeyCodec())
+        self.when_query_edges_with_numpy_array()
+        self.then_result_is_numpy_array_of([True, False, False, False, False, False, False, False])
+
+    def given_a_di_graph_with_removed_vertex_5(self, codec):
+        self.graph = LwwDiGraph(vertex_codec=codec)
+        for vertex_id in range(1, 7):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in [(1, 2), (1, 3), (3, 2), (2, 4), (4, 2), (4, 5), (5, 6), (4, 6)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=3))
+        self.graph.remove_vertex(LwwTimedVertex(5, timestamp=4))
+
+    def when_query_out_degrees(self):
+        self.result = self.graph.out_degrees(range(1, 8))
+
+    def when_query_in_degrees(self):
+        self.result = self.graph.in_degrees(range(1, 8))
+
+    def when_query_neighbors_of_2_and_4(self, direction):
+        self.result = [sorted(neighbors) for neighbors in self.graph.neighbors_many([2, 4], direction)]
+
+    def when_query_edges_with_numpy_array(self):
+        self.result = self.graph.edge_exist_many(numpy.array(self.CANDIDATES))
+
+    def then_edge_exist_many_agrees_with_edge_exist(self):
+        self.assertListEqual(self.graph.edge_exist_many(self.CANDIDATES),
+                             [src != target and self.graph.edge_exist(LwwEdge(src, target))
+                              for src, target in self.CANDIDATES])
+
+    def then_vertex_exist_many_agrees_with_vertex_exist(self):
+        self.assertListEqual(self.graph.vertex_exist_many(range(8)),
+                             [self.graph.vertex_exist(vertex_id) for vertex_id in range(8)])
+
+    def then_neighbors_many_agrees_with_connected_vertices(self):
+        self.assertListEqual([sorted(neighbors) for neighbors in self.graph.neighbors_many(range(8))],
+                             [sorted(self.graph.connected_vertices(vertex_id)) for vertex_id in range(8)])
+
+    def then_result_is(self, expected):
+        self.assertListEqual(self.result, expected)
+
+    def then_result_is_numpy_array_of(self, expected):
+        self.assertIsInstance(self.result, numpy.ndarray)
+        self.assertListEqual(self.result.tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from lww_graph.loader.LwwBulkLoader import LwwBulkLoader
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+
+
+class LwwBulkLoaderTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "edges.tsv")
+        self.progress = []
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        self.graph = None
+        self.expected = None
+
+    def test_load_in_process(self):
+        self.given_an_edge_list_with_timestamps_and_duplicates()
+        self.when_load_with(processes=1, chunk_size=64)
+        self.then_graph_is_as_built_by_hand()
+
+    def test_load_in_process_pool(self):
+        self.given_an_edge_list_with_timestamps_and_duplicates()
+        self.when_load_with(processes=2, chunk_size=64)
+        self.then_graph_is_as_built_by_hand()
+
+    def test_progress_is_reported_up_to_file_size(self):
+        self.given_an_edge_list_with_timestamps_and_duplicates()
+        self.when_load_with(processes=1, chunk_size=64)
+        self.then_progress_is_reported_up_to_file_size()
+
+    def test_later_vertex_removal_is_kept(self):
+        self.given_an_edge_list_with_timestamps_and_duplicates()
+        self.given_a_graph_removing_vertex_3_at_time(timestamp=1000)
+        self.when_load_with(processes=1, chunk_size=64)
+        self.then_vertex_3_and_its_edges_are_not_in_graph()
+
+    def given_an_edge_list_with_timestamps_and_duplicates(self):
+        lines = ["src\ttarget\ttime", "# a comment", ""]
+        self.expected = LwwDiGraph()
+        for i in range(200):
+            src, target, timestamp = i % 17, (i * 5 + 1) % 17, 10 + i
+            lines.append("{}\t{}\t{}".format(src, target, timestamp))
+            if src != target:
+                self.expected.add_vertex(LwwTimedVertex(src, timestamp=0))
+                self.expected.add_vertex(LwwTimedVertex(target, timestamp=0))
+                self.expected.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+        with open(self.path, "w") as file:
+            file.write("\n".join(lines) + "\n")
+        self.graph = LwwDiGraph()
+
+    def given_a_graph_removing_vertex_3_at_time(self, timestamp):
+        self.graph.remove_vertex(LwwTimedVertex(3, timestamp=timestamp))
+
+    def when_load_with(self, processes, chunk_size):
+        LwwBulkLoader(delimiter="\t", timestamp_column=2, skip_header=True, processes=processes,
+                      chunk_size=chunk_size, progress=lambda loaded, total: self.progress.append((loaded, total))) \
+            .load(self.path, self.graph)
+
+    def then_graph_is_as_built_by_hand(self):
+        self.assertEqual(self.graph.vertex_count(), self.expected.vertex_count())
+        self.assertEqual(self.graph.edge_count(), self.expected.edge_count())
+        self.assertListEqual(sorted(self.graph.connected_vertices(4)), sorted(self.expected.connected_vertices(4)))
+        self.assertEqual(self.graph.__e_set__.last_added_timestamp(LwwEdge(1, 6)), 10 + 188)
+
+    def then_progress_is_reported_up_to_file_size(self):
+        self.assertGreater(len(self.progress), 1)
+        self.assertEqual(self.progress[-1], (os.path.getsize(self.path), os.path.getsize(self.path)))
+
+    def then_vertex_3_and_its_edges_are_not_in_graph(self):
+        self.assertFalse(self.graph.vertex_exist(3))
+        self.assertListEqual(self.graph.connected_vertices(3), [])
+        self.assertEqual(self.graph.vertex_count(), self.expected.vertex_count() - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
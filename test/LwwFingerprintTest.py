@@ -0,0 +1,230 @@
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from lww_graph.LwwTimedObj import LwwTimedObj
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.codec.LwwInternedStrKeyCodec import LwwInternedStrKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.lww_set.LwwSet import LwwSet
+from lww_graph.storage.LwwSqliteStorage import LwwSqliteStorage
+
+
+class EqualByValue(object):
+    """
+    A key equal to the keys of the same value, with the default repr.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, EqualByValue) and self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class LwwFingerprintTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.graph = None
+        self.another = None
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.another = None
+
+    def test_fingerprints_are_kept_up_to_date(self):
+        for codec in (None, LwwIntKeyCodec()):
+            self.given_random_replicas_merged_and_forked(codec, seed=40)
+            self.then_fingerprints_and_sizes_are_as_recomputed()
+
+    def test_same_view_of_different_marks(self):
+        self.given_a_graph_whose_vertex_2_was_removed()
+        self.given_a_graph_with_vertex_1_only()
+        self.then_graphs_are_equal_but_not_converged()
+
+    def test_different_views_have_different_fingerprints(self):
+        self.given_a_graph_whose_vertex_2_was_removed()
+        self.given_a_graph_with_vertex_1_only()
+        self.when_another_adds_vertex(3)
+        self.assertNotEqual(self.graph.view_fingerprint(), self.another.view_fingerprint())
+        self.assertNotEqual(self.graph, self.another)
+
+    def test_equality_does_not_depend_on_codecs(self):
+        for codec, another_codec, elements in ((None, None, [1, 2]),
+                                               (LwwIntKeyCodec(), LwwIntKeyCodec(), [1, 2]),
+                                               (LwwInternedStrKeyCodec(), LwwInternedStrKeyCodec(), ["a", "b"])):
+            lww_set = self.given_a_set_added_at(codec, elements, [1, 2])
+            another = self.given_a_set_added_at(another_codec, elements, [3, 4])
+            self.assertEqual(lww_set, another)
+            reordered = self.given_a_set_added_at(another_codec, elements, [4, 3])
+            self.assertNotEqual(lww_set, reordered)
+
+    def test_equality_of_keys_hashed_by_repr(self):
+        for elements, another_elements in (([frozenset({1, 9})], [frozenset({9, 1})]),
+                                           ([EqualByValue(1), 2], [EqualByValue(1), 2])):
+            self.assertNotEqual(repr(elements[0]), repr(another_elements[0]))
+            lww_set = self.given_a_set_added_at(None, elements, [1, 2])
+            another = self.given_a_set_added_at(None, another_elements, [1, 2])
+            self.assertEqual(lww_set, another)
+            self.assertEqual(lww_set.fork(), another)
+
+    def test_convergence_of_graphs_with_incompatible_codecs(self):
+        for codec, another_codec in ((LwwInternedStrKeyCodec(), LwwInternedStrKeyCodec()), (None, LwwIntKeyCodec())):
+            vertex_id = "a" if codec is not None else 1
+            self.graph = LwwDiGraph(vertex_codec=codec).add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+            self.another = LwwDiGraph(vertex_codec=another_codec).add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+            self.assertEqual(self.graph, self.another)
+            with self.assertRaises(ValueError):
+                self.graph.converged_with(self.another)
+
+    def test_fingerprints_tell_apart_keys_the_built_in_hash_does_not(self):
+        for vertex_id, another_vertex_id in ((-1, -2), (3, 3 + 2 ** 61 - 1), (2 ** 64, 0)):
+            self.assertFalse(self.given_a_graph_with_vertex(vertex_id, 1)
+                             .converged_with(self.given_a_graph_with_vertex(another_vertex_id, 1)))
+        self.assertFalse(self.given_a_graph_with_vertex(1, -1).converged_with(self.given_a_graph_with_vertex(1, -2)))
+
+    def test_fingerprints_are_the_same_in_every_process(self):
+        script = "from test.LwwFingerprintTest import LwwFingerprintTest as T\n" \
+                 "print(T.given_a_graph_of_str().fingerprint())"
+        fingerprints = set()
+        for hash_seed in ("1", "2"):
+            environment = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            fingerprints.add(subprocess.check_output([sys.executable, "-c", script], env=environment).strip())
+        self.assertSetEqual(fingerprints, {str(self.given_a_graph_of_str().fingerprint()).encode()})
+
+    def test_vertex_writes_do_not_check_edges(self):
+        with LwwSqliteStorage() as storage:
+            self.graph = LwwDiGraph(storage=storage)
+            self.given_a_hub_vertex(0, 200)
+            for timestamp in range(3, 100):
+                self.graph.add_vertex(LwwTimedVertex(0, timestamp=timestamp))
+            self.then_marks_are_not_written_back(storage)
+            self.assertEqual(self.graph.edge_count(), 0)
+            self.then_fingerprints_and_sizes_are_as_recomputed()
+
+    def test_replicas_converge_with_attributes(self):
+        self.given_a_graph_whose_vertex_2_was_removed()
+        self.given_a_graph_with_vertex_1_only()
+        self.when_another_sets_vertex_1_attribute()
+        self.assertFalse(self.graph.converged_with(self.another))
+        self.when_merge_both_ways()
+        self.assertTrue(self.graph.converged_with(self.another))
+        self.assertTrue(self.graph.fork().converged_with(self.graph))
+
+    def test_fingerprint_of_graph_in_storage_is_restored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "graph.db")
+            with LwwSqliteStorage(path) as storage:
+                self.graph = LwwDiGraph(storage=storage)
+                self.given_random_operations(self.graph, random.Random(40), 200)
+                fingerprint, view_fingerprint = self.graph.fingerprint(), self.graph.view_fingerprint()
+                storage.flush()
+            with LwwSqliteStorage(path) as storage:
+                self.graph = LwwDiGraph(storage=storage)
+                self.then_fingerprints_are_loaded()
+                self.assertEqual(self.graph.fingerprint(), fingerprint)
+                self.assertEqual(self.graph.view_fingerprint(), view_fingerprint)
+
+    def given_random_replicas_merged_and_forked(self, codec, seed):
+        rng = random.Random(seed)
+        graphs = [LwwDiGraph(vertex_codec=codec) for _ in range(3)]
+        for _ in range(20):
+            self.given_random_operations(rng.choice(graphs), rng, 10)
+            graph, another = rng.sample(graphs, 2)
+            graph.merge(another)
+            graphs[0] = graphs[0].fork()
+        self.graph, self.another = graphs[0], graphs[1]
+
+    @staticmethod
+    def given_random_operations(graph, rng, count):
+        for _ in range(count):
+            src, target = rng.sample(range(12), 2)
+            timestamp = rng.randrange(1000)
+            action = rng.random()
+            if action < 0.25:
+                graph.add_vertex(LwwTimedVertex(src, timestamp=timestamp))
+            elif action < 0.35:
+                graph.remove_vertex(LwwTimedVertex(src, timestamp=timestamp))
+            elif action < 0.8:
+                graph.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+            else:
+                graph.remove_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+
+    @staticmethod
+    def given_a_set_added_at(codec, elements, timestamps):
+        lww_set = LwwSet(codec=codec)
+        for element, timestamp in zip(elements, timestamps):
+            lww_set.add(LwwTimedObj(element, timestamp))
+        return lww_set
+
+    @staticmethod
+    def given_a_graph_with_vertex(vertex_id, timestamp):
+        return LwwDiGraph().add_vertex(LwwTimedVertex(vertex_id, timestamp=timestamp))
+
+    @staticmethod
+    def given_a_graph_of_str():
+        return LwwDiGraph() \
+            .add_vertex(LwwTimedVertex("a", timestamp=1)) \
+            .add_vertex(LwwTimedVertex("b", timestamp=1)) \
+            .add_edge(LwwTimedEdge(("a", "b"), timestamp=2)) \
+            .set_vertex_attribute(LwwTimedVertex("a", timestamp=3), "label", "first")
+
+    def given_a_hub_vertex(self, vertex_id, degree):
+        self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for neighbor in range(vertex_id + 1, vertex_id + 1 + degree):
+            self.graph.add_vertex(LwwTimedVertex(neighbor, timestamp=1))
+            self.graph.add_edge(LwwTimedEdge((vertex_id, neighbor), timestamp=2))
+
+    def given_a_graph_whose_vertex_2_was_removed(self):
+        self.graph = LwwDiGraph()
+        self.graph.add_vertex(LwwTimedVertex(1, timestamp=1))
+        self.graph.add_vertex(LwwTimedVertex(2, timestamp=1))
+        self.graph.add_edge(LwwTimedEdge((1, 2), timestamp=3))
+        self.graph.remove_vertex(LwwTimedVertex(2, timestamp=5))
+
+    def given_a_graph_with_vertex_1_only(self):
+        self.another = LwwDiGraph()
+        self.another.add_vertex(LwwTimedVertex(1, timestamp=1))
+
+    def when_another_adds_vertex(self, vertex_id):
+        self.another.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+
+    def when_another_sets_vertex_1_attribute(self):
+        self.another.set_vertex_attribute(LwwTimedVertex(1, timestamp=2), "color", "red")
+
+    def when_merge_both_ways(self):
+        self.graph.merge(self.another)
+        self.another.merge(self.graph)
+
+    def then_fingerprints_and_sizes_are_as_recomputed(self):
+        graphs = [graph for graph in (self.graph, self.another) if graph is not None]
+        for lww_set in [lww_set for graph in graphs for lww_set in (graph.__v_set__, graph.__e_set__)]:
+            fingerprints = (lww_set.fingerprint(), lww_set.view_fingerprint(), lww_set.size())
+            lww_set.__rehash__()
+            self.assertEqual(fingerprints, (lww_set.fingerprint(), lww_set.view_fingerprint(), lww_set.size()))
+            self.assertEqual(lww_set.size(), len(lww_set.elements()))
+
+    def then_marks_are_not_written_back(self, storage):
+        for name in ("vertex_added", "edge_added"):
+            self.assertGreater(len(storage.mark_store(name, 0).__dirty__), 0)
+
+    def then_fingerprints_are_loaded(self):
+        for lww_set in (self.graph.__v_set__, self.graph.__e_set__):
+            self.assertIsNotNone(lww_set.__dump_fingerprints__())
+
+    def then_graphs_are_equal_but_not_converged(self):
+        self.assertEqual(self.graph.view_fingerprint(), self.another.view_fingerprint())
+        self.assertEqual(self.graph, self.another)
+        self.assertFalse(self.graph.converged_with(self.another))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.storage.LwwCowDict import LwwCowDict
+
+
+class LwwForkTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.dict = None
+        self.dict_fork = None
+        self.graph = None
+        self.graph_fork = None
+
+    def test_cow_dict_fork_is_isolated(self):
+        self.given_a_cow_dict_with_entries(5000)
+        self.when_fork_the_dict_and_write_both()
+        self.then_dicts_have_own_writes()
+
+    def test_fork_has_same_view(self):
+        self.given_a_connected_di_graph()
+        self.when_fork_the_graph()
+        self.then_graph_and_fork_are_same()
+
+    def test_fork_is_isolated_from_original(self):
+        self.given_a_connected_di_graph()
+        self.when_fork_the_graph()
+        self.when_fork_removes_vertex_4_and_original_adds_edge_6_to_1()
+        self.then_fork_has_no_path_from_1_to_6()
+        self.then_original_has_edge_6_to_1_and_fork_has_not()
+
+    def test_fork_of_fork_merges_back(self):
+        self.given_a_connected_di_graph()
+        self.when_fork_the_graph()
+        self.when_fork_removes_vertex_4_and_original_adds_edge_6_to_1()
+        self.when_merge_a_fork_of_the_fork_into_original()
+        self.then_original_has_no_path_from_1_to_6()
+
+    def given_a_cow_dict_with_entries(self, num):
+        self.dict = LwwCowDict({i: i for i in range(num)})
+
+    def given_a_connected_di_graph(self):
+        self.graph = LwwDiGraph()
+        for vertex_id in range(1, 7):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in [(1, 2), (1, 3), (3, 2), (2, 4), (4, 2), (4, 5), (5, 6), (4, 6)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=3))
+            self.graph.set_edge_attribute(LwwTimedEdge((src, target), timestamp=3), "weight", 1)
+
+    def when_fork_the_dict_and_write_both(self):
+        self.dict_fork = self.dict.fork()
+        self.dict[0] = -1
+        self.dict_fork[1] = -1
+        self.dict_fork[5000] = 5000
+
+    def when_fork_the_graph(self):
+        self.graph_fork = self.graph.fork()
+
+    def when_fork_removes_vertex_4_and_original_adds_edge_6_to_1(self):
+        self.graph_fork.remove_vertex(LwwTimedVertex(4, timestamp=4))
+        self.graph.add_edge(LwwTimedEdge((6, 1), timestamp=4))
+
+    def when_merge_a_fork_of_the_fork_into_original(self):
+        self.graph.merge(self.graph_fork.fork())
+
+    def then_dicts_have_own_writes(self):
+        self.assertEqual((self.dict[0], self.dict[1], len(self.dict)), (-1, 1, 5000))
+        self.assertEqual((self.dict_fork[0], self.dict_fork[1], len(self.dict_fork)), (0, -1, 5001))
+        self.assertNotIn(5000, self.dict)
+        self.assertEqual(sorted(self.dict_fork), list(range(5001)))
+
+    def then_graph_and_fork_are_same(self):
+        self.assertEqual(self.graph, self.graph_fork)
+        self.assertEqual(self.graph_fork.edge_attribute(LwwEdge(1, 2), "weight"), 1)
+
+    def then_fork_has_no_path_from_1_to_6(self):
+        self.assertListEqual(self.graph_fork.list_all_path(1, 6), [])
+        self.assertEqual(len(self.graph.list_all_path(1, 6)), 4)
+
+    def then_original_has_edge_6_to_1_and_fork_has_not(self):
+        self.assertTrue(self.graph.edge_exist(LwwEdge(6, 1)))
+        self.assertFalse(self.graph_fork.edge_exist(LwwEdge(6, 1)))
+        self.assertListEqual(sorted(self.graph.connected_vertices(1)), [2, 3, 6])
+        self.assertListEqual(sorted(self.graph_fork.connected_vertices(1)), [2, 3])
+
+    def then_original_has_no_path_from_1_to_6(self):
+        self.assertListEqual(self.graph.list_all_path(1, 6), [])
+        self.assertTrue(self.graph.edge_exist(LwwEdge(6, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
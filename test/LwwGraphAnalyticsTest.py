@@ -0,0 +1,76 @@
+import unittest
+
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class LwwGraphAnalyticsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.result = None
+
+    def test_degrees(self):
+        self.given_a_cycle_and_a_removed_edge()
+        self.then_per_vertex_is(self.graph.analytics().out_degrees(), {1: 1, 2: 1, 3: 1, 4: 1, 5: 0, 6: 0})
+        self.then_per_vertex_is(self.graph.analytics().in_degrees(), {1: 1, 2: 1, 3: 1, 4: 0, 5: 1, 6: 0})
+        self.assertListEqual(self.graph.analytics().degree_distribution("out").tolist(), [2, 4])
+        self.assertListEqual(self.graph.analytics().degree_distribution("both").tolist(), [1, 2, 3])
+
+    def test_pagerank(self):
+        self.given_a_cycle_and_a_removed_edge()
+        self.when_compute_pagerank()
+        self.assertAlmostEqual(float(self.result.sum()), 1.0)
+        ranks = dict(zip(self.graph.analytics().vertex_ids().tolist(), self.result.tolist()))
+        self.assertAlmostEqual(ranks[1], ranks[2])
+        self.assertAlmostEqual(ranks[2], ranks[3])
+        self.assertGreater(ranks[5], ranks[4])
+        self.assertAlmostEqual(ranks[4], ranks[6])
+
+    def test_weakly_connected_components(self):
+        self.given_a_cycle_and_a_removed_edge()
+        components = dict(zip(self.graph.analytics().vertex_ids().tolist(),
+                              self.graph.analytics().weakly_connected_components().tolist()))
+        self.assertEqual(len(set(components.values())), 3)
+        self.assertEqual(components[1], components[2])
+        self.assertEqual(components[1], components[3])
+        self.assertEqual(components[4], components[5])
+        self.assertNotEqual(components[1], components[4])
+
+    def test_results_are_cached_until_graph_changes(self):
+        self.given_a_cycle_and_a_removed_edge()
+        self.when_compute_pagerank()
+        self.assertIs(self.graph.analytics().pagerank(), self.result)
+        with self.assertRaises(ValueError):
+            self.result[0] = 1.0
+        self.graph.add_edge(LwwTimedEdge((5, 6), timestamp=9))
+        self.assertIsNot(self.graph.analytics().pagerank(), self.result)
+        self.assertEqual(len(self.graph.analytics().edges()[0]), 5)
+
+    def given_a_cycle_and_a_removed_edge(self):
+        self.graph = LwwDiGraph()
+        for vertex_id in range(1, 7):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in [(1, 2), (2, 3), (3, 1), (4, 5), (5, 6)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=3))
+        self.graph.remove_edge(LwwTimedEdge((5, 6), timestamp=4))
+
+    def when_compute_pagerank(self):
+        self.result = self.graph.analytics().pagerank()
+
+    def then_per_vertex_is(self, values, expected):
+        self.assertDictEqual(dict(zip(self.graph.analytics().vertex_ids().tolist(), values.tolist())), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -128,6 +128,12 @@ class LwwGraphBasicTest(unittest.TestCase):
         self.when_graph_2_merge_to_itself()
         self.then_graph_1_and_2_are_same()
 
+    def test_merge_n_graphs_at_once(self):
+        self.given_3_same_graph()
+        self.when_graph_1_remove_edge_1_to_2_at_time_4()
+        self.when_3_graph_merge_at_once_and_one_after_another()
+        self.then_merged_graph_are_correct_and_same()
+
     def given_a_empty_lww_di_graph(self):
         self.graph = LwwDiGraph()
 
@@ -233,6 +239,10 @@ class LwwGraphBasicTest(unittest.TestCase):
         self.graph_A = self.graph_1.merge(self.graph_2).merge(self.graph_3)
         self.graph_B = self.graph_3.merge(self.graph_2).merge(self.graph_1)
 
+    def when_3_graph_merge_at_once_and_one_after_another(self):
+        self.graph_A = LwwDiGraph.merge_graphs([self.graph_1, self.graph_2, self.graph_3])
+        self.graph_B = self.graph_3.merge(self.graph_2).merge(self.graph_1)
+
     def when_graph_2_merge_to_itself(self):
         self.graph_2 = self.graph_2.merge(self.graph_2)
 
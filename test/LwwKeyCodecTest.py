@@ -0,0 +1,143 @@
+import unittest
+import uuid
+
+from lww_graph.LwwTimedObj import LwwTimedObj
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.codec.LwwInternedStrKeyCodec import LwwInternedStrKeyCodec
+from lww_graph.codec.LwwTuplePackedKeyCodec import LwwTuplePackedKeyCodec
+from lww_graph.codec.LwwUuidKeyCodec import LwwUuidKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.lww_set.LwwSet import LwwSet
+
+
+class LwwKeyCodecTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.ids = [str(uuid.UUID(int=i)) for i in range(1, 4)]
+
+    def tearDown(self) -> None:
+        self.codec = None
+        self.set = None
+        self.graph = None
+        self.graph_1 = None
+        self.graph_2 = None
+
+    def test_int_codec_round_trip(self):
+        self.given_a_codec(LwwIntKeyCodec())
+        self.then_keys_round_trip_to_non_negative_ints([0, 1, -1, 2 ** 63 - 1, -2 ** 63])
+
+    def test_int_codec_rejects_out_of_range_key(self):
+        self.given_a_codec(LwwIntKeyCodec(width=8))
+        self.then_encoding_raises_value_error(128)
+
+    def test_look_up_of_keys_the_codec_cannot_encode(self):
+        self.given_a_graph_with_uuid_vertices()
+        self.then_graph_has_no_vertex("not-a-uuid")
+        self.given_a_graph_with_int_vertices()
+        for vertex_id in ("7", 2 ** 70):
+            self.then_graph_has_no_vertex(vertex_id)
+
+    def test_interned_codec_does_not_register_looked_up_keys(self):
+        self.given_a_codec(LwwInternedStrKeyCodec())
+        self.then_keys_round_trip_to_non_negative_ints(["a", "b"])
+        self.assertIsNone(self.codec.find("c"))
+        self.assertIsNone(self.codec.find(["a"]))
+        self.then_encoding_raises_value_error(["a"])
+
+    def test_tuple_codec_round_trip(self):
+        self.given_a_codec(LwwTuplePackedKeyCodec(LwwIntKeyCodec(32), LwwUuidKeyCodec()))
+        self.then_keys_round_trip_to_non_negative_ints([(-5, self.ids[0]), (7, self.ids[2])])
+
+    def test_set_with_codec_behaves_as_without(self):
+        self.given_a_set_with_codec(LwwInternedStrKeyCodec())
+        self.when_add_and_remove_elements()
+        self.then_set_elements_are(["test-2", "test"])
+
+    def test_graph_with_uuid_vertex_ids(self):
+        self.given_a_graph_with_uuid_vertices()
+        self.then_graph_has_edge(LwwEdge(self.ids[0], self.ids[1]))
+        self.then_graph_has_connected_vertices(self.ids[1], [self.ids[0], self.ids[2]])
+
+    def test_merge_graphs_with_different_interned_codecs(self):
+        self.given_2_graphs_with_own_interned_codecs()
+        self.when_graph_1_merge_graph_2()
+        self.then_graph_1_has_all_edges()
+
+    def given_a_codec(self, codec):
+        self.codec = codec
+
+    def given_a_set_with_codec(self, codec):
+        self.set = LwwSet(codec=codec)
+
+    def given_a_graph_with_uuid_vertices(self):
+        self.graph = LwwDiGraph(vertex_codec=LwwUuidKeyCodec()) \
+            .add_vertex(LwwTimedVertex(self.ids[0], timestamp=1)) \
+            .add_vertex(LwwTimedVertex(self.ids[1], timestamp=1)) \
+            .add_vertex(LwwTimedVertex(self.ids[2], timestamp=1)) \
+            .add_edge(LwwTimedEdge((self.ids[0], self.ids[1]), timestamp=2)) \
+            .add_edge(LwwTimedEdge((self.ids[1], self.ids[2]), timestamp=2))
+
+    def given_a_graph_with_int_vertices(self):
+        self.graph = LwwDiGraph(vertex_codec=LwwIntKeyCodec()) \
+            .add_vertex(LwwTimedVertex(7, timestamp=1)) \
+            .add_vertex(LwwTimedVertex(8, timestamp=1)) \
+            .add_edge(LwwTimedEdge((7, 8), timestamp=2))
+
+    def given_2_graphs_with_own_interned_codecs(self):
+        self.graph_1 = LwwDiGraph(vertex_codec=LwwInternedStrKeyCodec()) \
+            .add_vertex(LwwTimedVertex("a", timestamp=1)) \
+            .add_vertex(LwwTimedVertex("b", timestamp=1)) \
+            .add_edge(LwwTimedEdge(("a", "b"), timestamp=2))
+        self.graph_2 = LwwDiGraph(vertex_codec=LwwInternedStrKeyCodec()) \
+            .add_vertex(LwwTimedVertex("c", timestamp=1)) \
+            .add_vertex(LwwTimedVertex("b", timestamp=1)) \
+            .add_edge(LwwTimedEdge(("b", "c"), timestamp=2))
+
+    def when_add_and_remove_elements(self):
+        self.set.add(LwwTimedObj("test", 2))
+        self.set.add(LwwTimedObj("test-2", 1))
+        self.set.add(LwwTimedObj("test-3", 1))
+        self.set.remove(LwwTimedObj("test-3", 1))
+
+    def when_graph_1_merge_graph_2(self):
+        self.graph_1.merge(self.graph_2)
+
+    def then_keys_round_trip_to_non_negative_ints(self, keys):
+        for key in keys:
+            code = self.codec.encode(key)
+            self.assertTrue(0 <= code < 2 ** self.codec.width)
+            self.assertEqual(self.codec.find(key), code)
+            self.assertEqual(self.codec.decode(code), key)
+
+    def then_encoding_raises_value_error(self, key):
+        with self.assertRaises(ValueError):
+            self.codec.encode(key)
+
+    def then_set_elements_are(self, elements):
+        self.assertListEqual(self.set.elements(), elements)
+        self.assertFalse(self.set.exist("test-4"))
+
+    def then_graph_has_edge(self, edge):
+        self.assertTrue(self.graph.edge_exist(edge))
+
+    def then_graph_has_connected_vertices(self, vertex_id, vertices):
+        self.assertListEqual(sorted(self.graph.connected_vertices(vertex_id)), sorted(vertices))
+
+    def then_graph_has_no_vertex(self, vertex_id):
+        self.assertFalse(self.graph.vertex_exist(vertex_id))
+        self.assertListEqual(self.graph.vertex_exist_many([vertex_id]), [False])
+        self.assertFalse(self.graph.edge_exist(LwwEdge(vertex_id, 8)))
+        self.assertListEqual(self.graph.connected_vertices(vertex_id), [])
+        self.assertListEqual(self.graph.list_all_path(vertex_id, 8), [])
+
+    def then_graph_1_has_all_edges(self):
+        self.assertEqual(self.graph_1.vertex_count(), 3)
+        self.assertEqual(self.graph_1.edge_count(), 2)
+        self.assertListEqual(self.graph_1.list_all_path("a", "c"), [["a", "b", "c"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
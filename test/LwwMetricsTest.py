@@ -0,0 +1,101 @@
+import unittest
+
+from lww_graph.LwwTimedObj import LwwTimedObj
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.lww_set.LwwSet import LwwSet
+from lww_graph.metrics.LwwMetricsRecorder import LwwMetricsRecorder
+
+
+class LwwMetricsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.recorder = LwwMetricsRecorder()
+
+    def tearDown(self) -> None:
+        self.recorder = None
+        self.set = None
+        self.graph = None
+        self.graph_2 = None
+
+    def test_set_operations_are_counted(self):
+        self.given_an_instrumented_set()
+        self.when_add_and_remove_elements()
+        self.then_calls_recorded_for("LwwSet.add", 2)
+        self.then_calls_recorded_for("LwwSet.remove", 1)
+
+    def test_set_merge_reports_stats(self):
+        self.given_an_instrumented_set()
+        self.when_add_and_remove_elements()
+        self.when_merge_a_set_with_1_newer_and_1_older_mark()
+        self.then_stats_recorded_for("LwwSet.merge", {"keys_examined": 2, "marks_updated": 1})
+
+    def test_detached_sink_records_nothing(self):
+        self.given_an_instrumented_set()
+        self.when_detach_the_sink()
+        self.when_add_and_remove_elements()
+        self.then_nothing_recorded()
+
+    def test_graph_remove_vertex_reports_cascade(self):
+        self.given_an_instrumented_graph_with_edge_1_to_2()
+        self.when_remove_vertex_1()
+        self.then_calls_recorded_for("LwwDiGraph.remove_vertex", 1)
+        self.then_stats_recorded_for("LwwDiGraph.remove_vertex", {"edges_cascaded": 1})
+
+    def test_graph_merge_reports_revalidated_edges(self):
+        self.given_an_instrumented_graph_with_edge_1_to_2()
+        self.when_merge_a_graph_re_adding_vertex_2()
+        self.then_stats_recorded_for("LwwDiGraph.merge", {
+            "vertex_keys_examined": 1,
+            "vertex_marks_updated": 1,
+            "edge_keys_examined": 0,
+            "edge_marks_updated": 0,
+            "edges_revalidated": 1,
+            "attributes_updated": 0
+        })
+
+    def given_an_instrumented_set(self):
+        self.set = LwwSet()
+        self.set.set_metrics_sink(self.recorder)
+
+    def given_an_instrumented_graph_with_edge_1_to_2(self):
+        self.graph = LwwDiGraph(metrics=self.recorder) \
+            .add_vertex(LwwTimedVertex(1, timestamp=1)) \
+            .add_vertex(LwwTimedVertex(2, timestamp=1)) \
+            .add_edge(LwwTimedEdge((1, 2), timestamp=2))
+
+    def when_add_and_remove_elements(self):
+        self.set.add(LwwTimedObj("test", 1))
+        self.set.add(LwwTimedObj("test-2", 1))
+        self.set.remove(LwwTimedObj("test", 2))
+
+    def when_merge_a_set_with_1_newer_and_1_older_mark(self):
+        another = LwwSet()
+        another.add(LwwTimedObj("test", 0))
+        another.add(LwwTimedObj("test-3", 1))
+        self.set.merge(another)
+
+    def when_detach_the_sink(self):
+        self.set.set_metrics_sink(None)
+
+    def when_remove_vertex_1(self):
+        self.graph.remove_vertex(LwwTimedVertex(1, timestamp=3))
+
+    def when_merge_a_graph_re_adding_vertex_2(self):
+        self.graph_2 = LwwDiGraph().add_vertex(LwwTimedVertex(2, timestamp=1.5))
+        self.graph.merge(self.graph_2)
+
+    def then_calls_recorded_for(self, operation, num):
+        self.assertEqual(self.recorder.calls.get(operation, 0), num)
+
+    def then_stats_recorded_for(self, operation, stats):
+        self.assertDictEqual(self.recorder.stats[operation], stats)
+
+    def then_nothing_recorded(self):
+        self.assertDictEqual(self.recorder.calls, {})
+        self.assertDictEqual(self.recorder.stats, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
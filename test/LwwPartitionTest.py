@@ -0,0 +1,206 @@
+import random
+import unittest
+
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.partition.LwwHashInterest import LwwHashInterest
+from lww_graph.partition.LwwRangeInterest import LwwRangeInterest
+from lww_graph.wire.LwwWireDecoder import LwwWireDecoder
+from lww_graph.wire.LwwWireEncoder import LwwWireEncoder
+
+
+class ScannedRangeInterest(LwwRangeInterest):
+    """
+    A range interest set counting its checks, which does not enumerate its ids unless told to.
+    """
+
+    def __init__(self, low, high, enumerate_ids):
+        super().__init__(low, high)
+        self.enumerate_ids = enumerate_ids
+        self.checks = 0
+
+    def contains(self, vertex_id):
+        self.checks += 1
+        return super().contains(vertex_id)
+
+    def vertex_ids(self, limit):
+        return super().vertex_ids(limit) if self.enumerate_ids else None
+
+
+class LwwPartitionTest(unittest.TestCase):
+
+    VERTICES = 40
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.replica = None
+        self.interest = None
+
+    def test_partition_has_same_view_of_interest_set(self):
+        for codec in (None, LwwIntKeyCodec()):
+            self.given_a_random_graph(codec)
+            self.given_interest(LwwRangeInterest(10, 20))
+            self.when_partition_the_graph()
+            self.then_replica_has_same_view_of_interest_set()
+            self.then_replica_is_smaller_than_graph()
+
+    def test_partition_looks_up_ids_of_small_range(self):
+        self.given_a_random_graph(LwwIntKeyCodec())
+        scanned = ScannedRangeInterest(10, 20, enumerate_ids=False)
+        looked_up = ScannedRangeInterest(10, 20, enumerate_ids=True)
+        halo = {30, 31, 99}
+        self.assertTupleEqual(self.graph.__partition_keys__(looked_up, halo),
+                              self.graph.__partition_keys__(scanned, halo))
+        self.assertEqual(looked_up.checks, 0)
+        self.assertGreater(scanned.checks, 0)
+
+    def test_partial_replica_filters_merges(self):
+        self.given_a_random_graph(LwwIntKeyCodec())
+        self.given_interest(LwwHashInterest(1, 4))
+        self.given_a_partial_replica()
+        self.when_merge_graph_into_replica()
+        self.then_replica_has_same_view_of_interest_set()
+        self.then_replica_holds_no_edge_out_of_halo()
+
+    def test_removal_of_halo_vertex_invalidates_crossing_edge(self):
+        self.given_a_graph_with_crossing_edge_2_to_30()
+        self.given_interest(LwwRangeInterest(0, 10))
+        self.given_a_partial_replica()
+        self.when_merge_graph_into_replica()
+        self.when_remove_vertex_from_graph(30, timestamp=5)
+        self.when_merge_graph_into_replica()
+        self.then_replica_has_same_view_of_interest_set()
+        self.assertListEqual(self.replica.connected_vertices(2), [3])
+
+    def test_removal_of_halo_vertex_from_replica_without_crossing_edge(self):
+        for decode in (False, True):
+            self.given_a_graph_with_crossing_edge_2_to_30()
+            self.given_interest(LwwRangeInterest(0, 10))
+            self.when_partition_the_graph()
+            self.when_merge_vertex_removal_from_another_replica(30, timestamp=5, decode=decode)
+            self.then_replica_has_same_view_of_interest_set()
+            self.assertFalse(self.replica.edge_exist(LwwEdge(2, 30)))
+            self.assertListEqual(self.replica.connected_vertices(2), [3])
+
+    def test_fork_of_partial_replica_is_partial(self):
+        self.given_a_random_graph(LwwIntKeyCodec())
+        self.given_interest(LwwRangeInterest(10, 20))
+        self.when_partition_the_graph()
+        self.when_fork_replica_and_merge_graph()
+        self.then_replica_has_same_view_of_interest_set()
+        self.then_replica_holds_no_edge_out_of_halo()
+
+    def test_edge_removed_before_added_is_replicated(self):
+        self.given_a_graph_with_crossing_edge_2_to_30()
+        self.when_remove_edge_from_graph(4, 30, timestamp=10)
+        self.given_interest(LwwRangeInterest(0, 10))
+        self.given_a_partial_replica()
+        self.when_merge_graph_into_replica()
+        self.when_add_edge_to_replica(4, 30, timestamp=8)
+        self.then_replica_has_same_view_of_interest_set()
+        self.assertFalse(self.replica.edge_exist(LwwEdge(4, 30)))
+
+    def test_delta_of_partition(self):
+        self.given_a_random_graph(LwwIntKeyCodec())
+        self.given_interest(LwwRangeInterest(0, 8))
+        self.given_a_partial_replica()
+        self.when_decode_partition_delta_into_replica()
+        self.then_replica_has_same_view_of_interest_set()
+        self.then_replica_holds_no_edge_out_of_halo()
+
+    def test_partial_replica_filters_full_delta(self):
+        self.given_a_random_graph(LwwIntKeyCodec())
+        self.given_interest(LwwRangeInterest(0, 8))
+        self.given_a_partial_replica()
+        self.when_decode_full_delta_into_replica()
+        self.then_replica_has_same_view_of_interest_set()
+        self.then_replica_holds_no_edge_out_of_halo()
+
+    def given_a_random_graph(self, codec):
+        random.seed(37)
+        self.graph = LwwDiGraph(vertex_codec=codec)
+        for timestamp in range(1, 600):
+            src, target = random.sample(range(self.VERTICES), 2)
+            action = random.random()
+            if action < 0.2:
+                self.graph.add_vertex(LwwTimedVertex(src, timestamp=timestamp))
+            elif action < 0.25:
+                self.graph.remove_vertex(LwwTimedVertex(src, timestamp=timestamp))
+            elif action < 0.9:
+                self.graph.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+            else:
+                self.graph.remove_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+
+    def given_a_graph_with_crossing_edge_2_to_30(self):
+        self.graph = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        for vertex_id in (2, 3, 4, 30, 31):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in [(2, 3), (2, 30), (30, 31)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=3))
+
+    def given_interest(self, interest):
+        self.interest = interest
+
+    def given_a_partial_replica(self):
+        self.replica = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        self.replica.set_interest(self.interest)
+
+    def when_partition_the_graph(self):
+        self.replica = self.graph.partition(self.interest)
+
+    def when_merge_graph_into_replica(self):
+        self.replica.merge(self.graph)
+
+    def when_merge_vertex_removal_from_another_replica(self, vertex_id, timestamp, decode):
+        another = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        another.remove_vertex(LwwTimedVertex(vertex_id, timestamp=timestamp))
+        self.graph.merge(another)
+        if decode:
+            LwwWireDecoder(LwwWireEncoder(another, since=0).encode()).merge_into(self.replica)
+        else:
+            self.replica.merge(another)
+
+    def when_fork_replica_and_merge_graph(self):
+        self.replica = self.replica.fork()
+        self.replica.merge(self.graph)
+
+    def when_remove_vertex_from_graph(self, vertex_id, timestamp):
+        self.graph.remove_vertex(LwwTimedVertex(vertex_id, timestamp=timestamp))
+
+    def when_remove_edge_from_graph(self, src, target, timestamp):
+        self.graph.remove_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+
+    def when_add_edge_to_replica(self, src, target, timestamp):
+        self.replica.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+        self.graph.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+
+    def when_decode_partition_delta_into_replica(self):
+        LwwWireDecoder(LwwWireEncoder(self.graph, since=0, interest=self.interest).encode()) \
+            .merge_into(self.replica)
+
+    def when_decode_full_delta_into_replica(self):
+        LwwWireDecoder(LwwWireEncoder(self.graph, since=0).encode()).merge_into(self.replica)
+
+    def then_replica_has_same_view_of_interest_set(self):
+        for vertex_id in range(self.VERTICES):
+            if self.interest.contains(vertex_id):
+                self.assertEqual(self.replica.vertex_exist(vertex_id), self.graph.vertex_exist(vertex_id))
+                self.assertListEqual(sorted(self.replica.connected_vertices(vertex_id)),
+                                     sorted(self.graph.connected_vertices(vertex_id)))
+
+    def then_replica_is_smaller_than_graph(self):
+        self.assertLess(len(self.replica.__e_set__.__added__), len(self.graph.__e_set__.__added__))
+
+    def then_replica_holds_no_edge_out_of_halo(self):
+        for edge in self.replica.__e_set__.elements():
+            self.assertTrue(self.interest.contains(edge.src) or self.interest.contains(edge.target))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+
+from lww_graph.cache.LwwQueryCache import LwwQueryCache
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+
+
+class LwwQueryCacheTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.cache = None
+        self.result = None
+
+    def test_repeated_query_is_cached(self):
+        self.given_a_cached_di_graph()
+        self.when_query_connected_vertices_of_4_twice()
+        self.then_cache_has_hits_and_misses(hits=1, misses=1)
+        self.then_result_is([2, 5, 6])
+
+    def test_returned_result_can_be_modified(self):
+        self.given_a_cached_di_graph()
+        self.when_query_connected_vertices_of_4_and_clear_result()
+        self.when_query_connected_vertices_of_4_twice()
+        self.then_result_is([2, 5, 6])
+
+    def test_change_invalidates_only_touched_vertices(self):
+        self.given_a_cached_di_graph()
+        self.when_query_connected_vertices_of_4_twice()
+        self.when_query_connected_vertices_of_1()
+        self.when_add_edge_6_to_1()
+        self.when_query_connected_vertices_of_4_twice()
+        self.then_cache_has_hits_and_misses(hits=3, misses=2)
+        self.when_query_connected_vertices_of_1()
+        self.then_cache_has_hits_and_misses(hits=3, misses=3)
+        self.then_result_is([2, 3, 6])
+
+    def test_removing_neighbor_invalidates_vertex(self):
+        self.given_a_cached_di_graph()
+        self.when_query_connected_vertices_of_4_twice()
+        self.when_remove_vertex_5()
+        self.when_query_connected_vertices_of_4_twice()
+        self.then_result_is([2, 6])
+
+    def test_merge_invalidates_paths(self):
+        self.given_a_cached_di_graph()
+        self.when_query_paths_from_1_to_6()
+        self.then_result_is([[1, 2, 4, 5, 6], [1, 2, 4, 6], [1, 3, 2, 4, 5, 6], [1, 3, 2, 4, 6]])
+        self.when_merge_a_graph_removing_vertex_4()
+        self.when_query_paths_from_1_to_6()
+        self.then_result_is([])
+
+    def test_cache_is_bounded(self):
+        self.given_a_cache(max_entries=2, max_bytes=1 << 20)
+        self.when_put_results(count=5, length=10)
+        self.then_cache_has_entries_and_evictions(entries=2, evictions=3)
+        self.given_a_cache(max_entries=100, max_bytes=2048)
+        self.when_put_results(count=10, length=10)
+        self.then_cache_memory_is_at_most(2048)
+
+    def given_a_cached_di_graph(self):
+        self.graph = LwwDiGraph()
+        self.cache = LwwQueryCache()
+        self.graph.set_query_cache(self.cache)
+        for vertex_id in range(1, 7):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in [(1, 2), (1, 3), (3, 2), (2, 4), (4, 2), (4, 5), (5, 6), (4, 6)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=3))
+
+    def given_a_cache(self, max_entries, max_bytes):
+        self.cache = LwwQueryCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def when_query_connected_vertices_of_4_twice(self):
+        self.graph.connected_vertices(4)
+        self.result = sorted(self.graph.connected_vertices(4))
+
+    def when_query_connected_vertices_of_4_and_clear_result(self):
+        self.graph.connected_vertices(4).clear()
+
+    def when_query_connected_vertices_of_1(self):
+        self.result = sorted(self.graph.connected_vertices(1))
+
+    def when_query_paths_from_1_to_6(self):
+        self.result = sorted(self.graph.list_all_path(1, 6))
+
+    def when_add_edge_6_to_1(self):
+        self.graph.add_edge(LwwTimedEdge((6, 1), timestamp=5))
+
+    def when_remove_vertex_5(self):
+        self.graph.remove_vertex(LwwTimedVertex(5, timestamp=5))
+
+    def when_merge_a_graph_removing_vertex_4(self):
+        another = LwwDiGraph()
+        another.remove_vertex(LwwTimedVertex(4, timestamp=5))
+        self.graph.merge(another)
+
+    def when_put_results(self, count, length):
+        for i in range(count):
+            self.cache.put(("query", i), 0, list(range(length)))
+
+    def then_cache_has_hits_and_misses(self, hits, misses):
+        self.assertEqual(self.cache.hits, hits)
+        self.assertEqual(self.cache.misses, misses)
+
+    def then_result_is(self, expected):
+        self.assertListEqual(self.result, expected)
+
+    def then_cache_has_entries_and_evictions(self, entries, evictions):
+        self.assertEqual(len(self.cache), entries)
+        self.assertEqual(self.cache.evictions, evictions)
+        self.assertIsNone(self.cache.get(("query", 0), 0))
+        self.assertIsNotNone(self.cache.get(("query", 4), 0))
+
+    def then_cache_memory_is_at_most(self, max_bytes):
+        self.assertGreater(len(self.cache), 0)
+        self.assertLessEqual(self.cache.memory(), max_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.simulation.LwwReplicaSimulator import LwwReplicaSimulator
+from lww_graph.simulation.LwwSimulationReport import LwwSimulationReport
+
+
+class LwwReplicaSimulatorTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.simulator = None
+        self.report = None
+
+    def test_replicas_converge_through_forks(self):
+        self.given_a_simulator(transport="fork", vertex_codec=None)
+        self.when_run()
+        self.then_replicas_converged()
+
+    def test_replicas_converge_through_wire(self):
+        self.given_a_simulator(transport="wire", vertex_codec=LwwIntKeyCodec())
+        self.when_run()
+        self.then_replicas_converged()
+
+    def test_report_percentiles(self):
+        self.given_a_report_of_merges(list(range(100, 0, -1)))
+        self.then_merge_percentiles_are({50: 50, 90: 90, 99: 99, 100: 100})
+
+    def given_a_simulator(self, transport, vertex_codec):
+        self.simulator = LwwReplicaSimulator(replicas=5, rounds=20, operations_per_round=10, vertices=30,
+                                             partition_probability=0.3, transport=transport,
+                                             vertex_codec=vertex_codec, seed=38)
+
+    def given_a_report_of_merges(self, merge_ns):
+        self.report = LwwSimulationReport(True, 10, 10 ** 9, merge_ns, 0, 0, [])
+
+    def when_run(self):
+        self.report = self.simulator.run()
+
+    def then_replicas_converged(self):
+        self.assertTrue(self.report.converged)
+        self.assertEqual(self.report.operations, 5 * 20 * 10)
+        self.assertGreater(self.report.ops_per_second(), 0)
+        self.assertGreater(self.report.messages_dropped, 0)
+        self.assertEqual(len(self.report.memory_bytes), 5)
+        self.assertGreater(self.simulator.graphs[0].edge_count(), 0)
+
+    def then_merge_percentiles_are(self, expected):
+        self.assertDictEqual(self.report.merge_percentiles(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
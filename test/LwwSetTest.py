@@ -72,6 +72,11 @@ class LwwSetTest(unittest.TestCase):
         self.when_merge_with_itself()
         self.then_same_merged_set_are_same()
 
+    def test_merge_n_sets_at_once(self):
+        self.given_3_sets_with_distinct_element()
+        self.when_merge_3_sets_at_once_and_one_after_another()
+        self.then_merged_set_are_same()
+
     def given_an_empty_set(self):
         self.set = LwwSet()
 
@@ -133,6 +138,11 @@ class LwwSetTest(unittest.TestCase):
         self.setA = self.set1.merge(self.set2).merge(self.set3)
         self.setB = self.set3.merge(self.set2).merge(self.set1)
 
+    def when_merge_3_sets_at_once_and_one_after_another(self):
+        self.set3.remove(LwwTimedObj("test-1"))
+        self.setA = LwwSet.merge_sets([self.set1, self.set2, self.set3])
+        self.setB = self.set1.merge(self.set2).merge(self.set3)
+
     def when_merge_with_itself(self):
         self.setA = self.set.merge(self.set)
 
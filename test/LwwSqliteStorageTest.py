@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.storage.LwwSqliteStorage import LwwSqliteStorage
+
+
+class LwwSqliteStorageTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.db")
+
+    def tearDown(self) -> None:
+        if self.storage is not None:
+            self.storage.close()
+        self.storage = None
+        self.graph = None
+        self.directory.cleanup()
+
+    def test_graph_on_disk_behaves_as_in_memory(self):
+        self.given_a_connected_di_graph_on_disk()
+        self.then_graph_has_vertices_and_edges_of(6, 8)
+        self.then_the_neighbors_for_vertex_2_are([1, 3, 4])
+        self.then_the_path_found_between_1_and_6_are(
+            {"1->2->4->5->6", "1->3->2->4->5->6", "1->2->4->6", "1->3->2->4->6"})
+
+    def test_remove_vertex_cascades_on_disk(self):
+        self.given_a_connected_di_graph_on_disk()
+        self.when_remove_vertex_4_at_time(timestamp=4)
+        self.then_graph_has_vertices_and_edges_of(5, 4)
+        self.then_the_neighbors_for_vertex_2_are([1, 3])
+
+    def test_marks_survive_reopening(self):
+        self.given_a_connected_di_graph_on_disk()
+        self.when_remove_vertex_4_at_time(timestamp=4)
+        self.when_reopen_the_graph()
+        self.then_graph_has_vertices_and_edges_of(5, 4)
+        self.assertTrue(self.graph.edge_exist(LwwEdge(5, 6)))
+
+    def test_merge_in_memory_graph_into_graph_on_disk(self):
+        self.given_a_connected_di_graph_on_disk()
+        self.when_merge_an_in_memory_graph_adding_edge_6_to_7_and_removing_vertex_1()
+        self.then_graph_has_vertices_and_edges_of(6, 7)
+        self.then_the_path_found_between_1_and_6_are(set())
+        self.then_the_path_found_between_5_and_7_are({"5->6->7"})
+
+    def given_a_connected_di_graph_on_disk(self):
+        """
+        The same graph as LwwGraphBasicTest.given_a_connected_di_graph, with a tiny cache and write batch
+        so that eviction and write-back are exercised.
+        """
+        self.storage = LwwSqliteStorage(self.path, cache_size=4, batch_size=3)
+        self.graph = LwwDiGraph(storage=self.storage)
+        for vertex_id in range(1, 7):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in [(1, 2), (1, 3), (3, 2), (2, 4), (4, 2), (4, 5), (5, 6), (4, 6)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=3))
+
+    def when_remove_vertex_4_at_time(self, timestamp):
+        self.graph.remove_vertex(LwwTimedVertex(4, timestamp=timestamp))
+
+    def when_reopen_the_graph(self):
+        self.storage.close()
+        self.storage = LwwSqliteStorage(self.path)
+        self.graph = LwwDiGraph(storage=self.storage)
+
+    def when_merge_an_in_memory_graph_adding_edge_6_to_7_and_removing_vertex_1(self):
+        another = LwwDiGraph() \
+            .add_vertex(LwwTimedVertex(6, timestamp=1)) \
+            .add_vertex(LwwTimedVertex(7, timestamp=1)) \
+            .add_edge(LwwTimedEdge((6, 7), timestamp=3)) \
+            .remove_vertex(LwwTimedVertex(1, timestamp=5))
+        self.graph.merge(another)
+
+    def then_graph_has_vertices_and_edges_of(self, vertices, edges):
+        self.assertEqual(self.graph.vertex_count(), vertices)
+        self.assertEqual(self.graph.edge_count(), edges)
+
+    def then_the_neighbors_for_vertex_2_are(self, vertices):
+        self.assertListEqual(sorted(self.graph.connected_vertices(2)), vertices)
+
+    def then_the_path_found_between_1_and_6_are(self, paths):
+        founded_path = {"->".join([str(i) for i in p]) for p in self.graph.list_all_path(1, 6)}
+        self.assertSetEqual(founded_path, paths)
+
+    def then_the_path_found_between_5_and_7_are(self, paths):
+        founded_path = {"->".join([str(i) for i in p]) for p in self.graph.list_all_path(5, 7)}
+        self.assertSetEqual(founded_path, paths)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import random
+import unittest
+
+from lww_graph.codec.LwwIntKeyCodec import LwwIntKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.order.LwwTopologicalOrder import LwwTopologicalOrder
+from lww_graph.wire.LwwWireDecoder import LwwWireDecoder
+from lww_graph.wire.LwwWireEncoder import LwwWireEncoder
+
+
+class LwwTopologicalOrderTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cycles = []
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.order = None
+
+    def test_topological_sort_of_dag(self):
+        self.given_a_dag()
+        self.then_order_agrees_with_edges(self.graph.topological_sort())
+
+    def test_topological_sort_of_cyclic_graph_raises(self):
+        self.given_a_dag()
+        self.when_add_edge(5, 1, timestamp=5)
+        self.then_topological_sort_raises()
+
+    def test_strongly_connected_components(self):
+        self.given_a_dag()
+        self.when_add_edge(6, 3, timestamp=5)
+        self.then_components_are([[1], [2, 3, 4, 5, 6]])
+
+    def test_incremental_order_flags_cycle(self):
+        self.given_a_dag()
+        self.given_an_incremental_order()
+        self.when_add_vertex(7, timestamp=1)
+        self.when_add_edge(7, 1, timestamp=5)
+        self.when_add_edge(5, 1, timestamp=6)
+        self.then_cycles_reported_are([LwwEdge(5, 1)])
+        self.then_incremental_order_is_valid()
+
+    def test_incremental_order_retries_cycle_once_removed(self):
+        self.given_a_dag()
+        self.given_an_incremental_order()
+        self.when_add_edge(5, 1, timestamp=5)
+        self.when_remove_edge(2, 4, timestamp=6)
+        self.then_incremental_order_is_valid()
+        self.assertTrue(self.order.is_acyclic())
+
+    def test_incremental_order_follows_merge(self):
+        self.given_a_dag()
+        self.given_an_incremental_order()
+        self.when_merge_a_graph_with_edge(6, 1, timestamp=5)
+        self.then_cycles_reported_are([LwwEdge(6, 1)])
+        self.then_incremental_order_is_valid()
+
+    def test_incremental_order_follows_wire_merge(self):
+        self.given_a_dag()
+        self.given_an_incremental_order()
+        self.when_add_edge(6, 1, timestamp=5)
+        self.when_decode_a_graph_with_edge_into_graph(1, 7, timestamp=6)
+        self.then_cycles_reported_are([LwwEdge(6, 1)])
+        self.then_incremental_order_is_valid()
+
+    def test_incremental_order_flags_cycle_of_edges_made_valid_at_once(self):
+        self.given_edges_of_a_cycle_before_their_vertices()
+        self.given_an_incremental_order()
+        self.when_merge_a_graph_with_vertices([1, 6], timestamp=1)
+        self.then_incremental_order_is_valid()
+        self.assertFalse(self.order.is_acyclic())
+        self.assertEqual(len(self.order.cyclic_edges()), 1)
+
+    def test_incremental_order_on_random_changes(self):
+        random.seed(36)
+        self.given_an_empty_graph_with_incremental_order()
+        for timestamp in range(1, 400):
+            self.when_apply_random_change(timestamp)
+            self.then_incremental_order_is_valid()
+
+    def given_a_dag(self):
+        self.graph = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        for vertex_id in range(1, 7):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in [(1, 2), (1, 3), (3, 2), (2, 4), (4, 5), (5, 6), (3, 6)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=3))
+
+    def given_edges_of_a_cycle_before_their_vertices(self):
+        self.graph = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        self.graph.add_vertex(LwwTimedVertex(3, timestamp=1))
+        for src, target in [(1, 3), (6, 1), (3, 6)]:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=5))
+
+    def given_an_incremental_order(self):
+        self.order = LwwTopologicalOrder(on_cycle=self.cycles.append)
+        self.graph.set_topological_order(self.order)
+
+    def given_an_empty_graph_with_incremental_order(self):
+        self.graph = LwwDiGraph()
+        self.given_an_incremental_order()
+
+    def when_add_vertex(self, vertex_id, timestamp):
+        self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=timestamp))
+
+    def when_add_edge(self, src, target, timestamp):
+        self.graph.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+
+    def when_remove_edge(self, src, target, timestamp):
+        self.graph.remove_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+
+    def when_merge_a_graph_with_edge(self, src, target, timestamp):
+        another = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        another.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+        self.graph.merge(another)
+
+    def when_merge_a_graph_with_vertices(self, vertex_ids, timestamp):
+        another = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        for vertex_id in vertex_ids:
+            another.add_vertex(LwwTimedVertex(vertex_id, timestamp=timestamp))
+        self.graph.merge(another)
+
+    def when_decode_a_graph_with_edge_into_graph(self, src, target, timestamp):
+        another = LwwDiGraph(vertex_codec=LwwIntKeyCodec())
+        another.add_vertex(LwwTimedVertex(target, timestamp=timestamp))
+        another.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+        LwwWireDecoder(LwwWireEncoder(another, since=0).encode()).merge_into(self.graph)
+
+    def when_apply_random_change(self, timestamp):
+        src, target = random.sample(range(12), 2)
+        action = random.random()
+        if action < 0.15:
+            self.graph.add_vertex(LwwTimedVertex(src, timestamp=timestamp))
+        elif action < 0.2:
+            self.graph.remove_vertex(LwwTimedVertex(src, timestamp=timestamp))
+        elif action < 0.8:
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+        else:
+            self.graph.remove_edge(LwwTimedEdge((src, target), timestamp=timestamp))
+
+    def then_order_agrees_with_edges(self, order, left_out=()):
+        position = {vertex_id: i for i, vertex_id in enumerate(order)}
+        self.assertListEqual(sorted(order), sorted(self.graph.__v_set__.elements()))
+        for edge in self.graph.__e_set__.elements():
+            if edge not in left_out:
+                self.assertLess(position[edge.src], position[edge.target], edge)
+
+    def then_topological_sort_raises(self):
+        with self.assertRaises(ValueError):
+            self.graph.topological_sort()
+
+    def then_components_are(self, expected):
+        self.assertListEqual([sorted(component) for component in self.graph.strongly_connected_components()],
+                             expected)
+
+    def then_cycles_reported_are(self, expected):
+        self.assertListEqual(self.cycles, expected)
+        self.assertListEqual(self.order.cyclic_edges(), expected)
+
+    def then_incremental_order_is_valid(self):
+        cyclic_edges = self.order.cyclic_edges()
+        self.then_order_agrees_with_edges(self.order.order(), cyclic_edges)
+        try:
+            self.graph.topological_sort()
+            self.assertTrue(self.order.is_acyclic())
+        except ValueError:
+            self.assertFalse(self.order.is_acyclic())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import pickle
+import unittest
+import uuid
+
+from lww_graph.codec.LwwUuidKeyCodec import LwwUuidKeyCodec
+from lww_graph.lww_graph.LwwDiGraph import LwwDiGraph
+from lww_graph.lww_graph.edge.LwwEdge import LwwEdge
+from lww_graph.lww_graph.edge.LwwTimedEdge import LwwTimedEdge
+from lww_graph.lww_graph.vertex.LwwTimedVertex import LwwTimedVertex
+from lww_graph.wire.LwwWireDecoder import LwwWireDecoder
+from lww_graph.wire.LwwWireEncoder import LwwWireEncoder
+
+
+class LwwWireTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pass
+
+    def tearDown(self) -> None:
+        self.graph = None
+        self.decoded = None
+        self.encoded = None
+
+    def test_round_trip(self):
+        self.given_a_large_di_graph_with_removals_and_weights()
+        self.when_encode_and_decode_the_graph()
+        self.then_decoded_graph_is_same()
+        self.then_decoded_graph_has_weight_of_edge(LwwEdge(1, 2), 3)
+
+    def test_encoding_is_smaller_than_pickle(self):
+        self.given_a_large_di_graph_with_removals_and_weights()
+        self.when_encode_the_graph()
+        self.assertLess(len(self.encoded) * 5, len(pickle.dumps(self.graph)))
+
+    def test_merge_delta_into_stale_replica(self):
+        self.given_a_large_di_graph_with_removals_and_weights()
+        self.when_a_stale_replica_merges_a_delta_since(timestamp=4000000000000)
+        self.then_decoded_graph_is_same()
+
+    def test_round_trip_with_uuid_vertex_ids(self):
+        self.given_a_di_graph_with_uuid_vertices()
+        self.when_encode_and_decode_the_graph()
+        self.then_decoded_graph_is_same()
+
+    def test_streamed_chunks_decode_as_a_whole(self):
+        self.given_a_large_di_graph_with_removals_and_weights()
+        self.when_stream_the_graph_in_chunks()
+        self.then_decoded_graph_is_same()
+
+    def test_truncated_buffer_is_rejected(self):
+        self.given_a_large_di_graph_with_removals_and_weights()
+        self.when_encode_the_graph()
+        with self.assertRaises(ValueError):
+            LwwWireDecoder(self.encoded[:len(self.encoded) // 2]).decode()
+
+    def given_a_large_di_graph_with_removals_and_weights(self):
+        self.graph = LwwDiGraph()
+        for vertex_id in range(-50, 1000):
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1000000000000 + vertex_id))
+        for vertex_id in range(-50, 999):
+            self.graph.add_edge(LwwTimedEdge((vertex_id, vertex_id + 1), timestamp=2000000000000))
+            self.graph.add_edge(LwwTimedEdge((vertex_id + 1, vertex_id), timestamp=2000000000000 + vertex_id))
+        self.graph.set_edge_attribute(LwwTimedEdge((1, 2), timestamp=3000000000000), "weight", 3)
+        self.graph.remove_vertex(LwwTimedVertex(500, timestamp=3000000000000))
+
+    def given_a_di_graph_with_uuid_vertices(self):
+        ids = [str(uuid.uuid4()) for _ in range(10)]
+        self.graph = LwwDiGraph(vertex_codec=LwwUuidKeyCodec())
+        for vertex_id in ids:
+            self.graph.add_vertex(LwwTimedVertex(vertex_id, timestamp=1))
+        for src, target in zip(ids, ids[1:]):
+            self.graph.add_edge(LwwTimedEdge((src, target), timestamp=2))
+
+    def when_encode_the_graph(self):
+        self.encoded = LwwWireEncoder(self.graph).encode()
+
+    def when_encode_and_decode_the_graph(self):
+        self.when_encode_the_graph()
+        self.decoded = LwwWireDecoder(self.encoded, self.graph.__v_set__.codec()).decode()
+
+    def when_a_stale_replica_merges_a_delta_since(self, timestamp):
+        stale = self.graph.fork()
+        self.graph.remove_vertex(LwwTimedVertex(10, timestamp=timestamp + 1))
+        self.graph.add_edge(LwwTimedEdge((3, 5), timestamp=timestamp + 1))
+        self.graph.set_edge_attribute(LwwTimedEdge((3, 5), timestamp=timestamp + 1), "weight", 2)
+        delta = LwwWireEncoder(self.graph, since=timestamp).encode()
+        self.assertLess(len(delta), 128)
+        self.decoded = LwwWireDecoder(delta).merge_into(stale)
+
+    def when_stream_the_graph_in_chunks(self):
+        encoder = LwwWireEncoder(self.graph)
+        encoder.CHUNK_SIZE = 256
+        chunks = list(encoder.chunks())
+        self.assertGreater(len(chunks), 1)
+        self.decoded = LwwWireDecoder(bytearray(b"".join(chunks))).merge_into(LwwDiGraph())
+
+    def then_decoded_graph_is_same(self):
+        self.assertEqual(self.decoded.vertex_count(), self.graph.vertex_count())
+        self.assertEqual(self.decoded.edge_count(), self.graph.edge_count())
+        self.assertEqual(self.decoded, self.graph)
+
+    def then_decoded_graph_has_weight_of_edge(self, edge, weight):
+        self.assertEqual(self.decoded.edge_attribute(edge, "weight"), weight)
+
+
+if __name__ == '__main__':
+    unittest.main()